@@ -1,3 +1,4 @@
+import truffle_cli.checkpoint as truffle_checkpoint
 import truffle_cli.config as truffle_config
 import truffle_cli.system as truffle_system
 import truffle_cli.worker as truffle_worker
@@ -25,8 +26,13 @@ def main():
   if config is None:
     sys.exit(1)
 
-  worker = truffle_worker.create(system, loader.for_worker(config))
-  writer = truffle_writer.create(system, loader.for_writer(config))
+  checkpoint = None
+  checkpoint_config = loader.for_checkpoint(config)
+  if checkpoint_config is not None:
+    checkpoint = truffle_checkpoint.create(system, checkpoint_config)
+
+  worker = truffle_worker.create(system, loader.for_worker(config), checkpoint)
+  writer = truffle_writer.create(system, loader.for_writer(config), checkpoint)
   run = worker.run()
   try:
     while True:
@@ -35,6 +41,8 @@ def main():
   except StopIteration as stop:
     if isinstance(stop.value, OutputMetadata):
       writer.write_metadata(stop.value)
+  finally:
+    writer.close()
 
 
 if __name__ == "__main__":
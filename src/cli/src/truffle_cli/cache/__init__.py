@@ -0,0 +1,10 @@
+from truffle_cli.system.abstract import System
+
+from .abstract import Cache
+from .input import SQLITE_CACHE_TYPE, CacheConfig
+from .sqlite import SqliteCache
+
+
+def create(system: System, config: CacheConfig) -> Cache:
+  if config.type == SQLITE_CACHE_TYPE:
+    return SqliteCache(system, config)
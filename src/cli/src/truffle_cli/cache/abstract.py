@@ -0,0 +1,36 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+@dataclass
+class CacheStats:
+  hits: int = 0
+  misses: int = 0
+  evictions: int = 0
+
+
+class Cache(ABC):
+  @abstractmethod
+  def get(self, key: str, ttl: Optional[float] = None) -> Optional[str]:
+    pass
+
+  @abstractmethod
+  def set(self, key: str, value: str) -> None:
+    pass
+
+  @abstractmethod
+  def delete(self, key: str) -> None:
+    pass
+
+  @abstractmethod
+  def keys(self, prefix: str) -> List[str]:
+    pass
+
+  @abstractmethod
+  def stats(self) -> CacheStats:
+    pass
+
+  @abstractmethod
+  def close(self) -> None:
+    pass
@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+from typing import Literal, Union
+
+CacheConfig = Union["SqliteCacheConfig"]
+
+
+SQLITE_CACHE_TYPE: Literal["sqlite"] = "sqlite"
+
+
+@dataclass
+class SqliteCacheConfig:
+  path: str
+  max_size: int
+  type: Literal["sqlite"] = SQLITE_CACHE_TYPE
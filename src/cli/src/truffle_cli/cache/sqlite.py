@@ -0,0 +1,186 @@
+import sqlite3
+import time
+from threading import Lock
+from typing import Dict, Final, List, Optional, override
+
+from truffle_cli.logger.abstract import Logger
+from truffle_cli.system.abstract import System
+
+from .abstract import Cache, CacheStats
+from .input import SqliteCacheConfig
+
+SQLITE_CACHE_ACCESS_BATCH: Final[int] = 256
+
+
+class SqliteCache(Cache):
+  _config: SqliteCacheConfig
+  _system: System
+  _logger: Logger
+  _lock: Lock
+  _stats: CacheStats
+  _connection: sqlite3.Connection
+  _size: int
+  _accessed: Dict[str, float]
+
+  def __init__(self, system: System, config: SqliteCacheConfig):
+    self._config = config
+    self._system = system
+
+    self._logger = self._system.get_logger(__name__)
+
+    self._lock = Lock()
+    self._stats = CacheStats()
+
+    self._system.create_dir(self._system.path_parent(self._config.path))
+
+    self._connection = sqlite3.connect(
+      self._config.path, timeout=30, check_same_thread=False
+    )
+    self._connection.execute("PRAGMA journal_mode=WAL")
+    self._connection.execute(
+      "CREATE TABLE IF NOT EXISTS entries ("
+      " key TEXT PRIMARY KEY,"
+      " value TEXT NOT NULL,"
+      " size INTEGER NOT NULL,"
+      " created REAL NOT NULL,"
+      " accessed REAL NOT NULL"
+      ")"
+    )
+    self._connection.execute(
+      "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)"
+    )
+    self._connection.commit()
+
+    # NOTE: the size is tracked in memory after the first read
+    # and access times are written in batches so hits stay read only
+    (self._size,) = self._connection.execute(
+      "SELECT COALESCE(SUM(size), 0) FROM entries"
+    ).fetchone()
+    self._accessed = {}
+
+  @override
+  def get(self, key: str, ttl: Optional[float] = None) -> Optional[str]:
+    now = time.time()
+
+    with self._lock:
+      row = self._connection.execute(
+        "SELECT value, size, created FROM entries WHERE key = ?", (key,)
+      ).fetchone()
+
+      if row is None:
+        self._stats.misses += 1
+        return None
+
+      value, size, created = row
+      if ttl is not None and now - created > ttl:
+        self._connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+        self._connection.commit()
+        self._accessed.pop(key, None)
+        self._size -= size
+        self._stats.misses += 1
+        return None
+
+      self._accessed[key] = now
+      if len(self._accessed) >= SQLITE_CACHE_ACCESS_BATCH:
+        self._flush()
+        self._connection.commit()
+      self._stats.hits += 1
+
+    self._logger.trace(f"Cache hit: '{key}'")
+
+    return value
+
+  @override
+  def set(self, key: str, value: str) -> None:
+    now = time.time()
+    size = len(value.encode())
+
+    with self._lock:
+      replaced = self._connection.execute(
+        "SELECT size FROM entries WHERE key = ?", (key,)
+      ).fetchone()
+      self._connection.execute(
+        "INSERT OR REPLACE INTO entries (key, value, size, created, accessed)"
+        " VALUES (?, ?, ?, ?, ?)",
+        (key, value, size, now, now),
+      )
+      self._accessed.pop(key, None)
+      self._size += size - (replaced[0] if replaced is not None else 0)
+      if self._size > self._config.max_size:
+        self._flush()
+        self._evict()
+      self._connection.commit()
+
+  @override
+  def delete(self, key: str) -> None:
+    with self._lock:
+      deleted = self._connection.execute(
+        "SELECT size FROM entries WHERE key = ?", (key,)
+      ).fetchone()
+      if deleted is None:
+        return
+
+      self._connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+      self._connection.commit()
+      self._accessed.pop(key, None)
+      self._size -= deleted[0]
+
+  @override
+  def keys(self, prefix: str) -> List[str]:
+    # NOTE: a range over the primary key instead of LIKE
+    # so the lookup uses the index and needs no escaping
+    with self._lock:
+      rows = self._connection.execute(
+        "SELECT key FROM entries WHERE key >= ? AND key < ?",
+        (prefix, prefix + "\U0010ffff"),
+      ).fetchall()
+
+    return [key for (key,) in rows]
+
+  @override
+  def stats(self) -> CacheStats:
+    with self._lock:
+      return CacheStats(
+        self._stats.hits, self._stats.misses, self._stats.evictions
+      )
+
+  @override
+  def close(self) -> None:
+    with self._lock:
+      self._flush()
+      self._connection.commit()
+      self._connection.close()
+
+  def _flush(self) -> None:
+    if not self._accessed:
+      return
+
+    self._connection.executemany(
+      "UPDATE entries SET accessed = ? WHERE key = ?",
+      [(accessed, key) for key, accessed in self._accessed.items()],
+    )
+    self._accessed.clear()
+
+  def _evict(self) -> None:
+    # NOTE: other processes sharing the file make the tracked size drift
+    # so it is recounted before evicting anything
+    (self._size,) = self._connection.execute(
+      "SELECT COALESCE(SUM(size), 0) FROM entries"
+    ).fetchone()
+    if self._size <= self._config.max_size:
+      return
+
+    rows = self._connection.execute(
+      "SELECT key, size FROM entries ORDER BY accessed ASC"
+    )
+    evicted = []
+    for key, size in rows:
+      if self._size <= self._config.max_size:
+        break
+      evicted.append((key,))
+      self._size -= size
+
+    self._connection.executemany("DELETE FROM entries WHERE key = ?", evicted)
+    self._stats.evictions += len(evicted)
+
+    self._logger.debug(f"Evicted {len(evicted)} cache entries")
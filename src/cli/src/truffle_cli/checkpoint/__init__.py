@@ -0,0 +1,9 @@
+from truffle_cli.system.abstract import System
+
+from .abstract import Checkpoint
+from .file import FileCheckpoint
+from .input import FileCheckpointConfig
+
+
+def create(system: System, config: FileCheckpointConfig) -> Checkpoint:
+  return FileCheckpoint(system, config)
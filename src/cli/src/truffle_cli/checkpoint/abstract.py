@@ -0,0 +1,28 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+
+
+class Checkpoint(ABC):
+  @abstractmethod
+  def offset(self) -> Optional[int]:
+    pass
+
+  @abstractmethod
+  def links(self, site: str, page: int) -> Optional[List[str]]:
+    pass
+
+  @abstractmethod
+  def pending(self, site: str, links: List[str]) -> List[str]:
+    pass
+
+  @abstractmethod
+  def listed(self, site: str, page: int, links: List[str]) -> None:
+    pass
+
+  @abstractmethod
+  def written(self, offset: int, jobs: List[Tuple[str, str]]) -> None:
+    pass
+
+  @abstractmethod
+  def finish(self) -> None:
+    pass
@@ -0,0 +1,124 @@
+import json
+from threading import Lock
+from typing import Any, Dict, List, Optional, Set, TextIO, Tuple, override
+
+from truffle_cli.logger.abstract import Logger
+from truffle_cli.system.abstract import System
+
+from .abstract import Checkpoint
+from .input import FileCheckpointConfig
+
+
+class FileCheckpoint(Checkpoint):
+  _config: FileCheckpointConfig
+  _system: System
+  _logger: Logger
+  _lock: Lock
+  _pages: Dict[Tuple[str, int], List[str]]
+  _done: Set[Tuple[str, str]]
+  _offset: Optional[int]
+  _file: Optional[TextIO]
+
+  def __init__(self, system: System, config: FileCheckpointConfig):
+    self._config = config
+    self._system = system
+
+    self._logger = self._system.get_logger(__name__)
+
+    self._lock = Lock()
+    self._pages = {}
+    self._done = set()
+    self._offset = None
+
+    if self._config.resume and self._system.path_exists(self._config.path):
+      self._load()
+      self._logger.info(
+        f"Resuming from checkpoint '{self._config.path}' with "
+        f"{len(self._done)} written jobs"
+      )
+    elif self._config.resume and self._system.path_exists(self._config.output):
+      # NOTE: a finished run removes its checkpoint
+      # so starting over would clear its complete output
+      raise ValueError(
+        f"Checkpoint '{self._config.path}' not found "
+        f"but output '{self._config.output}' exists"
+      )
+    elif self._config.resume:
+      self._logger.warn(
+        f"Checkpoint '{self._config.path}' not found. Starting over..."
+      )
+
+    entries = [
+      {"site": site, "page": page, "links": links}
+      for (site, page), links in self._pages.items()
+    ]
+    if self._offset is not None:
+      entries.append({"offset": self._offset, "jobs": sorted(self._done)})
+    self._system.replace_file(
+      self._config.path,
+      "".join(f"{json.dumps(entry)}\n" for entry in entries),
+    )
+    self._file = self._system.open_file(self._config.path)
+
+  @override
+  def offset(self) -> Optional[int]:
+    return self._offset
+
+  @override
+  def links(self, site: str, page: int) -> Optional[List[str]]:
+    with self._lock:
+      return self._pages.get((site, page))
+
+  @override
+  def pending(self, site: str, links: List[str]) -> List[str]:
+    with self._lock:
+      return [link for link in links if (site, link) not in self._done]
+
+  @override
+  def listed(self, site: str, page: int, links: List[str]) -> None:
+    with self._lock:
+      self._pages[(site, page)] = links
+      self._append({"site": site, "page": page, "links": links})
+      self._flush()
+
+  @override
+  def written(self, offset: int, jobs: List[Tuple[str, str]]) -> None:
+    with self._lock:
+      self._append({"offset": offset, "jobs": jobs})
+      self._flush()
+      self._system.sync_file(self._config.path)
+
+  @override
+  def finish(self) -> None:
+    with self._lock:
+      if self._file is not None:
+        self._file.close()
+        self._file = None
+
+      self._system.remove_file(self._config.path)
+
+  def _load(self) -> None:
+    for line in self._system.read_file(self._config.path).splitlines():
+      try:
+        entry = json.loads(line)
+      except json.JSONDecodeError:
+        self._logger.warn(
+          f"Skipping corrupt checkpoint entry in '{self._config.path}'"
+        )
+        continue
+
+      if "page" in entry:
+        self._pages[(entry["site"], entry["page"])] = entry["links"]
+      else:
+        self._offset = entry["offset"]
+        self._done.update((site, link) for site, link in entry["jobs"])
+
+  def _append(self, entry: Dict[str, Any]) -> None:
+    if self._file is None:
+      raise ValueError(f"Checkpoint '{self._config.path}' is closed")
+
+    self._file.write(f"{json.dumps(entry)}\n")
+
+  def _flush(self) -> None:
+    if self._file is not None:
+      self._file.flush()
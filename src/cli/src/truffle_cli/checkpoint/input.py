@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class FileCheckpointConfig:
+  path: str
+  output: str
+  resume: bool
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import Optional
 
+from truffle_cli.checkpoint.input import FileCheckpointConfig
 from truffle_cli.worker import WorkerConfig
 from truffle_cli.writer import WriterConfig
 
@@ -27,3 +28,7 @@ class Loader(ABC):
   @abstractmethod
   def for_writer(self, config: Config) -> WriterConfig:
     pass
+
+  @abstractmethod
+  def for_checkpoint(self, config: Config) -> Optional[FileCheckpointConfig]:
+    pass
@@ -1,8 +1,10 @@
-from dataclasses import dataclass
-from typing import Dict, Literal, Optional, Union
+from dataclasses import dataclass, field
+from typing import Dict, List, Literal, Optional, Union
 
 from truffle_cli.environment import Environment, LogLevel
 from truffle_cli.format import Format
+from truffle_cli.worker.input import SYNC_WORKER_SITE_MAX_PAGES
+from truffle_cli.writer.html import HtmlPolicy
 
 
 @dataclass
@@ -37,6 +39,22 @@ class ArgsConfig:
   output_path: Optional[str] = None
   # Write output in given format
   output_format: Optional[Format] = None
+  # Flush buffered jsonl output at most every given number of seconds
+  output_flush_interval: float = 1.0
+  # Queue given number of records for a background writer (0 writes inline)
+  output_queue_size: int = 256
+  # Commit given number of jobs per sqlite transaction or parquet row group
+  output_batch_size: int = 100
+  # Keep raw html inline, drop it or store it compressed in the html dir
+  output_raw: HtmlPolicy = HtmlPolicy.INLINE
+  # Keep clean html inline, drop it or store it compressed in the html dir
+  output_clean: HtmlPolicy = HtmlPolicy.INLINE
+  # Store html in given content-addressed directory
+  output_html_dir: str = "truffle-html"
+  # Record run progress to given path (defaults next to the output path)
+  checkpoint_path: Optional[str] = None
+  # Resume an interrupted run from its checkpoint
+  resume: bool = False
 
 
 @dataclass
@@ -53,8 +71,14 @@ class FileConfig:
   scraping_service: "ScrapingServiceFileConfig"
   llm_service: "LlmServiceFileConfig"
   worker: "WorkerFileConfig"
+  http_client: "HttpClientFileConfig"
   sites: Dict[str, "SiteFileConfig"]
-  max_pages: int = 50
+  scraping_cache: Optional["ScrapingCacheFileConfig"] = None
+  llm_cache: Optional["LlmCacheFileConfig"] = None
+  incremental: Optional["IncrementalFileConfig"] = None
+  near_duplicates: Optional["NearDuplicateFileConfig"] = None
+  prefilter: Optional["PreFilterFileConfig"] = None
+  max_pages: int = SYNC_WORKER_SITE_MAX_PAGES
 
 
 @dataclass
@@ -72,9 +96,15 @@ class PaginationSiteFileConfig:
   start: int = 0
   stop: int = 50
   step: int = 1
+  prefetch: int = 4
 
 
-WorkerFileConfig = Union["SyncWorkerFileConfig"]
+WorkerFileConfig = Union[
+  "SyncWorkerFileConfig",
+  "ThreadedWorkerFileConfig",
+  "AsyncWorkerFileConfig",
+  "PipelinedWorkerFileConfig",
+]
 
 
 SYNC_WORKER_CONFIG_FILE_TYPE: Literal["sync"] = "sync"
@@ -85,6 +115,74 @@ class SyncWorkerFileConfig:
   type: Literal["sync"] = SYNC_WORKER_CONFIG_FILE_TYPE
 
 
+THREADED_WORKER_CONFIG_FILE_TYPE: Literal["threaded"] = "threaded"
+
+
+@dataclass
+class ThreadedWorkerFileConfig:
+  max_workers: int = 8
+  max_site_workers: int = 4
+  type: Literal["threaded"] = THREADED_WORKER_CONFIG_FILE_TYPE
+
+
+ASYNC_WORKER_CONFIG_FILE_TYPE: Literal["async"] = "async"
+
+
+@dataclass
+class AsyncWorkerFileConfig:
+  max_tasks: int = 256
+  max_site_tasks: int = 64
+  type: Literal["async"] = ASYNC_WORKER_CONFIG_FILE_TYPE
+
+
+PIPELINED_WORKER_CONFIG_FILE_TYPE: Literal["pipelined"] = "pipelined"
+
+
+@dataclass
+class PipelinedWorkerFileConfig:
+  list_workers: int = 2
+  scrape_workers: int = 8
+  parse_workers: int = 2
+  enrich_workers: int = 8
+  queue_size: int = 32
+  type: Literal["pipelined"] = PIPELINED_WORKER_CONFIG_FILE_TYPE
+
+
+HttpClientFileConfig = Union["RequestsHttpClientFileConfig"]
+
+
+REQUESTS_HTTP_CLIENT_FILE_CONFIG_TYPE: Literal["requests"] = "requests"
+
+
+@dataclass
+class RequestsHttpClientFileConfig:
+  pool_connections: int = 10
+  pool_maxsize: int = 10
+  pool_block: bool = False
+  keep_alive: bool = True
+  timeout: Optional[float] = 300
+  retry: Optional["RetryFileConfig"] = field(
+    default_factory=lambda: RetryFileConfig()
+  )
+  type: Literal["requests"] = REQUESTS_HTTP_CLIENT_FILE_CONFIG_TYPE
+
+
+@dataclass
+class RetryFileConfig:
+  max_attempts: int = 4
+  backoff_base: float = 1
+  backoff_max: float = 30
+  statuses: Optional[List[int]] = None
+
+
+@dataclass
+class RateLimitFileConfig:
+  requests_per_second: Optional[float] = None
+  tokens_per_minute: Optional[float] = None
+  max_concurrency: int = 16
+  max_retries: int = 5
+
+
 ScrapingServiceFileConfig = Union["ZyteScrapingServiceFileConfig"]
 
 
@@ -98,10 +196,21 @@ class ZyteScrapingServiceFileConfig:
   requires_browser: bool = False
   list_payload: Optional[dict] = None
   details_payload: Optional[dict] = None
+  rate_limit: Optional["RateLimitFileConfig"] = None
   type: Literal["zyte"] = ZYTE_SCRAPING_SERVICE_FILE_CONFIG_TYPE
 
 
-HtmlProcessorFileConfig = Union["BeautifulSoupHtmlProcessorFileConfig"]
+@dataclass
+class ScrapingCacheFileConfig:
+  path: Optional[str] = None
+  list_ttl: Optional[float] = 60 * 60
+  details_ttl: Optional[float] = 7 * 24 * 60 * 60
+  max_size: int = 1024 * 1024 * 1024
+
+
+HtmlProcessorFileConfig = Union[
+  "BeautifulSoupHtmlProcessorFileConfig", "LxmlHtmlProcessorFileConfig"
+]
 
 
 BEAUTIFUL_SOUP_HTML_PROCESSOR_FILE_CONFIG_TYPE: Literal["beautiful-soup"] = (
@@ -119,11 +228,28 @@ class BeautifulSoupHtmlProcessorFileConfig:
   )
 
 
-LlmServiceFileConfig = Union["OpenaiLlmServiceFileConfig"]
+LXML_HTML_PROCESSOR_FILE_CONFIG_TYPE: Literal["lxml"] = "lxml"
+
+
+@dataclass
+class LxmlHtmlProcessorFileConfig:
+  link_selector: str
+  title_selector: str
+  details_selector: str
+  type: Literal["lxml"] = LXML_HTML_PROCESSOR_FILE_CONFIG_TYPE
+
+
+LlmServiceFileConfig = Union[
+  "OpenaiLlmServiceFileConfig", "OpenaiBatchLlmServiceFileConfig"
+]
 
 
 OPENAI_LLM_SERVICE_FILE_CONFIG_TYPE: Literal["openai"] = "openai"
 
+OPENAI_BATCH_LLM_SERVICE_FILE_CONFIG_TYPE: Literal["openai-batch"] = (
+  "openai-batch"
+)
+
 
 @dataclass
 class OpenaiLlmServiceFileConfig:
@@ -135,4 +261,56 @@ class OpenaiLlmServiceFileConfig:
   cv: Optional[str] = None
   api_key: Optional[str] = None
   thinking_regex: Optional[str] = None
+  combined: bool = False
+  rate_limit: Optional["RateLimitFileConfig"] = None
   type: Literal["openai"] = OPENAI_LLM_SERVICE_FILE_CONFIG_TYPE
+
+
+@dataclass
+class OpenaiBatchLlmServiceFileConfig:
+  base_url: str
+  model: str
+  extraction_prompt: str
+  summary_prompt: str
+  scoring_prompt: str
+  cv: Optional[str] = None
+  api_key: Optional[str] = None
+  thinking_regex: Optional[str] = None
+  combined: bool = False
+  completion_window: str = "24h"
+  poll_interval: float = 60
+  rate_limit: Optional["RateLimitFileConfig"] = None
+  type: Literal["openai-batch"] = OPENAI_BATCH_LLM_SERVICE_FILE_CONFIG_TYPE
+
+
+@dataclass
+class LlmCacheFileConfig:
+  path: Optional[str] = None
+  ttl: Optional[float] = 30 * 24 * 60 * 60
+  max_size: int = 1024 * 1024 * 1024
+
+
+IncrementalFileMode = Literal["skip", "emit", "verify"]
+
+
+@dataclass
+class IncrementalFileConfig:
+  path: Optional[str] = None
+  mode: IncrementalFileMode = "emit"
+  ttl: Optional[float] = None
+  max_size: int = 4 * 1024 * 1024 * 1024
+
+
+@dataclass
+class NearDuplicateFileConfig:
+  path: Optional[str] = None
+  threshold: float = 0.9
+  ttl: Optional[float] = 30 * 24 * 60 * 60
+  max_size: int = 1024 * 1024 * 1024
+
+
+@dataclass
+class PreFilterFileConfig:
+  include: List[str] = field(default_factory=lambda: [])
+  exclude: List[str] = field(default_factory=lambda: [])
+  threshold: Optional[float] = None
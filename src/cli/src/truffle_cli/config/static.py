@@ -3,6 +3,7 @@ from typing import Final
 from truffle_cli.config.input import (
   BEAUTIFUL_SOUP_HTML_PROCESSOR_FILE_CONFIG_TYPE,
   OPENAI_LLM_SERVICE_FILE_CONFIG_TYPE,
+  REQUESTS_HTTP_CLIENT_FILE_CONFIG_TYPE,
   SYNC_WORKER_CONFIG_FILE_TYPE,
   ZYTE_SCRAPING_SERVICE_FILE_CONFIG_TYPE,
 )
@@ -33,6 +34,9 @@ STATIC_CONFIG: Final[dict] = {
   "worker": {
     "type": SYNC_WORKER_CONFIG_FILE_TYPE,
   },
+  "http_client": {
+    "type": REQUESTS_HTTP_CLIENT_FILE_CONFIG_TYPE,
+  },
   "sites": {
     # spell-checker: disable-next-line
     "posao": {
@@ -1,6 +1,6 @@
 import io
 import json
-from typing import Any, Final, List, Optional, override
+from typing import Any, Dict, Final, List, Optional, Union, override
 
 import apischema
 import dacite
@@ -8,40 +8,78 @@ import simple_parsing
 from omegaconf import OmegaConf
 from omegaconf import ValidationError as OmegaconfValidationError
 
+import truffle_cli.writer as truffle_writer
+from truffle_cli.cache.input import SQLITE_CACHE_TYPE, SqliteCacheConfig
+from truffle_cli.checkpoint.input import FileCheckpointConfig
 from truffle_cli.environment import Environment, LogLevel
 from truffle_cli.format import Format
 from truffle_cli.html_processor.input import (
   BEAUTIFUL_SOUP_HTML_PROCESSOR_TYPE,
+  LXML_HTML_PROCESSOR_TYPE,
   BeautifulSoupHtmlProcessorConfig,
+  LxmlHtmlProcessorConfig,
+)
+from truffle_cli.http_client.input import (
+  REQUESTS_HTTP_CLIENT_TYPE,
+  RETRY_STATUS_CODES,
+  THROTTLE_STATUS_CODES,
+  HttpClientConfig,
+  RateLimitConfig,
+  RequestsHttpClientConfig,
+  RetryConfig,
 )
 from truffle_cli.llm_service.input import (
+  OPENAI_BATCH_LLM_SERVICE_TYPE,
   OPENAI_LLM_SERVICE_TYPE,
+  LlmCacheConfig,
+  OpenaiBatchLlmServiceConfig,
   OpenaiLlmServiceConfig,
 )
 from truffle_cli.logger.abstract import Logger
 from truffle_cli.scraping_service.input import (
   ZYTE_SCRAPING_SERVICE_TYPE,
+  ScrapingCacheConfig,
   ZyteScrapingServiceConfig,
 )
 from truffle_cli.system.abstract import System
 from truffle_cli.worker.input import (
+  ASYNC_WORKER_TYPE,
+  PIPELINED_WORKER_TYPE,
   SYNC_WORKER_TYPE,
+  THREADED_WORKER_TYPE,
+  AsyncWorkerConfig,
+  IncrementalConfig,
+  NearDuplicateConfig,
   PaginationSyncWorkerSiteConfig,
+  PipelinedWorkerConfig,
+  PreFilterConfig,
   SyncWorkerConfig,
   SyncWorkerSiteConfig,
+  ThreadedWorkerConfig,
   WorkerConfig,
 )
 from truffle_cli.writer import WriterConfig
 
 from .abstract import Loader
 from .input import (
+  ASYNC_WORKER_CONFIG_FILE_TYPE,
   BEAUTIFUL_SOUP_HTML_PROCESSOR_FILE_CONFIG_TYPE,
+  LXML_HTML_PROCESSOR_FILE_CONFIG_TYPE,
+  OPENAI_BATCH_LLM_SERVICE_FILE_CONFIG_TYPE,
   OPENAI_LLM_SERVICE_FILE_CONFIG_TYPE,
+  PIPELINED_WORKER_CONFIG_FILE_TYPE,
+  REQUESTS_HTTP_CLIENT_FILE_CONFIG_TYPE,
+  SYNC_WORKER_CONFIG_FILE_TYPE,
+  THREADED_WORKER_CONFIG_FILE_TYPE,
   ZYTE_SCRAPING_SERVICE_FILE_CONFIG_TYPE,
   ArgsConfig,
   Config,
   EnvConfig,
   FileConfig,
+  LlmServiceFileConfig,
+  RateLimitFileConfig,
+  RetryFileConfig,
+  ScrapingServiceFileConfig,
 )
 from .static import STATIC_CONFIG
 
@@ -97,6 +135,10 @@ class SystemLoader(Loader):
     parser = simple_parsing.ArgumentParser(add_help=False)
     parser.add_arguments(dataclass=ArgsConfig, dest="config")
     args_config = parser.parse_args(args).config
+    if args_config.resume and not truffle_writer.resumable(
+      self._system, args_config.output_path
+    ):
+      raise ValueError("Resuming requires a toml, yaml, json or jsonl output")
 
     env_config = EnvConfig()
     env_config.zyte_api_key = self._system.get_env_var(
@@ -148,97 +190,372 @@ class SystemLoader(Loader):
 
   @override
   def for_worker(self, config: Config) -> WorkerConfig:
-    if config.file.worker.type == "sync":
-      site_configs = {}
-      for site_name, site_file_config in config.file.sites.items():
-        if site_file_config.scraping_service is None:
-          file_scraping_service = config.file.scraping_service
-        else:
-          file_scraping_service = site_file_config.scraping_service
-
-        if file_scraping_service.type == ZYTE_SCRAPING_SERVICE_FILE_CONFIG_TYPE:
-          api_key = config.env.zyte_api_key or file_scraping_service.api_key
-          if api_key is None:
-            raise ValueError("API key not set for Zyte scraping service")
-          scraping_service = ZyteScrapingServiceConfig(
-            base_url=file_scraping_service.base_url,
-            api_key=api_key,
-            requires_browser=file_scraping_service.requires_browser,
-            list_payload=file_scraping_service.list_payload or {},
-            details_payload=file_scraping_service.details_payload or {},
-            type=ZYTE_SCRAPING_SERVICE_TYPE,
-          )
-        else:
-          raise ValueError(
-            f"Unknown scraping service {file_scraping_service.type}"
-          )
-
-        if (
-          site_file_config.html_processor.type
-          == BEAUTIFUL_SOUP_HTML_PROCESSOR_FILE_CONFIG_TYPE
-        ):
-          html_processor = BeautifulSoupHtmlProcessorConfig(
-            link_selector=site_file_config.html_processor.link_selector,
-            title_selector=site_file_config.html_processor.title_selector,
-            details_selector=site_file_config.html_processor.details_selector,
-            type=BEAUTIFUL_SOUP_HTML_PROCESSOR_TYPE,
-          )
-        else:
-          raise ValueError(
-            f"Unknown html processor {site_file_config.html_processor.type}"
-          )
-
-        if site_file_config.llm_service is None:
-          file_llm_service = config.file.llm_service
-        else:
-          file_llm_service = site_file_config.llm_service
-
-        if file_llm_service.type == OPENAI_LLM_SERVICE_FILE_CONFIG_TYPE:
-          api_key = config.env.openai_api_key or file_llm_service.api_key
-          if api_key is None:
-            raise ValueError("API key not set for OpenAI API service")
-          cv = config.env.cv or file_llm_service.cv
-          if cv is None:
-            raise ValueError("CV not set")
-          llm_service = OpenaiLlmServiceConfig(
-            base_url=file_llm_service.base_url,
-            api_key=api_key,
-            model=file_llm_service.model,
-            cv=self._read_if_path(cv),
-            extraction_prompt=file_llm_service.extraction_prompt,
-            summary_prompt=file_llm_service.summary_prompt,
-            scoring_prompt=file_llm_service.scoring_prompt,
-            thinking_regex=file_llm_service.thinking_regex,
-            type=OPENAI_LLM_SERVICE_TYPE,
-          )
-        else:
-          raise ValueError(f"Unknown llm service {file_llm_service.type}")
-
-        pagination = PaginationSyncWorkerSiteConfig(
-          template=site_file_config.pagination.template,
-          start=site_file_config.pagination.start,
-          stop=site_file_config.pagination.stop,
-          step=site_file_config.pagination.step,
+    if config.file.worker.type == SYNC_WORKER_CONFIG_FILE_TYPE:
+      return SyncWorkerConfig(
+        sites=self._for_sites(config),
+        http_client=self._for_http_client(config),
+        type=SYNC_WORKER_TYPE,
+      )
+    elif config.file.worker.type == THREADED_WORKER_CONFIG_FILE_TYPE:
+      _check_positive("Worker max_workers", config.file.worker.max_workers)
+      _check_positive(
+        "Worker max_site_workers", config.file.worker.max_site_workers
+      )
+      return ThreadedWorkerConfig(
+        sites=self._for_sites(config),
+        http_client=self._for_http_client(config),
+        max_workers=config.file.worker.max_workers,
+        max_site_workers=config.file.worker.max_site_workers,
+        type=THREADED_WORKER_TYPE,
+      )
+    elif config.file.worker.type == ASYNC_WORKER_CONFIG_FILE_TYPE:
+      _check_positive("Worker max_tasks", config.file.worker.max_tasks)
+      _check_positive(
+        "Worker max_site_tasks", config.file.worker.max_site_tasks
+      )
+      return AsyncWorkerConfig(
+        sites=self._for_sites(config),
+        http_client=self._for_http_client(config),
+        max_tasks=config.file.worker.max_tasks,
+        max_site_tasks=config.file.worker.max_site_tasks,
+        type=ASYNC_WORKER_TYPE,
+      )
+    elif config.file.worker.type == PIPELINED_WORKER_CONFIG_FILE_TYPE:
+      _check_positive("Worker list_workers", config.file.worker.list_workers)
+      _check_positive(
+        "Worker scrape_workers", config.file.worker.scrape_workers
+      )
+      _check_positive("Worker parse_workers", config.file.worker.parse_workers)
+      _check_positive(
+        "Worker enrich_workers", config.file.worker.enrich_workers
+      )
+      return PipelinedWorkerConfig(
+        sites=self._for_sites(config),
+        http_client=self._for_http_client(config),
+        list_workers=config.file.worker.list_workers,
+        scrape_workers=config.file.worker.scrape_workers,
+        parse_workers=config.file.worker.parse_workers,
+        enrich_workers=config.file.worker.enrich_workers,
+        queue_size=config.file.worker.queue_size,
+        type=PIPELINED_WORKER_TYPE,
+      )
+
+    raise ValueError(f"Unknown worker {config.file.worker.type}")
+
+  def _for_http_client(self, config: Config) -> HttpClientConfig:
+    file_http_client = config.file.http_client
+    if file_http_client.type == REQUESTS_HTTP_CLIENT_FILE_CONFIG_TYPE:
+      return RequestsHttpClientConfig(
+        pool_connections=file_http_client.pool_connections,
+        pool_maxsize=file_http_client.pool_maxsize,
+        pool_block=file_http_client.pool_block,
+        keep_alive=file_http_client.keep_alive,
+        timeout=file_http_client.timeout,
+        retry=self._for_retry(config, file_http_client.retry),
+        type=REQUESTS_HTTP_CLIENT_TYPE,
+      )
+
+    raise ValueError(f"Unknown http client {file_http_client.type}")
+
+  def _for_retry(
+    self, config: Config, file_retry: Optional[RetryFileConfig]
+  ) -> Optional[RetryConfig]:
+    if file_retry is None:
+      return None
+
+    statuses = file_retry.statuses
+    if statuses is None:
+      # NOTE: a rate limiter backs off the whole service on throttling
+      # so only retry throttled requests when none is configured
+      statuses = RETRY_STATUS_CODES
+      if not _rate_limited(config):
+        statuses = [*statuses, *THROTTLE_STATUS_CODES]
+
+    return RetryConfig(
+      max_attempts=file_retry.max_attempts,
+      backoff_base=file_retry.backoff_base,
+      backoff_max=file_retry.backoff_max,
+      statuses=statuses,
+    )
+
+  def _for_rate_limit(
+    self, file_rate_limit: Optional[RateLimitFileConfig]
+  ) -> Optional[RateLimitConfig]:
+    if file_rate_limit is None:
+      return None
+
+    return RateLimitConfig(
+      requests_per_second=file_rate_limit.requests_per_second,
+      tokens_per_minute=file_rate_limit.tokens_per_minute,
+      max_concurrency=file_rate_limit.max_concurrency,
+      max_retries=file_rate_limit.max_retries,
+    )
+
+  def _for_scraping_cache(
+    self, config: Config
+  ) -> Optional[ScrapingCacheConfig]:
+    file_scraping_cache = config.file.scraping_cache
+    if file_scraping_cache is None:
+      return None
+
+    path = file_scraping_cache.path
+    if path is None:
+      path = self._system.path_join(
+        self._system.path_join(self._system.get_cache_dir(), CONFIG_FILE_NAME),
+        "scraping.sqlite",
+      )
+
+    return ScrapingCacheConfig(
+      cache=SqliteCacheConfig(
+        path=path,
+        max_size=file_scraping_cache.max_size,
+        type=SQLITE_CACHE_TYPE,
+      ),
+      list_ttl=file_scraping_cache.list_ttl,
+      details_ttl=file_scraping_cache.details_ttl,
+    )
+
+  def _for_llm_cache(self, config: Config) -> Optional[LlmCacheConfig]:
+    file_llm_cache = config.file.llm_cache
+    if file_llm_cache is None:
+      return None
+
+    path = file_llm_cache.path
+    if path is None:
+      path = self._system.path_join(
+        self._system.path_join(self._system.get_cache_dir(), CONFIG_FILE_NAME),
+        "llm.sqlite",
+      )
+
+    return LlmCacheConfig(
+      cache=SqliteCacheConfig(
+        path=path,
+        max_size=file_llm_cache.max_size,
+        type=SQLITE_CACHE_TYPE,
+      ),
+      ttl=file_llm_cache.ttl,
+    )
+
+  def _for_incremental(self, config: Config) -> Optional[IncrementalConfig]:
+    file_incremental = config.file.incremental
+    if file_incremental is None:
+      return None
+
+    path = file_incremental.path
+    if path is None:
+      path = self._system.path_join(
+        self._system.path_join(self._system.get_cache_dir(), CONFIG_FILE_NAME),
+        "index.sqlite",
+      )
+
+    return IncrementalConfig(
+      cache=SqliteCacheConfig(
+        path=path,
+        max_size=file_incremental.max_size,
+        type=SQLITE_CACHE_TYPE,
+      ),
+      mode=file_incremental.mode,
+      ttl=file_incremental.ttl,
+    )
+
+  def _for_near_duplicates(
+    self, config: Config
+  ) -> Optional[NearDuplicateConfig]:
+    file_near_duplicates = config.file.near_duplicates
+    if file_near_duplicates is None:
+      return None
+
+    if not 0.5 <= file_near_duplicates.threshold <= 1:
+      raise ValueError(
+        "Near duplicate threshold must be between 0.5 and 1, "
+        f"got {file_near_duplicates.threshold}"
+      )
+
+    path = file_near_duplicates.path
+    if path is None:
+      path = self._system.path_join(
+        self._system.path_join(self._system.get_cache_dir(), CONFIG_FILE_NAME),
+        "near-duplicates.sqlite",
+      )
+
+    return NearDuplicateConfig(
+      cache=SqliteCacheConfig(
+        path=path,
+        max_size=file_near_duplicates.max_size,
+        type=SQLITE_CACHE_TYPE,
+      ),
+      threshold=file_near_duplicates.threshold,
+      ttl=file_near_duplicates.ttl,
+    )
+
+  def _for_prefilter(self, config: Config) -> Optional[PreFilterConfig]:
+    file_prefilter = config.file.prefilter
+    if file_prefilter is None:
+      return None
+
+    return PreFilterConfig(
+      include=file_prefilter.include,
+      exclude=file_prefilter.exclude,
+      threshold=file_prefilter.threshold,
+    )
+
+  def _for_sites(self, config: Config) -> Dict[str, SyncWorkerSiteConfig]:
+    site_configs = {}
+    for site_name, site_file_config in config.file.sites.items():
+      if site_file_config.scraping_service is None:
+        file_scraping_service = config.file.scraping_service
+      else:
+        file_scraping_service = site_file_config.scraping_service
+
+      if file_scraping_service.type == ZYTE_SCRAPING_SERVICE_FILE_CONFIG_TYPE:
+        api_key = config.env.zyte_api_key or file_scraping_service.api_key
+        if api_key is None:
+          raise ValueError("API key not set for Zyte scraping service")
+        scraping_service = ZyteScrapingServiceConfig(
+          base_url=file_scraping_service.base_url,
+          api_key=api_key,
+          requires_browser=file_scraping_service.requires_browser,
+          list_payload=file_scraping_service.list_payload or {},
+          details_payload=file_scraping_service.details_payload or {},
+          type=ZYTE_SCRAPING_SERVICE_TYPE,
+        )
+      else:
+        raise ValueError(
+          f"Unknown scraping service {file_scraping_service.type}"
+        )
+
+      if (
+        site_file_config.html_processor.type
+        == BEAUTIFUL_SOUP_HTML_PROCESSOR_FILE_CONFIG_TYPE
+      ):
+        html_processor = BeautifulSoupHtmlProcessorConfig(
+          link_selector=site_file_config.html_processor.link_selector,
+          title_selector=site_file_config.html_processor.title_selector,
+          details_selector=site_file_config.html_processor.details_selector,
+          type=BEAUTIFUL_SOUP_HTML_PROCESSOR_TYPE,
+        )
+      elif (
+        site_file_config.html_processor.type
+        == LXML_HTML_PROCESSOR_FILE_CONFIG_TYPE
+      ):
+        html_processor = LxmlHtmlProcessorConfig(
+          link_selector=site_file_config.html_processor.link_selector,
+          title_selector=site_file_config.html_processor.title_selector,
+          details_selector=site_file_config.html_processor.details_selector,
+          type=LXML_HTML_PROCESSOR_TYPE,
+        )
+      else:
+        raise ValueError(
+          f"Unknown html processor {site_file_config.html_processor.type}"
         )
 
-        site_config = SyncWorkerSiteConfig(
-          base_url=site_file_config.base_url,
-          scraping_service=scraping_service,
-          html_processor=html_processor,
-          llm_service=llm_service,
-          pagination=pagination,
+      if site_file_config.llm_service is None:
+        file_llm_service = config.file.llm_service
+      else:
+        file_llm_service = site_file_config.llm_service
+
+      if file_llm_service.type == OPENAI_LLM_SERVICE_FILE_CONFIG_TYPE:
+        api_key = config.env.openai_api_key or file_llm_service.api_key
+        if api_key is None:
+          raise ValueError("API key not set for OpenAI API service")
+        cv = config.env.cv or file_llm_service.cv
+        if cv is None:
+          raise ValueError("CV not set")
+        llm_service = OpenaiLlmServiceConfig(
+          base_url=file_llm_service.base_url,
+          api_key=api_key,
+          model=file_llm_service.model,
+          cv=self._read_if_path(cv),
+          extraction_prompt=file_llm_service.extraction_prompt,
+          summary_prompt=file_llm_service.summary_prompt,
+          scoring_prompt=file_llm_service.scoring_prompt,
+          thinking_regex=file_llm_service.thinking_regex,
+          combined=file_llm_service.combined,
+          type=OPENAI_LLM_SERVICE_TYPE,
         )
+      elif file_llm_service.type == OPENAI_BATCH_LLM_SERVICE_FILE_CONFIG_TYPE:
+        api_key = config.env.openai_api_key or file_llm_service.api_key
+        if api_key is None:
+          raise ValueError("API key not set for OpenAI batch API service")
+        cv = config.env.cv or file_llm_service.cv
+        if cv is None:
+          raise ValueError("CV not set")
+        llm_service = OpenaiBatchLlmServiceConfig(
+          base_url=file_llm_service.base_url,
+          api_key=api_key,
+          model=file_llm_service.model,
+          cv=self._read_if_path(cv),
+          extraction_prompt=file_llm_service.extraction_prompt,
+          summary_prompt=file_llm_service.summary_prompt,
+          scoring_prompt=file_llm_service.scoring_prompt,
+          thinking_regex=file_llm_service.thinking_regex,
+          combined=file_llm_service.combined,
+          completion_window=file_llm_service.completion_window,
+          poll_interval=file_llm_service.poll_interval,
+          type=OPENAI_BATCH_LLM_SERVICE_TYPE,
+        )
+      else:
+        raise ValueError(f"Unknown llm service {file_llm_service.type}")
 
-        site_configs[site_name] = site_config
+      if site_file_config.pagination.prefetch < 1:
+        raise ValueError(
+          "Pagination prefetch must be at least 1, "
+          f"got {site_file_config.pagination.prefetch}"
+        )
 
-      return SyncWorkerConfig(sites=site_configs, type=SYNC_WORKER_TYPE)
+      pagination = PaginationSyncWorkerSiteConfig(
+        template=site_file_config.pagination.template,
+        start=site_file_config.pagination.start,
+        stop=site_file_config.pagination.stop,
+        step=site_file_config.pagination.step,
+        max_pages=config.file.max_pages,
+        prefetch=site_file_config.pagination.prefetch,
+      )
 
-    raise ValueError(f"Unknown worker {config.file.worker.type}")
+      site_config = SyncWorkerSiteConfig(
+        base_url=site_file_config.base_url,
+        scraping_service=scraping_service,
+        scraping_cache=self._for_scraping_cache(config),
+        html_processor=html_processor,
+        llm_service=llm_service,
+        llm_cache=self._for_llm_cache(config),
+        incremental=self._for_incremental(config),
+        near_duplicates=self._for_near_duplicates(config),
+        prefilter=self._for_prefilter(config),
+        scraping_rate_limit=self._for_rate_limit(
+          file_scraping_service.rate_limit
+        ),
+        llm_rate_limit=self._for_rate_limit(file_llm_service.rate_limit),
+        pagination=pagination,
+      )
+
+      site_configs[site_name] = site_config
+
+    return site_configs
 
   @override
   def for_writer(self, config: Config) -> WriterConfig:
     return WriterConfig(
-      config.args.output_path, config.args.output_format or Format.JSON
+      config.args.output_path,
+      config.args.output_format or Format.JSON,
+      config.args.output_flush_interval,
+      config.args.output_queue_size,
+      config.args.output_batch_size,
+      config.args.output_raw,
+      config.args.output_clean,
+      config.args.output_html_dir,
+    )
+
+  @override
+  def for_checkpoint(self, config: Config) -> Optional[FileCheckpointConfig]:
+    path = config.args.output_path
+    if path is None or not truffle_writer.resumable(self._system, path):
+      return None
+
+    return FileCheckpointConfig(
+      config.args.checkpoint_path or f"{path}.checkpoint",
+      path,
+      config.args.resume,
     )
 
   def _find_dynamic_config(
@@ -290,3 +607,22 @@ class SystemLoader(Loader):
       raise ValueError("Value is not a dictionary")
 
     return json.loads(json.dumps(value))
+
+
+def _check_positive(name: str, value: int) -> None:
+  if value < 1:
+    raise ValueError(f"{name} must be at least 1, got {value}")
+
+
+def _rate_limited(config: Config) -> bool:
+  services: List[Union[ScrapingServiceFileConfig, LlmServiceFileConfig]] = [
+    config.file.scraping_service,
+    config.file.llm_service,
+  ]
+  for site in config.file.sites.values():
+    if site.scraping_service is not None:
+      services.append(site.scraping_service)
+    if site.llm_service is not None:
+      services.append(site.llm_service)
+
+  return any(service.rate_limit is not None for service in services)
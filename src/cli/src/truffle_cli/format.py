@@ -10,6 +10,7 @@ class Format(str, Enum):
   TOML = "toml"
   YAML = "yaml"
   JSON = "json"
+  JSONL = "jsonl"
 
   @property
   def type(self) -> str:
@@ -27,6 +28,8 @@ class Format(str, Enum):
       return ["yaml", "yml"]
     elif self is Format.JSON:
       return ["json"]
+    elif self is Format.JSONL:
+      return ["jsonl", "ndjson"]
 
     raise ValueError(f"Unsupported format: {self}")
 
@@ -38,6 +41,8 @@ class Format(str, Enum):
       return Format.YAML
     elif extension in Format.JSON.extensions:
       return Format.JSON
+    elif extension in Format.JSONL.extensions:
+      return Format.JSONL
 
     raise ValueError(f"Unsupported format extension: {extension}")
 
@@ -53,6 +58,8 @@ class Format(str, Enum):
       return Format.YAML
     elif type == Format.JSON.type:
       return Format.JSON
+    elif type == Format.JSONL.type:
+      return Format.JSONL
 
     raise ValueError(f"Unsupported format type: {type}")
 
@@ -63,6 +70,8 @@ class Format(str, Enum):
       return yaml.safe_load(serialized)
     elif self is Format.JSON:
       return json.loads(serialized)
+    elif self is Format.JSONL:
+      return [json.loads(line) for line in serialized.splitlines() if line]
 
     raise ValueError(f"Unsupported format: {self}")
 
@@ -73,5 +82,7 @@ class Format(str, Enum):
       return yaml.safe_dump(deserialized)
     elif self is Format.JSON:
       return json.dumps(deserialized)
+    elif self is Format.JSONL:
+      return "".join(f"{json.dumps(line)}\n" for line in deserialized)
 
     raise ValueError(f"Unsupported format: {self}")
@@ -1,8 +1,21 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from typing import List
 
 
+@dataclass
+class HtmlDocument:
+  title: str
+  details: str
+  clean: str
+  links: List[str]
+
+
 class HtmlProcessor(ABC):
+  @abstractmethod
+  def process(self, html: str) -> HtmlDocument:
+    pass
+
   @abstractmethod
   def clean(self, html: str) -> str:
     pass
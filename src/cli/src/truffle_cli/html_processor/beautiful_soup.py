@@ -1,19 +1,65 @@
-from html import unescape
-from typing import List, override
+import re
+from copy import copy
+from typing import Dict, Iterator, List, Optional, Tuple, override
 
-from bs4 import BeautifulSoup, Comment
+import soupsieve
+from bs4 import BeautifulSoup, Comment, Tag
+from bs4.element import NavigableString, PageElement
 
 from truffle_cli.logger.abstract import Logger
 from truffle_cli.system.abstract import System
 
-from .abstract import HtmlProcessor
+from .abstract import HtmlDocument, HtmlProcessor
+from .common import (
+  ALLOWED_ATTRS,
+  ALLOWED_TAGS,
+  DISALLOWED_SELECTORS,
+  DISALLOWED_TAGS,
+  collapse,
+)
 from .input import BeautifulSoupHtmlProcessorConfig
 
+_SUBSTRING_SELECTOR = re.compile(r'\[([\w-]+)\*="([^"]+)"\]')
+
+
+class _Selectors:
+  _substrings: Dict[str, List[str]]
+  _others: Optional[soupsieve.SoupSieve]
+
+  def __init__(self, selectors: List[str]):
+    self._substrings = {}
+
+    others = []
+    for selector in selectors:
+      match = _SUBSTRING_SELECTOR.fullmatch(selector)
+      if match is None:
+        others.append(selector)
+        continue
+
+      attr, substring = match.groups()
+      self._substrings.setdefault(attr, []).append(substring)
+
+    self._others = soupsieve.compile(", ".join(others)) if others else None
+
+  def match(self, tag: Tag) -> bool:
+    for attr, substrings in self._substrings.items():
+      value = tag.get(attr)
+      if value is None:
+        continue
+
+      if isinstance(value, list):
+        value = " ".join(value)
+      if any(substring in value for substring in substrings):
+        return True
+
+    return self._others is not None and self._others.match(tag)
+
 
 class BeautifulSoupHtmlProcessor(HtmlProcessor):
   _config: BeautifulSoupHtmlProcessorConfig
   _system: System
   _logger: Logger
+  _disallowed: _Selectors
 
   def __init__(self, system: System, config: BeautifulSoupHtmlProcessorConfig):
     self._config = config
@@ -21,6 +67,21 @@ class BeautifulSoupHtmlProcessor(HtmlProcessor):
 
     self._logger = self._system.get_logger(__name__)
 
+    self._disallowed = _Selectors(DISALLOWED_SELECTORS)
+
+  @override
+  def process(self, html: str) -> HtmlDocument:
+    soup = BeautifulSoup(html, "html.parser")
+
+    links = self._links(soup)
+    title = self._clean(_fragment(soup.select_one(self._config.title_selector)))
+    details = self._clean(
+      _fragment(soup.select_one(self._config.details_selector))
+    )
+    clean = self._clean(soup)
+
+    return HtmlDocument(title, details, clean, links)
+
   @override
   def title(self, html: str) -> str:
     soup = BeautifulSoup(html, "html.parser")
@@ -43,8 +104,13 @@ class BeautifulSoupHtmlProcessor(HtmlProcessor):
 
   @override
   def links(self, html: str) -> List[str]:
-    soup = BeautifulSoup(html, "html.parser")
+    return self._links(BeautifulSoup(html, "html.parser"))
+
+  @override
+  def clean(self, html: str) -> str:
+    return self._clean(BeautifulSoup(html, "html.parser"))
 
+  def _links(self, soup: BeautifulSoup) -> List[str]:
     elements = soup.select(self._config.link_selector)
 
     links = []
@@ -57,74 +123,57 @@ class BeautifulSoupHtmlProcessor(HtmlProcessor):
 
     return links
 
-  @override
-  def clean(self, html: str) -> str:
-    soup = BeautifulSoup(html, "html.parser")
-
-    disallowed_tags = ["script", "style", "nav", "header", "footer", "aside"]
-    for element in soup(disallowed_tags):
-      element.decompose()
-
-    disallowed_selectors = [
-      '[class*="ad-"]',
-      '[class*="advertisement"]',
-      '[class*="tracking"]',
-      '[class*="cookie"]',
-      '[class*="popup"]',
-      '[class*="modal"]',
-      '[id*="google"]',
-      '[class*="google"]',
+  def _clean(self, soup: BeautifulSoup) -> str:
+    stack: List[Tuple[Tag, Iterator[PageElement]]] = [
+      (soup, iter(list(soup.contents)))
     ]
-    for selector in disallowed_selectors:
-      for element in soup.select(selector):
-        element.decompose()
-
-    allowed_tags = [
-      "h1",
-      "h2",
-      "h3",
-      "h4",
-      "h5",
-      "h6",
-      "p",
-      "div",
-      "span",
-      "ul",
-      "ol",
-      "li",
-      "strong",
-      "b",
-      "em",
-      "i",
-    ]
-    for tag in soup.find_all():
-      if tag.name not in allowed_tags:  # type: ignore
-        tag.unwrap()  # type: ignore
-
-    for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
-      comment.extract()
+    texts = [False]
+    while stack:
+      tag, children = stack[-1]
+
+      child = next(children, None)
+      if child is None:
+        stack.pop()
+        text = texts.pop()
+        if not stack:
+          break
+
+        if tag.name not in ALLOWED_TAGS:
+          tag.hidden = True
+        elif not text:
+          tag.decompose()
+          continue
+        else:
+          tag.attrs = {k: v for k, v in tag.attrs.items() if k in ALLOWED_ATTRS}
+
+        texts[-1] = texts[-1] or text
+        continue
+
+      if isinstance(child, Tag):
+        if child.name in DISALLOWED_TAGS or self._disallowed.match(child):
+          child.decompose()
+          continue
+
+        stack.append((child, iter(list(child.contents))))
+        texts.append(False)
+      elif isinstance(child, Comment):
+        child.extract()
+      elif isinstance(child, NavigableString):
+        if type(child) in Tag.MAIN_CONTENT_STRING_TYPES and child.strip():
+          texts[-1] = True
+
+    clean = collapse(str(soup))
 
-    for tag in soup.find_all():
-      if tag.get_text(strip=True) == "":
-        tag.decompose()
-
-    allowed_attrs = ["id", "title", "alt", "href"]
-    for tag in soup.find_all():
-      if hasattr(tag, "attrs"):
-        tag.attrs = {  # type: ignore
-          k: v
-          for k, v in tag.attrs.items()  # type: ignore
-          if k in allowed_attrs  # type: ignore
-        }
+    self._logger.debug(f"Cleaned: {clean}")
 
-    text = str(soup)
+    return clean
 
-    lines = (line.strip() for line in text.splitlines())
-    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-    text = " ".join(chunk for chunk in chunks if chunk)
 
-    clean = unescape(text)
+def _fragment(element: Optional[Tag]) -> BeautifulSoup:
+  if element is None:
+    return BeautifulSoup(str(element), "html.parser")
 
-    self._logger.debug(f"Cleaned: {clean}")
+  fragment = BeautifulSoup("", "html.parser")
+  fragment.append(copy(element))
 
-    return clean
+  return fragment
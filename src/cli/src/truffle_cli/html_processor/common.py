@@ -0,0 +1,51 @@
+from html import unescape
+from typing import Final, List
+
+DISALLOWED_TAGS: Final[List[str]] = [
+  "script",
+  "style",
+  "nav",
+  "header",
+  "footer",
+  "aside",
+]
+
+DISALLOWED_SELECTORS: Final[List[str]] = [
+  '[class*="ad-"]',
+  '[class*="advertisement"]',
+  '[class*="tracking"]',
+  '[class*="cookie"]',
+  '[class*="popup"]',
+  '[class*="modal"]',
+  '[id*="google"]',
+  '[class*="google"]',
+]
+
+ALLOWED_TAGS: Final[List[str]] = [
+  "h1",
+  "h2",
+  "h3",
+  "h4",
+  "h5",
+  "h6",
+  "p",
+  "div",
+  "span",
+  "ul",
+  "ol",
+  "li",
+  "strong",
+  "b",
+  "em",
+  "i",
+]
+
+ALLOWED_ATTRS: Final[List[str]] = ["id", "title", "alt", "href"]
+
+
+def collapse(text: str) -> str:
+  lines = (line.strip() for line in text.splitlines())
+  chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+  text = " ".join(chunk for chunk in chunks if chunk)
+
+  return unescape(text)
@@ -1,11 +1,15 @@
 from dataclasses import dataclass
 from typing import Literal, Union
 
-HtmlProcessorConfig = Union["BeautifulSoupHtmlProcessorConfig"]
+HtmlProcessorConfig = Union[
+  "BeautifulSoupHtmlProcessorConfig", "LxmlHtmlProcessorConfig"
+]
 
 
 BEAUTIFUL_SOUP_HTML_PROCESSOR_TYPE: Literal["beautiful-soup"] = "beautiful-soup"
 
+LXML_HTML_PROCESSOR_TYPE: Literal["lxml"] = "lxml"
+
 
 @dataclass
 class BeautifulSoupHtmlProcessorConfig:
@@ -13,3 +17,11 @@ class BeautifulSoupHtmlProcessorConfig:
   title_selector: str
   details_selector: str
   type: Literal["beautiful-soup"] = BEAUTIFUL_SOUP_HTML_PROCESSOR_TYPE
+
+
+@dataclass
+class LxmlHtmlProcessorConfig:
+  link_selector: str
+  title_selector: str
+  details_selector: str
+  type: Literal["lxml"] = LXML_HTML_PROCESSOR_TYPE
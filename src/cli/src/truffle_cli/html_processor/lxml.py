@@ -0,0 +1,207 @@
+import re
+from copy import deepcopy
+from html import escape
+from typing import List, Optional, Tuple, override
+
+import lxml.html
+from lxml import etree  # type: ignore
+from lxml.cssselect import CSSSelector
+from lxml.html import HtmlElement
+
+from truffle_cli.logger.abstract import Logger
+from truffle_cli.system.abstract import System
+
+from .abstract import HtmlDocument, HtmlProcessor
+from .common import (
+  ALLOWED_ATTRS,
+  ALLOWED_TAGS,
+  DISALLOWED_SELECTORS,
+  DISALLOWED_TAGS,
+  collapse,
+)
+from .input import LxmlHtmlProcessorConfig
+
+_PROLOG = re.compile(
+  r"\s*(?:<\?(.*?)\?>|<!doctype\s+([^>]*)>)", re.IGNORECASE | re.DOTALL
+)
+
+
+class LxmlHtmlProcessor(HtmlProcessor):
+  _config: LxmlHtmlProcessorConfig
+  _system: System
+  _logger: Logger
+  _link_selector: CSSSelector
+  _title_selector: CSSSelector
+  _details_selector: CSSSelector
+  _disallowed_selector: CSSSelector
+
+  def __init__(self, system: System, config: LxmlHtmlProcessorConfig):
+    self._config = config
+    self._system = system
+
+    self._logger = self._system.get_logger(__name__)
+
+    self._link_selector = CSSSelector(self._config.link_selector)
+    self._title_selector = CSSSelector(self._config.title_selector)
+    self._details_selector = CSSSelector(self._config.details_selector)
+    self._disallowed_selector = CSSSelector(", ".join(DISALLOWED_SELECTORS))
+
+  @override
+  def process(self, html: str) -> HtmlDocument:
+    root, prolog = _parse(html)
+
+    links = self._links(root)
+    title = self._clean(_fragment(_select_one(self._title_selector, root)))
+    details = self._clean(_fragment(_select_one(self._details_selector, root)))
+    clean = self._clean((root, prolog))
+
+    return HtmlDocument(title, details, clean, links)
+
+  @override
+  def title(self, html: str) -> str:
+    root, _ = _parse(html)
+
+    title = _serialize(_select_one(self._title_selector, root))
+
+    self._logger.debug(f"Title:\n{title}")
+
+    return title
+
+  @override
+  def details(self, html: str) -> str:
+    root, _ = _parse(html)
+
+    content = _serialize(_select_one(self._details_selector, root))
+
+    self._logger.debug(f"Content:\n{content}")
+
+    return content
+
+  @override
+  def links(self, html: str) -> List[str]:
+    root, _ = _parse(html)
+
+    return self._links(root)
+
+  @override
+  def clean(self, html: str) -> str:
+    return self._clean(_parse(html))
+
+  def _links(self, root: HtmlElement) -> List[str]:
+    links = []
+    for element in self._link_selector(root):
+      href = element.get("href")
+      if href:
+        links.append(href)
+
+    self._logger.debug("Links:\n" + "\n".join(links))
+
+    return links
+
+  def _clean(self, document: Tuple[HtmlElement, Optional[str]]) -> str:
+    root, prolog = document
+
+    for element in list(root.iter(*DISALLOWED_TAGS)):
+      _drop_tree(element)
+
+    for element in self._disallowed_selector(root):
+      _drop_tree(element)
+
+    for element in list(root.iter(etree.Element)):
+      if element is not root and element.tag not in ALLOWED_TAGS:
+        element.drop_tag()
+
+    for comment in list(root.iter(etree.Comment)):
+      _drop_tree(comment)
+
+    for element in list(root.iter(etree.Element)):
+      if element is not root and not any(
+        text.strip() for text in element.itertext()
+      ):
+        _drop_tree(element)
+
+    for element in root.iter(etree.Element):
+      for key in list(element.attrib):
+        if key not in ALLOWED_ATTRS:
+          del element.attrib[key]
+
+    text = escape(root.text or "", quote=False) + "".join(
+      etree.tostring(child, method="html", encoding="unicode") for child in root
+    )
+    if prolog is not None:
+      text = f"{prolog}\n{text}"
+
+    clean = collapse(text)
+
+    self._logger.debug(f"Cleaned: {clean}")
+
+    return clean
+
+
+def _parse(html: str) -> Tuple[HtmlElement, Optional[str]]:
+  # NOTE: lxml rejects strings with an encoding declaration
+  # so leading declarations are split off and rendered like beautiful soup
+  declarations = []
+  match = _PROLOG.match(html)
+  while match is not None:
+    instruction, doctype = match.groups()
+    if doctype is None:
+      declarations.append(f"<?{instruction}?>")
+    else:
+      declarations.append(f"<!DOCTYPE {doctype}>")
+    html = html[match.end() :]
+    match = _PROLOG.match(html)
+
+  prolog = "\n".join(declarations) if declarations else None
+
+  if not html.strip():
+    return _empty(html), prolog
+
+  try:
+    return lxml.html.document_fromstring(html), prolog
+  except (etree.ParserError, ValueError):
+    # NOTE: documents with nothing but comments have no root element
+    return _empty(""), prolog
+
+
+def _empty(text: str) -> HtmlElement:
+  root = lxml.html.Element("html")
+  root.text = text
+
+  return root
+
+
+def _fragment(
+  element: Optional[HtmlElement],
+) -> Tuple[HtmlElement, Optional[str]]:
+  if element is None:
+    return _parse(str(element))
+
+  root = lxml.html.Element("html")
+  copy = deepcopy(element)
+  copy.tail = None
+  root.append(copy)
+
+  return root, None
+
+
+def _select_one(
+  selector: CSSSelector, root: HtmlElement
+) -> Optional[HtmlElement]:
+  elements = selector(root)
+
+  return elements[0] if elements else None
+
+
+def _serialize(element: Optional[HtmlElement]) -> str:
+  if element is None:
+    return str(element)
+
+  return etree.tostring(
+    element, method="html", encoding="unicode", with_tail=False
+  )
+
+
+def _drop_tree(element: HtmlElement) -> None:
+  if element.getparent() is not None:
+    element.drop_tree()
@@ -1,7 +1,75 @@
-from truffle_cli.http_client.abstract import HttpClient
+from typing import Optional
+
+from truffle_cli.cache.abstract import Cache
+from truffle_cli.http_client.abstract import AsyncHttpClient, HttpClient
+from truffle_cli.http_client.cached import (
+  AsyncCachedHttpClient,
+  CachedHttpClient,
+)
+from truffle_cli.http_client.httpx import HttpxAsyncHttpClient
+from truffle_cli.http_client.input import (
+  REQUESTS_HTTP_CLIENT_TYPE,
+  HttpClientConfig,
+  RateLimitConfig,
+)
+from truffle_cli.http_client.rate_limited import (
+  AsyncRateLimitedHttpClient,
+  AsyncRateLimiter,
+  RateLimitedHttpClient,
+  RateLimiter,
+)
 from truffle_cli.http_client.requests import RequestsHttpClient
+from truffle_cli.http_client.retrying import (
+  AsyncRetryingHttpClient,
+  RetryingHttpClient,
+)
 from truffle_cli.system.abstract import System
 
 
-def create(system: System) -> HttpClient:
-  return RequestsHttpClient(system)
+def create(system: System, config: HttpClientConfig) -> HttpClient:
+  if config.type == REQUESTS_HTTP_CLIENT_TYPE:
+    client = RequestsHttpClient(system, config)
+    if config.retry is None:
+      return client
+
+    return RetryingHttpClient(system, client, config.retry)
+
+
+def create_async(
+  system: System, config: HttpClientConfig, max_connections: int
+) -> AsyncHttpClient:
+  client = HttpxAsyncHttpClient(system, max_connections, config.timeout)
+  if config.retry is None:
+    return client
+
+  return AsyncRetryingHttpClient(system, client, config.retry)
+
+
+def create_cached(
+  system: System, client: HttpClient, cache: Cache, ttl: Optional[float]
+) -> HttpClient:
+  return CachedHttpClient(system, client, cache, ttl)
+
+
+def create_async_cached(
+  system: System, client: AsyncHttpClient, cache: Cache, ttl: Optional[float]
+) -> AsyncHttpClient:
+  return AsyncCachedHttpClient(system, client, cache, ttl)
+
+
+def create_rate_limited(
+  system: System,
+  config: RateLimitConfig,
+  client: HttpClient,
+  limiter: RateLimiter,
+) -> HttpClient:
+  return RateLimitedHttpClient(system, client, limiter, config.max_retries)
+
+
+def create_async_rate_limited(
+  system: System,
+  config: RateLimitConfig,
+  client: AsyncHttpClient,
+  limiter: AsyncRateLimiter,
+) -> AsyncHttpClient:
+  return AsyncRateLimitedHttpClient(system, client, limiter, config.max_retries)
@@ -1,8 +1,107 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class HttpClientStats:
+  retries: int = 0
+  exhausted: int = 0
+  latency: float = 0
+
+
+class HttpStatusError(Exception):
+  url: str
+  status_code: int
+  text: str
+  retry_after: Optional[str]
+
+  def __init__(
+    self, url: str, status_code: int, text: str, retry_after: Optional[str]
+  ):
+    super().__init__(f"{url} responded with {status_code} - {text}")
+    self.url = url
+    self.status_code = status_code
+    self.text = text
+    self.retry_after = retry_after
+
+  def retry_delay(self) -> Optional[float]:
+    if self.retry_after is None:
+      return None
+
+    try:
+      return max(0.0, float(self.retry_after))
+    except ValueError:
+      pass
+
+    try:
+      date = parsedate_to_datetime(self.retry_after)
+    except (TypeError, ValueError):
+      return None
+    if date.tzinfo is None:
+      date = date.replace(tzinfo=timezone.utc)
+
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+
+
+class HttpTransportError(Exception):
+  url: str
+
+  def __init__(self, url: str, error: Exception):
+    super().__init__(f"{url} failed - {error}")
+    self.url = url
 
 
 class HttpClient(ABC):
   @abstractmethod
-  def post(self, url: str, headers: Dict[str, str], payload: Any) -> Any:
+  def post(
+    self,
+    url: str,
+    headers: Dict[str, str],
+    payload: Any,
+    idempotent: bool = True,
+  ) -> Any:
+    pass
+
+  @abstractmethod
+  def get(self, url: str, headers: Dict[str, str]) -> Any:
+    pass
+
+  @abstractmethod
+  def download(self, url: str, headers: Dict[str, str]) -> str:
+    pass
+
+  @abstractmethod
+  def upload(
+    self,
+    url: str,
+    headers: Dict[str, str],
+    fields: Dict[str, str],
+    name: str,
+    content: str,
+  ) -> Any:
+    pass
+
+  @abstractmethod
+  def stats(self) -> HttpClientStats:
+    pass
+
+  @abstractmethod
+  def close(self) -> None:
+    pass
+
+
+class AsyncHttpClient(ABC):
+  @abstractmethod
+  async def post(self, url: str, headers: Dict[str, str], payload: Any) -> Any:
+    pass
+
+  @abstractmethod
+  def stats(self) -> HttpClientStats:
+    pass
+
+  @abstractmethod
+  async def close(self) -> None:
     pass
@@ -0,0 +1,132 @@
+import asyncio
+import json
+from hashlib import sha256
+from typing import Any, Dict, Optional, override
+
+from truffle_cli.cache.abstract import Cache
+from truffle_cli.logger.abstract import Logger
+from truffle_cli.system.abstract import System
+
+from .abstract import AsyncHttpClient, HttpClient, HttpClientStats
+
+
+class CachedHttpClient(HttpClient):
+  _client: HttpClient
+  _cache: Cache
+  _ttl: Optional[float]
+  _system: System
+  _logger: Logger
+
+  def __init__(
+    self,
+    system: System,
+    client: HttpClient,
+    cache: Cache,
+    ttl: Optional[float],
+  ):
+    self._client = client
+    self._cache = cache
+    self._ttl = ttl
+    self._system = system
+
+    self._logger = self._system.get_logger(__name__)
+
+  @override
+  def post(
+    self,
+    url: str,
+    headers: Dict[str, str],
+    payload: Any,
+    idempotent: bool = True,
+  ) -> Any:
+    if not idempotent:
+      return self._client.post(url, headers, payload, idempotent)
+
+    key = _key(url, payload)
+
+    cached = self._cache.get(key, self._ttl)
+    if cached is not None:
+      self._logger.debug(f"Posted from cache: '{url}'")
+      return json.loads(cached)
+
+    response = self._client.post(url, headers, payload)
+    self._cache.set(key, json.dumps(response))
+
+    return response
+
+  @override
+  def get(self, url: str, headers: Dict[str, str]) -> Any:
+    return self._client.get(url, headers)
+
+  @override
+  def download(self, url: str, headers: Dict[str, str]) -> str:
+    return self._client.download(url, headers)
+
+  @override
+  def upload(
+    self,
+    url: str,
+    headers: Dict[str, str],
+    fields: Dict[str, str],
+    name: str,
+    content: str,
+  ) -> Any:
+    return self._client.upload(url, headers, fields, name, content)
+
+  @override
+  def stats(self) -> HttpClientStats:
+    return self._client.stats()
+
+  @override
+  def close(self) -> None:
+    self._client.close()
+
+
+class AsyncCachedHttpClient(AsyncHttpClient):
+  _client: AsyncHttpClient
+  _cache: Cache
+  _ttl: Optional[float]
+  _system: System
+  _logger: Logger
+
+  def __init__(
+    self,
+    system: System,
+    client: AsyncHttpClient,
+    cache: Cache,
+    ttl: Optional[float],
+  ):
+    self._client = client
+    self._cache = cache
+    self._ttl = ttl
+    self._system = system
+
+    self._logger = self._system.get_logger(__name__)
+
+  @override
+  async def post(self, url: str, headers: Dict[str, str], payload: Any) -> Any:
+    key = _key(url, payload)
+
+    cached = await asyncio.to_thread(self._cache.get, key, self._ttl)
+    if cached is not None:
+      self._logger.debug(f"Posted from cache: '{url}'")
+      return json.loads(cached)
+
+    response = await self._client.post(url, headers, payload)
+    await asyncio.to_thread(self._cache.set, key, json.dumps(response))
+
+    return response
+
+  @override
+  def stats(self) -> HttpClientStats:
+    return self._client.stats()
+
+  @override
+  async def close(self) -> None:
+    await self._client.close()
+
+
+def _key(url: str, payload: Any) -> str:
+  serialized = json.dumps({"url": url, "payload": payload}, sort_keys=True)
+
+  return sha256(serialized.encode()).hexdigest()
@@ -0,0 +1,64 @@
+from typing import Any, Dict, Optional, override
+
+import httpx
+
+from truffle_cli.logger.abstract import Logger
+from truffle_cli.system.abstract import System
+
+from .abstract import (
+  AsyncHttpClient,
+  HttpClientStats,
+  HttpStatusError,
+  HttpTransportError,
+)
+
+
+class HttpxAsyncHttpClient(AsyncHttpClient):
+  _system: System
+  _logger: Logger
+  _client: httpx.AsyncClient
+
+  def __init__(
+    self,
+    system: System,
+    max_connections: int,
+    timeout: Optional[float],
+  ):
+    self._system = system
+
+    self._logger = self._system.get_logger(__name__)
+
+    self._client = httpx.AsyncClient(
+      limits=httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+      ),
+      timeout=timeout,
+    )
+
+  @override
+  async def post(self, url: str, headers: Dict[str, str], payload: Any) -> Any:
+    try:
+      response = await self._client.post(url, headers=headers, json=payload)
+    except httpx.HTTPError as error:
+      raise HttpTransportError(url, error) from error
+
+    if response.status_code != 200:
+      raise HttpStatusError(
+        url,
+        response.status_code,
+        response.text,
+        response.headers.get("Retry-After"),
+      )
+
+    self._logger.trace(f"Posted: '{url}'")
+
+    return response.json()
+
+  @override
+  def stats(self) -> HttpClientStats:
+    return HttpClientStats()
+
+  @override
+  async def close(self) -> None:
+    await self._client.aclose()
@@ -0,0 +1,38 @@
+from dataclasses import dataclass
+from typing import Final, List, Literal, Optional, Union
+
+HttpClientConfig = Union["RequestsHttpClientConfig"]
+
+
+REQUESTS_HTTP_CLIENT_TYPE: Literal["requests"] = "requests"
+
+RETRY_STATUS_CODES: Final[List[int]] = [408, 500, 502, 504]
+
+THROTTLE_STATUS_CODES: Final[List[int]] = [429, 503]
+
+
+@dataclass
+class RequestsHttpClientConfig:
+  pool_connections: int
+  pool_maxsize: int
+  pool_block: bool
+  keep_alive: bool
+  timeout: Optional[float] = None
+  retry: Optional["RetryConfig"] = None
+  type: Literal["requests"] = REQUESTS_HTTP_CLIENT_TYPE
+
+
+@dataclass
+class RetryConfig:
+  max_attempts: int
+  backoff_base: float
+  backoff_max: float
+  statuses: List[int]
+
+
+@dataclass
+class RateLimitConfig:
+  requests_per_second: Optional[float]
+  tokens_per_minute: Optional[float]
+  max_concurrency: int
+  max_retries: int
@@ -0,0 +1,377 @@
+import asyncio
+import json
+import time
+from threading import Condition
+from typing import (
+  Any,
+  Awaitable,
+  Callable,
+  Dict,
+  Final,
+  Optional,
+  Tuple,
+  override,
+)
+
+from truffle_cli.logger.abstract import Logger
+from truffle_cli.system.abstract import System
+
+from .abstract import (
+  AsyncHttpClient,
+  HttpClient,
+  HttpClientStats,
+  HttpStatusError,
+)
+from .input import THROTTLE_STATUS_CODES, RateLimitConfig
+
+DEFAULT_RETRY_AFTER: Final[float] = 1.0
+
+
+class _Bucket:
+  _rate: float
+  _capacity: float
+  _level: float
+  _updated: float
+
+  def __init__(self, rate: float, capacity: float):
+    self._rate = rate
+    self._capacity = capacity
+    self._level = capacity
+    self._updated = time.monotonic()
+
+  def reserve(self, amount: float, now: float) -> float:
+    self._level = min(
+      self._capacity, self._level + (now - self._updated) * self._rate
+    )
+    self._updated = now
+    self._level -= amount
+    if self._level >= 0:
+      return 0
+
+    return -self._level / self._rate
+
+  def adjust(self, amount: float) -> None:
+    self._level = min(self._capacity, self._level - amount)
+
+
+class _RateLimiterState:
+  _config: RateLimitConfig
+  _requests: Optional[_Bucket]
+  _tokens: Optional[_Bucket]
+  _limit: float
+  _active: int
+  _epoch: int
+  _paused_until: float
+
+  def __init__(self, config: RateLimitConfig):
+    self._config = config
+
+    self._requests = None
+    if config.requests_per_second is not None:
+      self._requests = _Bucket(
+        config.requests_per_second, max(1.0, config.requests_per_second)
+      )
+    self._tokens = None
+    if config.tokens_per_minute is not None:
+      self._tokens = _Bucket(
+        config.tokens_per_minute / 60, config.tokens_per_minute
+      )
+
+    self._limit = config.max_concurrency
+    self._active = 0
+    self._epoch = 0
+    self._paused_until = 0
+
+  def estimate(self, payload: Any) -> int:
+    if self._tokens is None:
+      return 0
+
+    return len(json.dumps(payload)) // 4
+
+  def admits(self) -> bool:
+    return self._active < int(self._limit)
+
+  def enter(self, tokens: int, now: float) -> Tuple[int, float]:
+    self._active += 1
+
+    delay = max(0.0, self._paused_until - now)
+    if self._requests is not None:
+      delay = max(delay, self._requests.reserve(1, now))
+    if self._tokens is not None and tokens > 0:
+      delay = max(delay, self._tokens.reserve(tokens, now))
+
+    return self._epoch, delay
+
+  def succeed(self, tokens: int, used: Optional[int]) -> None:
+    self._active -= 1
+    self._limit = min(
+      self._config.max_concurrency, self._limit + 1 / self._limit
+    )
+    if self._tokens is not None and used is not None:
+      self._tokens.adjust(used - tokens)
+
+  def throttle(
+    self, epoch: int, retry_after: Optional[float], now: float
+  ) -> None:
+    self._active -= 1
+    if epoch == self._epoch:
+      self._epoch += 1
+      self._limit = max(1.0, self._limit / 2)
+
+    delay = DEFAULT_RETRY_AFTER if retry_after is None else retry_after
+    self._paused_until = max(self._paused_until, now + delay)
+
+  def fail(self) -> None:
+    self._active -= 1
+
+
+class RateLimiter:
+  _state: _RateLimiterState
+  _condition: Condition
+
+  def __init__(self, config: RateLimitConfig):
+    self._state = _RateLimiterState(config)
+    self._condition = Condition()
+
+  def estimate(self, payload: Any) -> int:
+    return self._state.estimate(payload)
+
+  def enter(self, tokens: int) -> int:
+    with self._condition:
+      self._condition.wait_for(self._state.admits)
+      epoch, delay = self._state.enter(tokens, time.monotonic())
+
+    if delay > 0:
+      time.sleep(delay)
+
+    return epoch
+
+  def succeed(self, tokens: int, used: Optional[int]) -> None:
+    with self._condition:
+      self._state.succeed(tokens, used)
+      self._condition.notify_all()
+
+  def throttle(self, epoch: int, retry_after: Optional[float]) -> None:
+    with self._condition:
+      self._state.throttle(epoch, retry_after, time.monotonic())
+      self._condition.notify_all()
+
+  def fail(self) -> None:
+    with self._condition:
+      self._state.fail()
+      self._condition.notify_all()
+
+
+class AsyncRateLimiter:
+  _state: _RateLimiterState
+  _condition: asyncio.Condition
+
+  def __init__(self, config: RateLimitConfig):
+    self._state = _RateLimiterState(config)
+    self._condition = asyncio.Condition()
+
+  def estimate(self, payload: Any) -> int:
+    return self._state.estimate(payload)
+
+  async def enter(self, tokens: int) -> int:
+    async with self._condition:
+      await self._condition.wait_for(self._state.admits)
+      epoch, delay = self._state.enter(tokens, time.monotonic())
+
+    if delay > 0:
+      await asyncio.sleep(delay)
+
+    return epoch
+
+  async def succeed(self, tokens: int, used: Optional[int]) -> None:
+    async with self._condition:
+      self._state.succeed(tokens, used)
+      self._condition.notify_all()
+
+  async def throttle(self, epoch: int, retry_after: Optional[float]) -> None:
+    async with self._condition:
+      self._state.throttle(epoch, retry_after, time.monotonic())
+      self._condition.notify_all()
+
+  async def fail(self) -> None:
+    async with self._condition:
+      self._state.fail()
+      self._condition.notify_all()
+
+
+class RateLimitedHttpClient(HttpClient):
+  _client: HttpClient
+  _limiter: RateLimiter
+  _max_retries: int
+  _system: System
+  _logger: Logger
+
+  def __init__(
+    self,
+    system: System,
+    client: HttpClient,
+    limiter: RateLimiter,
+    max_retries: int,
+  ):
+    self._client = client
+    self._limiter = limiter
+    self._max_retries = max_retries
+    self._system = system
+
+    self._logger = self._system.get_logger(__name__)
+
+  @override
+  def post(
+    self,
+    url: str,
+    headers: Dict[str, str],
+    payload: Any,
+    idempotent: bool = True,
+  ) -> Any:
+    return self._send(
+      url,
+      self._limiter.estimate(payload),
+      lambda: self._client.post(url, headers, payload, idempotent),
+    )
+
+  @override
+  def get(self, url: str, headers: Dict[str, str]) -> Any:
+    return self._send(url, 0, lambda: self._client.get(url, headers))
+
+  @override
+  def download(self, url: str, headers: Dict[str, str]) -> str:
+    return self._send(url, 0, lambda: self._client.download(url, headers))
+
+  @override
+  def upload(
+    self,
+    url: str,
+    headers: Dict[str, str],
+    fields: Dict[str, str],
+    name: str,
+    content: str,
+  ) -> Any:
+    return self._send(
+      url,
+      0,
+      lambda: self._client.upload(url, headers, fields, name, content),
+    )
+
+  @override
+  def stats(self) -> HttpClientStats:
+    return self._client.stats()
+
+  @override
+  def close(self) -> None:
+    self._client.close()
+
+  def _send[TResponse](
+    self, url: str, tokens: int, send: Callable[[], TResponse]
+  ) -> TResponse:
+    retries = 0
+    while True:
+      epoch = self._limiter.enter(tokens)
+      try:
+        response = send()
+      except HttpStatusError as error:
+        if error.status_code not in THROTTLE_STATUS_CODES:
+          self._limiter.fail()
+          raise
+
+        self._limiter.throttle(epoch, error.retry_delay())
+        if retries >= self._max_retries:
+          raise
+
+        retries += 1
+        self._logger.warn(
+          f"Requesting '{url}' was throttled with {error.status_code}. "
+          "Retrying..."
+        )
+        continue
+      except BaseException:
+        self._limiter.fail()
+        raise
+
+      self._limiter.succeed(tokens, _used(response))
+
+      return response
+
+
+class AsyncRateLimitedHttpClient(AsyncHttpClient):
+  _client: AsyncHttpClient
+  _limiter: AsyncRateLimiter
+  _max_retries: int
+  _system: System
+  _logger: Logger
+
+  def __init__(
+    self,
+    system: System,
+    client: AsyncHttpClient,
+    limiter: AsyncRateLimiter,
+    max_retries: int,
+  ):
+    self._client = client
+    self._limiter = limiter
+    self._max_retries = max_retries
+    self._system = system
+
+    self._logger = self._system.get_logger(__name__)
+
+  @override
+  async def post(self, url: str, headers: Dict[str, str], payload: Any) -> Any:
+    return await self._send(
+      url,
+      self._limiter.estimate(payload),
+      lambda: self._client.post(url, headers, payload),
+    )
+
+  @override
+  def stats(self) -> HttpClientStats:
+    return self._client.stats()
+
+  @override
+  async def close(self) -> None:
+    await self._client.close()
+
+  async def _send[TResponse](
+    self, url: str, tokens: int, send: Callable[[], Awaitable[TResponse]]
+  ) -> TResponse:
+    retries = 0
+    while True:
+      epoch = await self._limiter.enter(tokens)
+      try:
+        response = await send()
+      except HttpStatusError as error:
+        if error.status_code not in THROTTLE_STATUS_CODES:
+          await self._limiter.fail()
+          raise
+
+        await self._limiter.throttle(epoch, error.retry_delay())
+        if retries >= self._max_retries:
+          raise
+
+        retries += 1
+        self._logger.warn(
+          f"Requesting '{url}' was throttled with {error.status_code}. "
+          "Retrying..."
+        )
+        continue
+      except BaseException:
+        await self._limiter.fail()
+        raise
+
+      await self._limiter.succeed(tokens, _used(response))
+
+      return response
+
+
+def _used(response: Any) -> Optional[int]:
+  if not isinstance(response, dict):
+    return None
+
+  usage = response.get("usage")
+  if not isinstance(usage, dict):
+    return None
+
+  return usage.get("total_tokens")
@@ -1,30 +1,113 @@
+import json
 from typing import Any, Dict, override
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from truffle_cli.logger.abstract import Logger
 from truffle_cli.system.abstract import System
 
-from .abstract import HttpClient
+from .abstract import (
+  HttpClient,
+  HttpClientStats,
+  HttpStatusError,
+  HttpTransportError,
+)
+from .input import RequestsHttpClientConfig
 
 
 class RequestsHttpClient(HttpClient):
+  _config: RequestsHttpClientConfig
   _system: System
   _logger: Logger
+  _session: requests.Session
 
-  def __init__(self, system: System):
+  def __init__(self, system: System, config: RequestsHttpClientConfig):
+    self._config = config
     self._system = system
 
     self._logger = self._system.get_logger(__name__)
 
+    adapter = HTTPAdapter(
+      pool_connections=self._config.pool_connections,
+      pool_maxsize=self._config.pool_maxsize,
+      pool_block=self._config.pool_block,
+    )
+    self._session = requests.Session()
+    self._session.mount("https://", adapter)
+    self._session.mount("http://", adapter)
+    if not self._config.keep_alive:
+      self._session.headers["Connection"] = "close"
+
   @override
-  def post(self, url: str, headers: Dict[str, str], payload: Any) -> Any:
-    response = requests.post(url, headers=headers, json=payload)
-    if response.status_code != 200:
-      raise Exception(
-        f"{url} responded with {response.status_code} - {response.text}"
-      )
+  def post(
+    self,
+    url: str,
+    headers: Dict[str, str],
+    payload: Any,
+    idempotent: bool = True,
+  ) -> Any:
+    response = self._request("POST", url, headers=headers, json=payload)
 
     self._logger.trace(f"Posted: '{url}'")
 
     return response.json()
+
+  @override
+  def get(self, url: str, headers: Dict[str, str]) -> Any:
+    return json.loads(self.download(url, headers))
+
+  @override
+  def download(self, url: str, headers: Dict[str, str]) -> str:
+    response = self._request("GET", url, headers=headers)
+
+    self._logger.trace(f"Got: '{url}'")
+
+    return response.text
+
+  @override
+  def upload(
+    self,
+    url: str,
+    headers: Dict[str, str],
+    fields: Dict[str, str],
+    name: str,
+    content: str,
+  ) -> Any:
+    response = self._request(
+      "POST",
+      url,
+      headers=headers,
+      data=fields,
+      files={"file": (name, content.encode())},
+    )
+
+    self._logger.trace(f"Uploaded: '{url}'")
+
+    return response.json()
+
+  @override
+  def stats(self) -> HttpClientStats:
+    return HttpClientStats()
+
+  @override
+  def close(self) -> None:
+    self._session.close()
+
+  def _request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+    try:
+      response = self._session.request(
+        method, url, timeout=self._config.timeout, **kwargs
+      )
+    except requests.RequestException as error:
+      raise HttpTransportError(url, error) from error
+
+    if response.status_code != 200:
+      raise HttpStatusError(
+        url,
+        response.status_code,
+        response.text,
+        response.headers.get("Retry-After"),
+      )
+
+    return response
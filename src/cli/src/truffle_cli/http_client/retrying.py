@@ -0,0 +1,189 @@
+import asyncio
+import random
+import time
+from threading import Lock
+from typing import Any, Awaitable, Callable, Dict, Optional, Union, override
+
+from truffle_cli.logger.abstract import Logger
+from truffle_cli.system.abstract import System
+
+from .abstract import (
+  AsyncHttpClient,
+  HttpClient,
+  HttpClientStats,
+  HttpStatusError,
+  HttpTransportError,
+)
+from .input import RetryConfig
+
+
+class RetryingHttpClient(HttpClient):
+  _client: HttpClient
+  _config: RetryConfig
+  _system: System
+  _logger: Logger
+  _lock: Lock
+  _stats: HttpClientStats
+
+  def __init__(self, system: System, client: HttpClient, config: RetryConfig):
+    self._client = client
+    self._config = config
+    self._system = system
+
+    self._logger = self._system.get_logger(__name__)
+
+    self._lock = Lock()
+    self._stats = HttpClientStats()
+
+  @override
+  def post(
+    self,
+    url: str,
+    headers: Dict[str, str],
+    payload: Any,
+    idempotent: bool = True,
+  ) -> Any:
+    if not idempotent:
+      return self._client.post(url, headers, payload, idempotent)
+
+    return self._send(url, lambda: self._client.post(url, headers, payload))
+
+  @override
+  def get(self, url: str, headers: Dict[str, str]) -> Any:
+    return self._send(url, lambda: self._client.get(url, headers))
+
+  @override
+  def download(self, url: str, headers: Dict[str, str]) -> str:
+    return self._send(url, lambda: self._client.download(url, headers))
+
+  @override
+  def upload(
+    self,
+    url: str,
+    headers: Dict[str, str],
+    fields: Dict[str, str],
+    name: str,
+    content: str,
+  ) -> Any:
+    # NOTE: every upload creates a new file
+    # so a retry after a lost response would upload it twice
+    return self._client.upload(url, headers, fields, name, content)
+
+  @override
+  def stats(self) -> HttpClientStats:
+    with self._lock:
+      return HttpClientStats(
+        self._stats.retries, self._stats.exhausted, self._stats.latency
+      )
+
+  @override
+  def close(self) -> None:
+    self._client.close()
+
+  def _send[TResponse](
+    self, url: str, send: Callable[[], TResponse]
+  ) -> TResponse:
+    attempt = 1
+    while True:
+      attempted = time.monotonic()
+      try:
+        return send()
+      except (HttpStatusError, HttpTransportError) as error:
+        delay = _delay(self._config, attempt, error)
+        if delay is None:
+          if attempt > 1:
+            with self._lock:
+              self._stats.exhausted += 1
+          raise
+
+        self._logger.warn(
+          f"Requesting '{url}' failed - '{error}'. Retrying in {delay:.2f}s..."
+        )
+        with self._lock:
+          self._stats.retries += 1
+          self._stats.latency += time.monotonic() - attempted + delay
+
+      time.sleep(delay)
+      attempt += 1
+
+
+class AsyncRetryingHttpClient(AsyncHttpClient):
+  _client: AsyncHttpClient
+  _config: RetryConfig
+  _system: System
+  _logger: Logger
+  _stats: HttpClientStats
+
+  def __init__(
+    self, system: System, client: AsyncHttpClient, config: RetryConfig
+  ):
+    self._client = client
+    self._config = config
+    self._system = system
+
+    self._logger = self._system.get_logger(__name__)
+
+    self._stats = HttpClientStats()
+
+  @override
+  async def post(self, url: str, headers: Dict[str, str], payload: Any) -> Any:
+    return await self._send(
+      url, lambda: self._client.post(url, headers, payload)
+    )
+
+  @override
+  def stats(self) -> HttpClientStats:
+    return HttpClientStats(
+      self._stats.retries, self._stats.exhausted, self._stats.latency
+    )
+
+  @override
+  async def close(self) -> None:
+    await self._client.close()
+
+  async def _send[TResponse](
+    self, url: str, send: Callable[[], Awaitable[TResponse]]
+  ) -> TResponse:
+    attempt = 1
+    while True:
+      attempted = time.monotonic()
+      try:
+        return await send()
+      except (HttpStatusError, HttpTransportError) as error:
+        delay = _delay(self._config, attempt, error)
+        if delay is None:
+          if attempt > 1:
+            self._stats.exhausted += 1
+          raise
+
+        self._logger.warn(
+          f"Requesting '{url}' failed - '{error}'. Retrying in {delay:.2f}s..."
+        )
+        self._stats.retries += 1
+        self._stats.latency += time.monotonic() - attempted + delay
+
+      await asyncio.sleep(delay)
+      attempt += 1
+
+
+def _delay(
+  config: RetryConfig,
+  attempt: int,
+  error: Union[HttpStatusError, HttpTransportError],
+) -> Optional[float]:
+  if attempt >= config.max_attempts:
+    return None
+
+  retry_after = None
+  if isinstance(error, HttpStatusError):
+    if error.status_code not in config.statuses:
+      return None
+    retry_after = error.retry_delay()
+
+  delay = random.uniform(
+    0, min(config.backoff_max, config.backoff_base * 2 ** (attempt - 1))
+  )
+  if retry_after is not None:
+    delay = max(delay, retry_after)
+
+  return delay
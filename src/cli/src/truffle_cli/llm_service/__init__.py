@@ -1,9 +1,14 @@
-from truffle_cli.http_client.abstract import HttpClient
+from truffle_cli.http_client.abstract import AsyncHttpClient, HttpClient
 from truffle_cli.system.abstract import System
 
-from .abstract import LlmService
-from .input import OPENAI_LLM_SERVICE_TYPE, LlmServiceConfig
-from .openai import OpenaiLlmService
+from .abstract import AsyncLlmService, LlmService
+from .input import (
+  OPENAI_BATCH_LLM_SERVICE_TYPE,
+  OPENAI_LLM_SERVICE_TYPE,
+  LlmServiceConfig,
+)
+from .openai import AsyncOpenaiLlmService, OpenaiLlmService
+from .openai_batch import OpenaiBatchLlmService
 
 
 def create(
@@ -11,3 +16,14 @@ def create(
 ) -> LlmService:
   if config.type == OPENAI_LLM_SERVICE_TYPE:
     return OpenaiLlmService(system, config, client)
+  elif config.type == OPENAI_BATCH_LLM_SERVICE_TYPE:
+    return OpenaiBatchLlmService(system, config, client)
+
+
+def create_async(
+  system: System, config: LlmServiceConfig, client: AsyncHttpClient
+) -> AsyncLlmService:
+  if config.type == OPENAI_LLM_SERVICE_TYPE:
+    return AsyncOpenaiLlmService(system, config, client)
+  elif config.type == OPENAI_BATCH_LLM_SERVICE_TYPE:
+    raise ValueError("Batch llm service is not supported by the async worker")
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any, Optional, TypeVar
+from typing import Any, List, Optional, TypeVar, Union
 
 TReply = TypeVar("TReply")
 
@@ -11,7 +11,26 @@ class LlmReply[TReply]:
   thinking: Optional[str] = None
 
 
+@dataclass
+class LlmEnrichment:
+  extract: LlmReply[Any]
+  summary: LlmReply[str]
+  score: LlmReply[float]
+
+
+@dataclass
+class LlmUsage:
+  requests: int = 0
+  prompt_tokens: int = 0
+  cached_tokens: int = 0
+  completion_tokens: int = 0
+
+
 class LlmService(ABC):
+  @abstractmethod
+  def enrich(self, content: str) -> LlmEnrichment:
+    pass
+
   @abstractmethod
   def extract(self, *content: str) -> LlmReply[Any]:
     pass
@@ -23,3 +42,37 @@ class LlmService(ABC):
   @abstractmethod
   def score(self, *content: str) -> LlmReply[float]:
     pass
+
+  @abstractmethod
+  def usage(self) -> LlmUsage:
+    pass
+
+
+class BatchLlmService(LlmService):
+  @abstractmethod
+  def enrich_batch(
+    self, contents: List[str]
+  ) -> List[Union[LlmEnrichment, Exception]]:
+    pass
+
+
+class AsyncLlmService(ABC):
+  @abstractmethod
+  async def enrich(self, content: str) -> LlmEnrichment:
+    pass
+
+  @abstractmethod
+  async def extract(self, *content: str) -> LlmReply[Any]:
+    pass
+
+  @abstractmethod
+  async def summarize(self, *content: str) -> LlmReply[str]:
+    pass
+
+  @abstractmethod
+  async def score(self, *content: str) -> LlmReply[float]:
+    pass
+
+  @abstractmethod
+  def usage(self) -> LlmUsage:
+    pass
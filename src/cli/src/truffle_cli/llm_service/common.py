@@ -0,0 +1,163 @@
+import json
+import math
+import re
+from typing import Any, Dict, Final
+
+from .abstract import LlmEnrichment, LlmReply, LlmUsage
+from .input import LlmServiceConfig
+
+SYSTEM_PROMPT: Final[str] = """
+You are an assistant that processes job posts based on the users' CV's and requirements.
+You are given the CV, the requirements, a task and the job post content, in that order.
+You ALWAYS follow the task instructions exactly.
+""".strip()
+
+EXTRACTION_TASK_PROMPT: Final[str] = """
+Extract data from the job post following the extraction requirements.
+You ONLY provide responses in JSON format.
+You follow the user-provided JSON schema.
+Do NOT provide responses in any format other than JSON.
+Do NOT provide any other additional information.
+""".strip()
+
+SUMMARIZATION_TASK_PROMPT: Final[str] = """
+Summarize the job post following the summary requirements.
+You ONLY provide responses in Markdown format.
+Do NOT provide responses in any other format.
+""".strip()
+
+SCORING_TASK_PROMPT: Final[str] = """
+Score the job post following the scoring requirements.
+You ONLY provide a finite floating point number response.
+You ALWAYS provide a number on a scale from 0 to 100.
+Do NOT provide any other explanation, analysis or additional information.
+""".strip()
+
+ENRICHMENT_TASK_PROMPT: Final[str] = """
+Extract data from, summarize and score the job post following the extraction, summary and scoring requirements.
+You ONLY provide responses in JSON format.
+You ALWAYS respond with a single JSON object with exactly these keys:
+"extract" - the extracted data following the user-provided JSON schema,
+"summary" - a JSON string containing the summary in Markdown format,
+"score" - a finite floating point number on a scale from 0 to 100.
+Do NOT provide responses in any format other than JSON.
+Do NOT provide any other additional information.
+""".strip()
+
+
+def chat_payload(
+  config: LlmServiceConfig,
+  task_prompt: str,
+  *content: str,
+) -> dict:
+  # NOTE: everything before the task is the same for every call
+  # so that provider-side prompt prefix caches can hit
+  return {
+    "model": config.model,
+    "messages": [
+      {"role": "system", "content": SYSTEM_PROMPT},
+      {
+        "role": "user",
+        "content": f"The following is the user's CV.\n======\n{config.cv}",
+      },
+      {
+        "role": "user",
+        "content": f"The following is the user's requirements.\n======\n{_requirements(config)}",
+      },
+      {
+        "role": "user",
+        "content": f"The following is your task.\n======\n{task_prompt}",
+      },
+      *[
+        {
+          "role": "user",
+          "content": f"The following is the job post content.\n\n======\n{content}",
+        }
+        for content in content
+      ],
+    ],
+    "stream": False,
+  }
+
+
+def format_extract(extract: LlmReply[Any]) -> str:
+  return f"Extracted data:\n{json.dumps(extract.reply, indent=True)}"
+
+
+def _requirements(config: LlmServiceConfig) -> str:
+  return (
+    f"Extraction requirements:\n{config.extraction_prompt}\n\n"
+    f"Summary requirements:\n{config.summary_prompt}\n\n"
+    f"Scoring requirements:\n{config.scoring_prompt}"
+  )
+
+
+def accumulate_usage(usage: LlmUsage, response: Any) -> None:
+  reported = response.get("usage") or {}
+  details = reported.get("prompt_tokens_details") or {}
+
+  usage.requests += 1
+  usage.prompt_tokens += reported.get("prompt_tokens") or 0
+  usage.cached_tokens += (
+    details.get("cached_tokens") or reported.get("prompt_cache_hit_tokens") or 0
+  )
+  usage.completion_tokens += reported.get("completion_tokens") or 0
+
+
+def chat_headers(config: LlmServiceConfig) -> Dict[str, str]:
+  return {
+    "Authorization": f"Bearer {config.api_key}",
+    "Content-Type": "application/json",
+  }
+
+
+def chat_reply(config: LlmServiceConfig, response: Any) -> LlmReply[str]:
+  reply: str = response["choices"][0]["message"]["content"].strip()
+
+  thinking = None
+  if config.thinking_regex is not None:
+    match = re.search(config.thinking_regex, reply)
+    if match is not None:
+      thinking = match.group(0)
+
+    reply = re.sub(config.thinking_regex, "", reply).strip()
+
+  return LlmReply(reply, thinking)
+
+
+def parse_extract(response: LlmReply[str]) -> LlmReply[Any]:
+  text = response.reply.strip("`").strip("```").strip("json").strip()
+  reply = json.loads(text)
+
+  return LlmReply(reply, response.thinking)
+
+
+def parse_summary(response: LlmReply[str]) -> LlmReply[str]:
+  text = response.reply.strip("`").strip("```").strip("markdown").strip()
+
+  return LlmReply(text, response.thinking)
+
+
+def parse_score(response: LlmReply[str]) -> LlmReply[float]:
+  reply = float(response.reply)
+
+  if not math.isfinite(reply):
+    raise ValueError(f"Llm score is not a finite number - {response}")
+
+  return LlmReply(reply, response.thinking)
+
+
+def parse_enrichment(response: LlmReply[str]) -> LlmEnrichment:
+  reply = parse_extract(response).reply
+  if not isinstance(reply, dict):
+    raise ValueError(f"Llm enrichment is not a JSON object - {response}")
+
+  summary = reply["summary"]
+  if not isinstance(summary, str):
+    raise ValueError(f"Llm summary is not a string - {response}")
+
+  return LlmEnrichment(
+    LlmReply(reply["extract"], response.thinking),
+    parse_summary(LlmReply(summary, response.thinking)),
+    parse_score(LlmReply(str(reply["score"]), response.thinking)),
+  )
@@ -1,11 +1,17 @@
 from dataclasses import dataclass
 from typing import Literal, Optional, Union
 
-LlmServiceConfig = Union["OpenaiLlmServiceConfig"]
+from truffle_cli.cache.input import CacheConfig
+
+LlmServiceConfig = Union[
+  "OpenaiLlmServiceConfig", "OpenaiBatchLlmServiceConfig"
+]
 
 
 OPENAI_LLM_SERVICE_TYPE: Literal["openai"] = "openai"
 
+OPENAI_BATCH_LLM_SERVICE_TYPE: Literal["openai-batch"] = "openai-batch"
+
 
 @dataclass
 class OpenaiLlmServiceConfig:
@@ -17,4 +23,27 @@ class OpenaiLlmServiceConfig:
   summary_prompt: str
   scoring_prompt: str
   thinking_regex: Optional[str] = None
+  combined: bool = False
   type: Literal["openai"] = OPENAI_LLM_SERVICE_TYPE
+
+
+@dataclass
+class OpenaiBatchLlmServiceConfig:
+  base_url: str
+  api_key: str
+  model: str
+  cv: str
+  extraction_prompt: str
+  summary_prompt: str
+  scoring_prompt: str
+  thinking_regex: Optional[str] = None
+  combined: bool = False
+  completion_window: str = "24h"
+  poll_interval: float = 60
+  type: Literal["openai-batch"] = OPENAI_BATCH_LLM_SERVICE_TYPE
+
+
+@dataclass
+class LlmCacheConfig:
+  cache: CacheConfig
+  ttl: Optional[float]
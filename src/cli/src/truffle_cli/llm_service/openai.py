@@ -1,42 +1,44 @@
 import json
-import math
-import re
-from typing import Any, Final, override
+from dataclasses import replace
+from threading import Lock
+from typing import Any, override
 
-from truffle_cli.http_client import HttpClient
+from truffle_cli.http_client import AsyncHttpClient, HttpClient
 from truffle_cli.logger.abstract import Logger
 from truffle_cli.system.abstract import System
 
-from .abstract import LlmReply, LlmService
+from .abstract import (
+  AsyncLlmService,
+  LlmEnrichment,
+  LlmReply,
+  LlmService,
+  LlmUsage,
+)
+from .common import (
+  ENRICHMENT_TASK_PROMPT,
+  EXTRACTION_TASK_PROMPT,
+  SCORING_TASK_PROMPT,
+  SUMMARIZATION_TASK_PROMPT,
+  accumulate_usage,
+  chat_headers,
+  chat_payload,
+  chat_reply,
+  format_extract,
+  parse_enrichment,
+  parse_extract,
+  parse_score,
+  parse_summary,
+)
 from .input import OpenaiLlmServiceConfig
 
-EXTRACTION_SYSTEM_PROMPT: Final[str] = """
-You are an assistant that extracts data job posts based on the users' CV's and requirements.
-You ONLY provide responses in JSON format.
-You follow the user-provided JSON schema.
-Do NOT provide responses in any format other than JSON.
-Do NOT provide any other additional information.
-""".strip()
-
-SUMMARIZATION_SYSTEM_PROMPT: Final[str] = """
-You are an assistant that summarizes job posts based on the users' CV's and requirements.
-You ONLY provide responses in Markdown format.
-Do NOT provide responses in any other format.
-""".strip()
-
-SCORING_SYSTEM_PROMPT: Final[str] = """
-You are an assistant that scores job posts based on the users' CV's and requirements.
-You ONLY provide a finite floating point number response.
-You ALWAYS provide a number on a scale from 0 to 100.
-Do NOT provide any other explanation, analysis or additional information.
-""".strip()
-
 
 class OpenaiLlmService(LlmService):
   _config: OpenaiLlmServiceConfig
   _client: HttpClient
   _system: System
   _logger: Logger
+  _lock: Lock
+  _usage: LlmUsage
 
   def __init__(
     self, system: System, config: OpenaiLlmServiceConfig, client: HttpClient
@@ -47,91 +49,179 @@ class OpenaiLlmService(LlmService):
 
     self._logger = self._system.get_logger(__name__)
 
+    self._lock = Lock()
+    self._usage = LlmUsage()
+
+  @override
+  def enrich(self, content: str) -> LlmEnrichment:
+    if self._config.combined:
+      response = self._call(ENRICHMENT_TASK_PROMPT, content, json_mode=True)
+
+      try:
+        enrichment = parse_enrichment(response)
+        self._logger.debug(f"Enriched: {enrichment.score.reply}")
+        return enrichment
+      except Exception as error:
+        self._logger.warn(
+          f"Parsing combined enrichment failed - '{error}'. "
+          "Falling back to separate calls..."
+        )
+
+    extract = self.extract(content)
+    extract_content = format_extract(extract)
+    summary = self.summarize(content, extract_content)
+    score = self.score(content, extract_content, summary.reply)
+
+    return LlmEnrichment(extract, summary, score)
+
   @override
   def extract(self, *content: str) -> LlmReply[Any]:
-    response = self._call(
-      EXTRACTION_SYSTEM_PROMPT, self._config.extraction_prompt, *content
-    )
+    response = self._call(EXTRACTION_TASK_PROMPT, *content)
 
-    text = response.reply.strip("`").strip("```").strip("json").strip()
-    reply = json.loads(text)
-    thinking = response.thinking
+    reply = parse_extract(response)
 
-    self._logger.debug(f"Extracted:\n{json.dumps(reply, indent=True)}")
+    self._logger.debug(f"Extracted:\n{json.dumps(reply.reply, indent=True)}")
 
-    return LlmReply(reply, thinking)
+    return reply
 
   @override
   def summarize(self, *content: str) -> LlmReply[str]:
-    response = self._call(
-      SUMMARIZATION_SYSTEM_PROMPT, self._config.summary_prompt, *content
-    )
+    response = self._call(SUMMARIZATION_TASK_PROMPT, *content)
 
-    text = response.reply.strip("`").strip("```").strip("markdown").strip()
-    reply = text
-    thinking = response.thinking
+    reply = parse_summary(response)
 
-    self._logger.debug(f"Summarized:\n{reply}")
+    self._logger.debug(f"Summarized:\n{reply.reply}")
 
-    return LlmReply(reply, thinking)
+    return reply
 
   @override
   def score(self, *content: str) -> LlmReply[float]:
-    response = self._call(
-      SCORING_SYSTEM_PROMPT, self._config.scoring_prompt, *content
-    )
+    response = self._call(SCORING_TASK_PROMPT, *content)
 
-    reply = float(response.reply)
-    thinking = response.thinking
+    reply = parse_score(response)
 
-    if not math.isfinite(reply):
-      raise ValueError(f"Llm score is not a finite number - {response}")
+    self._logger.debug(f"Scored: {reply.reply}")
 
-    self._logger.debug(f"Scored: {reply}")
+    return reply
 
-    return LlmReply(reply, thinking)
+  @override
+  def usage(self) -> LlmUsage:
+    with self._lock:
+      return replace(self._usage)
 
   def _call(
-    self, system_prompt: str, user_prompt: str, *content: str
+    self,
+    task_prompt: str,
+    *content: str,
+    json_mode: bool = False,
   ) -> LlmReply[str]:
-    payload = {
-      "model": self._config.model,
-      "messages": [
-        {"role": "system", "content": system_prompt},
-        {
-          "role": "user",
-          "content": f"The following is the user's CV.\n======\n{self._config.cv}",
-        },
-        {
-          "role": "user",
-          "content": f"The following is the user's requirements.\n======\n{user_prompt}",
-        },
-        *[
-          {
-            "role": "user",
-            "content": f"The following is the job post content.\n\n======\n{content}",
-          }
-          for content in content
-        ],
-      ],
-      "stream": False,
-    }
-
-    headers = {
-      "Authorization": f"Bearer {self._config.api_key}",
-      "Content-Type": "application/json",
-    }
+    payload = chat_payload(self._config, task_prompt, *content)
+    if json_mode:
+      payload["response_format"] = {"type": "json_object"}
+    headers = chat_headers(self._config)
 
     url = f"{self._config.base_url}/chat/completions"
     response = self._client.post(url, headers, payload)
-    reply: str = response["choices"][0]["message"]["content"].strip()
 
-    thinking = None
-    if self._config.thinking_regex is not None:
-      reply = re.sub(self._config.thinking_regex, "", response)
+    with self._lock:
+      accumulate_usage(self._usage, response)
+
+    return chat_reply(self._config, response)
+
+
+class AsyncOpenaiLlmService(AsyncLlmService):
+  _config: OpenaiLlmServiceConfig
+  _client: AsyncHttpClient
+  _system: System
+  _logger: Logger
+  _usage: LlmUsage
+
+  def __init__(
+    self,
+    system: System,
+    config: OpenaiLlmServiceConfig,
+    client: AsyncHttpClient,
+  ):
+    self._config = config
+    self._client = client
+    self._system = system
+
+    self._logger = self._system.get_logger(__name__)
+
+    self._usage = LlmUsage()
+
+  @override
+  async def enrich(self, content: str) -> LlmEnrichment:
+    if self._config.combined:
+      response = await self._call(
+        ENRICHMENT_TASK_PROMPT, content, json_mode=True
+      )
+
+      try:
+        enrichment = parse_enrichment(response)
+        self._logger.debug(f"Enriched: {enrichment.score.reply}")
+        return enrichment
+      except Exception as error:
+        self._logger.warn(
+          f"Parsing combined enrichment failed - '{error}'. "
+          "Falling back to separate calls..."
+        )
+
+    extract = await self.extract(content)
+    extract_content = format_extract(extract)
+    summary = await self.summarize(content, extract_content)
+    score = await self.score(content, extract_content, summary.reply)
+
+    return LlmEnrichment(extract, summary, score)
+
+  @override
+  async def extract(self, *content: str) -> LlmReply[Any]:
+    response = await self._call(EXTRACTION_TASK_PROMPT, *content)
+
+    reply = parse_extract(response)
+
+    self._logger.debug(f"Extracted:\n{json.dumps(reply.reply, indent=True)}")
+
+    return reply
+
+  @override
+  async def summarize(self, *content: str) -> LlmReply[str]:
+    response = await self._call(SUMMARIZATION_TASK_PROMPT, *content)
+
+    reply = parse_summary(response)
+
+    self._logger.debug(f"Summarized:\n{reply.reply}")
+
+    return reply
+
+  @override
+  async def score(self, *content: str) -> LlmReply[float]:
+    response = await self._call(SCORING_TASK_PROMPT, *content)
+
+    reply = parse_score(response)
+
+    self._logger.debug(f"Scored: {reply.reply}")
+
+    return reply
+
+  @override
+  def usage(self) -> LlmUsage:
+    return replace(self._usage)
+
+  async def _call(
+    self,
+    task_prompt: str,
+    *content: str,
+    json_mode: bool = False,
+  ) -> LlmReply[str]:
+    payload = chat_payload(self._config, task_prompt, *content)
+    if json_mode:
+      payload["response_format"] = {"type": "json_object"}
+    headers = chat_headers(self._config)
+
+    url = f"{self._config.base_url}/chat/completions"
+    response = await self._client.post(url, headers, payload)
 
-      match = re.match(self._config.thinking_regex, response)
-      if match is not None:
-        thinking = match.string
+    accumulate_usage(self._usage, response)
 
-    return LlmReply(reply, thinking)
+    return chat_reply(self._config, response)
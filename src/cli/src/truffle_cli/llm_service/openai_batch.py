@@ -0,0 +1,304 @@
+import json
+import time
+from dataclasses import replace
+from threading import Lock
+from typing import Any, Callable, Dict, Final, List, Tuple, Union, override
+
+from truffle_cli.http_client import HttpClient
+from truffle_cli.logger.abstract import Logger
+from truffle_cli.system.abstract import System
+
+from .abstract import BatchLlmService, LlmEnrichment, LlmReply, LlmUsage
+from .common import (
+  ENRICHMENT_TASK_PROMPT,
+  EXTRACTION_TASK_PROMPT,
+  SCORING_TASK_PROMPT,
+  SUMMARIZATION_TASK_PROMPT,
+  accumulate_usage,
+  chat_headers,
+  chat_payload,
+  chat_reply,
+  format_extract,
+  parse_enrichment,
+  parse_extract,
+  parse_score,
+  parse_summary,
+)
+from .input import OpenaiBatchLlmServiceConfig
+
+BATCH_ENDPOINT: Final[str] = "/v1/chat/completions"
+
+BATCH_FINAL_STATUSES: Final[List[str]] = [
+  "completed",
+  "failed",
+  "expired",
+  "cancelled",
+]
+
+
+class OpenaiBatchLlmService(BatchLlmService):
+  _config: OpenaiBatchLlmServiceConfig
+  _client: HttpClient
+  _system: System
+  _logger: Logger
+  _lock: Lock
+  _usage: LlmUsage
+
+  def __init__(
+    self,
+    system: System,
+    config: OpenaiBatchLlmServiceConfig,
+    client: HttpClient,
+  ):
+    self._config = config
+    self._client = client
+    self._system = system
+
+    self._logger = self._system.get_logger(__name__)
+
+    self._lock = Lock()
+    self._usage = LlmUsage()
+
+  @override
+  def enrich_batch(
+    self, contents: List[str]
+  ) -> List[Union[LlmEnrichment, Exception]]:
+    enrichments: Dict[int, Union[LlmEnrichment, Exception]] = {}
+
+    separate = list(range(len(contents)))
+    if self._config.combined:
+      separate = []
+      results = self._run(
+        [
+          (f"{index}-enrich", ENRICHMENT_TASK_PROMPT, (content,))
+          for index, content in enumerate(contents)
+        ]
+      )
+      for index in range(len(contents)):
+        try:
+          response = _result(results, f"{index}-enrich")
+        except Exception as error:
+          enrichments[index] = error
+          continue
+
+        try:
+          enrichments[index] = parse_enrichment(response)
+        except Exception as error:
+          self._logger.warn(
+            f"Parsing combined enrichment failed - '{error}'. "
+            "Falling back to separate calls..."
+          )
+          separate.append(index)
+
+    # NOTE: summaries build on extracts and scores on both
+    # so the separate calls run as one batch per step
+    extracts = self._step(
+      "extract",
+      EXTRACTION_TASK_PROMPT,
+      {index: (contents[index],) for index in separate},
+      parse_extract,
+      enrichments,
+    )
+    summaries = self._step(
+      "summarize",
+      SUMMARIZATION_TASK_PROMPT,
+      {
+        index: (contents[index], format_extract(extract))
+        for index, extract in extracts.items()
+      },
+      parse_summary,
+      enrichments,
+    )
+    scores = self._step(
+      "score",
+      SCORING_TASK_PROMPT,
+      {
+        index: (
+          contents[index],
+          format_extract(extracts[index]),
+          summary.reply,
+        )
+        for index, summary in summaries.items()
+      },
+      parse_score,
+      enrichments,
+    )
+    for index, score in scores.items():
+      enrichments[index] = LlmEnrichment(
+        extracts[index], summaries[index], score
+      )
+
+    for enrichment in enrichments.values():
+      if isinstance(enrichment, LlmEnrichment):
+        self._logger.debug(f"Enriched: {enrichment.score.reply}")
+
+    return [enrichments[index] for index in range(len(contents))]
+
+  @override
+  def enrich(self, content: str) -> LlmEnrichment:
+    enrichment = self.enrich_batch([content])[0]
+    if isinstance(enrichment, Exception):
+      raise enrichment
+
+    return enrichment
+
+  @override
+  def extract(self, *content: str) -> LlmReply[Any]:
+    results = self._run([("extract", EXTRACTION_TASK_PROMPT, content)])
+
+    return parse_extract(_result(results, "extract"))
+
+  @override
+  def summarize(self, *content: str) -> LlmReply[str]:
+    results = self._run([("summarize", SUMMARIZATION_TASK_PROMPT, content)])
+
+    return parse_summary(_result(results, "summarize"))
+
+  @override
+  def score(self, *content: str) -> LlmReply[float]:
+    results = self._run([("score", SCORING_TASK_PROMPT, content)])
+
+    return parse_score(_result(results, "score"))
+
+  @override
+  def usage(self) -> LlmUsage:
+    with self._lock:
+      return replace(self._usage)
+
+  def _step[TReply](
+    self,
+    name: str,
+    task_prompt: str,
+    requests: Dict[int, Tuple[str, ...]],
+    parse: Callable[[LlmReply[str]], LlmReply[TReply]],
+    enrichments: Dict[int, Union[LlmEnrichment, Exception]],
+  ) -> Dict[int, LlmReply[TReply]]:
+    if not requests:
+      return {}
+
+    results = self._run(
+      [
+        (f"{index}-{name}", task_prompt, content)
+        for index, content in requests.items()
+      ]
+    )
+
+    replies: Dict[int, LlmReply[TReply]] = {}
+    for index in requests:
+      try:
+        replies[index] = parse(_result(results, f"{index}-{name}"))
+      except Exception as error:
+        enrichments[index] = error
+
+    return replies
+
+  def _run(
+    self, requests: List[Tuple[str, str, Tuple[str, ...]]]
+  ) -> Dict[str, Union[LlmReply[str], Exception]]:
+    lines = []
+    for custom_id, task_prompt, content in requests:
+      payload = chat_payload(self._config, task_prompt, *content)
+      if task_prompt == ENRICHMENT_TASK_PROMPT:
+        payload["response_format"] = {"type": "json_object"}
+
+      lines.append(
+        json.dumps(
+          {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": BATCH_ENDPOINT,
+            "body": payload,
+          }
+        )
+      )
+
+    file = self._client.upload(
+      f"{self._config.base_url}/files",
+      _auth_headers(self._config),
+      {"purpose": "batch"},
+      "batch.jsonl",
+      "\n".join(lines) + "\n",
+    )
+    batch = self._client.post(
+      f"{self._config.base_url}/batches",
+      chat_headers(self._config),
+      {
+        "input_file_id": file["id"],
+        "endpoint": BATCH_ENDPOINT,
+        "completion_window": self._config.completion_window,
+      },
+      idempotent=False,
+    )
+
+    self._logger.info(
+      f"Submitted batch '{batch['id']}' with {len(requests)} requests"
+    )
+
+    while batch["status"] not in BATCH_FINAL_STATUSES:
+      time.sleep(self._config.poll_interval)
+      batch = self._client.get(
+        f"{self._config.base_url}/batches/{batch['id']}",
+        _auth_headers(self._config),
+      )
+
+      self._logger.debug(f"Batch '{batch['id']}' is '{batch['status']}'")
+
+    self._logger.info(f"Batch '{batch['id']}' ended as '{batch['status']}'")
+
+    results: Dict[str, Union[LlmReply[str], Exception]] = {}
+    for file_id in (batch.get("error_file_id"), batch.get("output_file_id")):
+      if file_id is None:
+        continue
+
+      output = self._client.download(
+        f"{self._config.base_url}/files/{file_id}/content",
+        _auth_headers(self._config),
+      )
+      for line in output.splitlines():
+        if not line.strip():
+          continue
+
+        result = json.loads(line)
+        results[result["custom_id"]] = self._parse_result(result)
+
+    if not results:
+      raise Exception(
+        f"Batch '{batch['id']}' ended as '{batch['status']}' without results"
+      )
+
+    return results
+
+  def _parse_result(self, result: Any) -> Union[LlmReply[str], Exception]:
+    response = result.get("response")
+    if result.get("error") is not None or response is None:
+      return Exception(f"Batch request failed - {result.get('error')}")
+
+    if response["status_code"] != 200:
+      return Exception(
+        f"Batch request responded with {response['status_code']}"
+        f" - {response['body']}"
+      )
+
+    with self._lock:
+      accumulate_usage(self._usage, response["body"])
+
+    try:
+      return chat_reply(self._config, response["body"])
+    except Exception as error:
+      return error
+
+
+def _auth_headers(config: OpenaiBatchLlmServiceConfig) -> Dict[str, str]:
+  return {"Authorization": f"Bearer {config.api_key}"}
+
+
+def _result(
+  results: Dict[str, Union[LlmReply[str], Exception]], custom_id: str
+) -> LlmReply[str]:
+  result = results.get(custom_id)
+  if result is None:
+    raise Exception(f"Batch request '{custom_id}' is missing from the results")
+  if isinstance(result, Exception):
+    raise result
+
+  return result
@@ -1,9 +1,15 @@
-from truffle_cli.http_client.abstract import HttpClient
+from truffle_cli.cache.abstract import Cache
+from truffle_cli.http_client.abstract import AsyncHttpClient, HttpClient
 from truffle_cli.system.abstract import System
 
-from .abstract import ScrapingService
-from .input import ZYTE_SCRAPING_SERVICE_TYPE, ScrapingServiceConfig
-from .zyte import ZyteScrapingService
+from .abstract import AsyncScrapingService, ScrapingService
+from .cached import AsyncCachedScrapingService, CachedScrapingService
+from .input import (
+  ZYTE_SCRAPING_SERVICE_TYPE,
+  ScrapingCacheConfig,
+  ScrapingServiceConfig,
+)
+from .zyte import AsyncZyteScrapingService, ZyteScrapingService
 
 
 def create(
@@ -11,3 +17,32 @@ def create(
 ) -> ScrapingService:
   if config.type == ZYTE_SCRAPING_SERVICE_TYPE:
     return ZyteScrapingService(system, config, client)
+
+
+def create_async(
+  system: System, config: ScrapingServiceConfig, client: AsyncHttpClient
+) -> AsyncScrapingService:
+  if config.type == ZYTE_SCRAPING_SERVICE_TYPE:
+    return AsyncZyteScrapingService(system, config, client)
+
+
+def create_cached(
+  system: System,
+  config: ScrapingCacheConfig,
+  service_config: ScrapingServiceConfig,
+  service: ScrapingService,
+  cache: Cache,
+) -> ScrapingService:
+  return CachedScrapingService(system, config, service_config, service, cache)
+
+
+def create_async_cached(
+  system: System,
+  config: ScrapingCacheConfig,
+  service_config: ScrapingServiceConfig,
+  service: AsyncScrapingService,
+  cache: Cache,
+) -> AsyncScrapingService:
+  return AsyncCachedScrapingService(
+    system, config, service_config, service, cache
+  )
@@ -9,3 +9,13 @@ class ScrapingService(ABC):
   @abstractmethod
   def details(self, url: str) -> str:
     pass
+
+
+class AsyncScrapingService(ABC):
+  @abstractmethod
+  async def list(self, url: str) -> str:
+    pass
+
+  @abstractmethod
+  async def details(self, url: str) -> str:
+    pass
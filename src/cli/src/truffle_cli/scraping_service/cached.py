@@ -0,0 +1,129 @@
+import asyncio
+import json
+from hashlib import sha256
+from typing import Optional, override
+
+from truffle_cli.cache.abstract import Cache
+from truffle_cli.logger.abstract import Logger
+from truffle_cli.system.abstract import System
+
+from .abstract import AsyncScrapingService, ScrapingService
+from .input import ScrapingCacheConfig, ScrapingServiceConfig
+
+
+class CachedScrapingService(ScrapingService):
+  _service: ScrapingService
+  _cache: Cache
+  _config: ScrapingCacheConfig
+  _service_config: ScrapingServiceConfig
+  _system: System
+  _logger: Logger
+
+  def __init__(
+    self,
+    system: System,
+    config: ScrapingCacheConfig,
+    service_config: ScrapingServiceConfig,
+    service: ScrapingService,
+    cache: Cache,
+  ):
+    self._config = config
+    self._service_config = service_config
+    self._service = service
+    self._cache = cache
+    self._system = system
+
+    self._logger = self._system.get_logger(__name__)
+
+  @override
+  def list(self, url: str) -> str:
+    key = _key("list", url, self._service_config.list_payload)
+
+    cached = self._cache.get(key, self._config.list_ttl)
+    if cached is not None:
+      self._logger.debug(f"Scraped from cache: '{url}'")
+      return cached
+
+    body = self._service.list(url)
+    self._cache.set(key, body)
+
+    return body
+
+  @override
+  def details(self, url: str) -> str:
+    key = _key("details", url, self._service_config.details_payload)
+
+    cached = self._cache.get(key, self._config.details_ttl)
+    if cached is not None:
+      self._logger.debug(f"Scraped from cache: '{url}'")
+      return cached
+
+    body = self._service.details(url)
+    self._cache.set(key, body)
+
+    return body
+
+
+class AsyncCachedScrapingService(AsyncScrapingService):
+  _service: AsyncScrapingService
+  _cache: Cache
+  _config: ScrapingCacheConfig
+  _service_config: ScrapingServiceConfig
+  _system: System
+  _logger: Logger
+
+  def __init__(
+    self,
+    system: System,
+    config: ScrapingCacheConfig,
+    service_config: ScrapingServiceConfig,
+    service: AsyncScrapingService,
+    cache: Cache,
+  ):
+    self._config = config
+    self._service_config = service_config
+    self._service = service
+    self._cache = cache
+    self._system = system
+
+    self._logger = self._system.get_logger(__name__)
+
+  @override
+  async def list(self, url: str) -> str:
+    key = _key("list", url, self._service_config.list_payload)
+
+    cached = await asyncio.to_thread(
+      self._cache.get, key, self._config.list_ttl
+    )
+    if cached is not None:
+      self._logger.debug(f"Scraped from cache: '{url}'")
+      return cached
+
+    body = await self._service.list(url)
+    await asyncio.to_thread(self._cache.set, key, body)
+
+    return body
+
+  @override
+  async def details(self, url: str) -> str:
+    key = _key("details", url, self._service_config.details_payload)
+
+    cached = await asyncio.to_thread(
+      self._cache.get, key, self._config.details_ttl
+    )
+    if cached is not None:
+      self._logger.debug(f"Scraped from cache: '{url}'")
+      return cached
+
+    body = await self._service.details(url)
+    await asyncio.to_thread(self._cache.set, key, body)
+
+    return body
+
+
+def _key(kind: str, url: str, payload: Optional[dict]) -> str:
+  serialized = json.dumps(
+    {"kind": kind, "url": url, "payload": payload}, sort_keys=True
+  )
+
+  return sha256(serialized.encode()).hexdigest()
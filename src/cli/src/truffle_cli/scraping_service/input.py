@@ -1,5 +1,7 @@
 from dataclasses import dataclass
-from typing import Literal, Union
+from typing import Literal, Optional, Union
+
+from truffle_cli.cache.input import CacheConfig
 
 ScrapingServiceConfig = Union["ZyteScrapingServiceConfig"]
 
@@ -15,3 +17,10 @@ class ZyteScrapingServiceConfig:
   list_payload: dict
   details_payload: dict
   type: Literal["zyte"] = ZYTE_SCRAPING_SERVICE_TYPE
+
+
+@dataclass
+class ScrapingCacheConfig:
+  cache: CacheConfig
+  list_ttl: Optional[float]
+  details_ttl: Optional[float]
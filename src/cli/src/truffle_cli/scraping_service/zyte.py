@@ -1,11 +1,11 @@
 from base64 import b64decode, b64encode
-from typing import override
+from typing import Any, Dict, override
 
-from truffle_cli.http_client import HttpClient
+from truffle_cli.http_client import AsyncHttpClient, HttpClient
 from truffle_cli.logger.abstract import Logger
 from truffle_cli.system.abstract import System
 
-from .abstract import ScrapingService
+from .abstract import AsyncScrapingService, ScrapingService
 from .input import ZyteScrapingServiceConfig
 
 
@@ -33,27 +33,81 @@ class ZyteScrapingService(ScrapingService):
     return self._call(url, self._config.details_payload)
 
   def _call(self, url: str, additional_payload: dict) -> str:
-    auth = b64encode(f"{self._config.api_key}:".encode()).decode()
+    headers = _headers(self._config)
+    payload = _payload(self._config, url, additional_payload)
 
-    headers = {
-      "Authorization": f"Basic {auth}",
-      "Content-Type": "application/json",
-    }
+    response = self._client.post(str(self._config.base_url), headers, payload)
 
-    payload = {
-      "url": url,
-      "httpResponseBody": not self._config.requires_browser,
-      "browserHtml": self._config.requires_browser,
-      **additional_payload,
-    }
+    body = _body(self._config, response)
 
-    response = self._client.post(str(self._config.base_url), headers, payload)
+    self._logger.debug(f"Scraped: '{url}'")
+
+    return body
+
+
+class AsyncZyteScrapingService(AsyncScrapingService):
+  _config: ZyteScrapingServiceConfig
+  _client: AsyncHttpClient
+  _system: System
+  _logger: Logger
+
+  def __init__(
+    self,
+    system: System,
+    config: ZyteScrapingServiceConfig,
+    client: AsyncHttpClient,
+  ):
+    self._config = config
+    self._client = client
+    self._system = system
 
-    if self._config.requires_browser:
-      body = response["browserHtml"]
-    else:
-      body = b64decode(response["httpResponseBody"]).decode()
+    self._logger = self._system.get_logger(__name__)
+
+  @override
+  async def list(self, url: str) -> str:
+    return await self._call(url, self._config.list_payload)
+
+  @override
+  async def details(self, url: str) -> str:
+    return await self._call(url, self._config.details_payload)
+
+  async def _call(self, url: str, additional_payload: dict) -> str:
+    headers = _headers(self._config)
+    payload = _payload(self._config, url, additional_payload)
+
+    response = await self._client.post(
+      str(self._config.base_url), headers, payload
+    )
+
+    body = _body(self._config, response)
 
     self._logger.debug(f"Scraped: '{url}'")
 
     return body
+
+
+def _headers(config: ZyteScrapingServiceConfig) -> Dict[str, str]:
+  auth = b64encode(f"{config.api_key}:".encode()).decode()
+
+  return {
+    "Authorization": f"Basic {auth}",
+    "Content-Type": "application/json",
+  }
+
+
+def _payload(
+  config: ZyteScrapingServiceConfig, url: str, additional_payload: dict
+) -> dict:
+  return {
+    "url": url,
+    "httpResponseBody": not config.requires_browser,
+    "browserHtml": config.requires_browser,
+    **additional_payload,
+  }
+
+
+def _body(config: ZyteScrapingServiceConfig, response: Any) -> str:
+  if config.requires_browser:
+    return response["browserHtml"]
+
+  return b64decode(response["httpResponseBody"]).decode()
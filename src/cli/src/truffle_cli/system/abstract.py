@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, TextIO
 
 from truffle_cli.environment import Environment, LogLevel
 from truffle_cli.format import Format
@@ -47,6 +47,14 @@ class System(ABC):
   def path_join(self, lhs: str, rhs: str) -> str:
     pass
 
+  @abstractmethod
+  def path_parent(self, path: str) -> str:
+    pass
+
+  @abstractmethod
+  def create_dir(self, path: str) -> None:
+    pass
+
   @abstractmethod
   def read_file(self, path: str) -> str:
     pass
@@ -59,6 +67,34 @@ class System(ABC):
   def clear_file(self, path: str) -> None:
     pass
 
+  @abstractmethod
+  def open_file(self, path: str) -> TextIO:
+    pass
+
+  @abstractmethod
+  def replace_file(self, path: str, content: str) -> None:
+    pass
+
+  @abstractmethod
+  def write_compressed_file(self, path: str, content: str) -> None:
+    pass
+
+  @abstractmethod
+  def sync_file(self, path: str) -> None:
+    pass
+
+  @abstractmethod
+  def file_size(self, path: str) -> int:
+    pass
+
+  @abstractmethod
+  def truncate_file(self, path: str, size: int) -> None:
+    pass
+
+  @abstractmethod
+  def remove_file(self, path: str) -> None:
+    pass
+
   @abstractmethod
   def write_stdout(self, content: str) -> None:
     pass
@@ -67,6 +103,10 @@ class System(ABC):
   def get_config_dir(self) -> str:
     pass
 
+  @abstractmethod
+  def get_cache_dir(self) -> str:
+    pass
+
   @abstractmethod
   def setup_logging(
     self, log_level: LogLevel, environment: Environment
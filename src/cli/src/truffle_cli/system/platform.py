@@ -1,8 +1,9 @@
+import gzip
 import logging
 import os
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional, override
+from typing import Dict, List, Optional, TextIO, override
 
 import platformdirs
 
@@ -63,6 +64,14 @@ class PlatformSystem(System):
   def path_join(self, lhs: str, rhs: str) -> str:
     return str(Path(lhs) / rhs)
 
+  @override
+  def path_parent(self, path: str) -> str:
+    return str(Path(path).parent)
+
+  @override
+  def create_dir(self, path: str) -> None:
+    Path(path).mkdir(parents=True, exist_ok=True)
+
   @override
   def read_file(self, path: str) -> str:
     with open(path, "r") as file:
@@ -82,6 +91,47 @@ class PlatformSystem(System):
     else:
       platform_path.touch()
 
+  @override
+  def open_file(self, path: str) -> TextIO:
+    return open(path, "a")
+
+  @override
+  def replace_file(self, path: str, content: str) -> None:
+    # NOTE: a crash while rewriting must not lose the previous content
+    # so it is written aside and moved in place atomically
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w") as file:
+      file.write(content)
+      file.flush()
+      os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+  @override
+  def write_compressed_file(self, path: str, content: str) -> None:
+    # NOTE: concurrent runs may store the same file
+    # so it is written aside and moved in place atomically
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with gzip.GzipFile(temporary, "wb", mtime=0) as file:
+      file.write(content.encode())
+    os.replace(temporary, path)
+
+  @override
+  def sync_file(self, path: str) -> None:
+    with open(path, "a") as file:
+      os.fsync(file.fileno())
+
+  @override
+  def file_size(self, path: str) -> int:
+    return os.path.getsize(path)
+
+  @override
+  def truncate_file(self, path: str, size: int) -> None:
+    os.truncate(path, size)
+
+  @override
+  def remove_file(self, path: str) -> None:
+    Path(path).unlink(missing_ok=True)
+
   @override
   def write_stdout(self, content: str) -> None:
     print(content)
@@ -90,6 +140,10 @@ class PlatformSystem(System):
   def get_config_dir(self) -> str:
     return platformdirs.user_config_dir()
 
+  @override
+  def get_cache_dir(self) -> str:
+    return platformdirs.user_cache_dir()
+
   @override
   def setup_logging(
     self, log_level: LogLevel, environment: Environment
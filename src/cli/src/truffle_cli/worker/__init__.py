@@ -1,10 +1,30 @@
+from typing import Optional
+
+from truffle_cli.checkpoint.abstract import Checkpoint
 from truffle_cli.system.abstract import System
 
 from .abstract import Worker
-from .input import WorkerConfig
+from .asynchronous import AsyncWorker
+from .input import (
+  ASYNC_WORKER_TYPE,
+  PIPELINED_WORKER_TYPE,
+  SYNC_WORKER_TYPE,
+  THREADED_WORKER_TYPE,
+  WorkerConfig,
+)
+from .pipelined import PipelinedWorker
 from .sync import SyncWorker
+from .threaded import ThreadedWorker
 
 
-def create(system: System, config: WorkerConfig) -> Worker:
-  if config.type == "sync":
-    return SyncWorker(system, config)
+def create(
+  system: System, config: WorkerConfig, checkpoint: Optional[Checkpoint]
+) -> Worker:
+  if config.type == SYNC_WORKER_TYPE:
+    return SyncWorker(system, config, checkpoint)
+  elif config.type == THREADED_WORKER_TYPE:
+    return ThreadedWorker(system, config, checkpoint)
+  elif config.type == ASYNC_WORKER_TYPE:
+    return AsyncWorker(system, config, checkpoint)
+  elif config.type == PIPELINED_WORKER_TYPE:
+    return PipelinedWorker(system, config, checkpoint)
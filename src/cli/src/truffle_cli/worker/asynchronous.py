@@ -0,0 +1,479 @@
+import asyncio
+from collections import deque
+from contextlib import aclosing
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from queue import Queue
+from threading import Event, Thread
+from typing import (
+  AsyncGenerator,
+  Deque,
+  Dict,
+  Generator,
+  Iterator,
+  List,
+  Optional,
+  Set,
+  Tuple,
+  override,
+)
+
+import truffle_cli.cache as truffle_cache
+import truffle_cli.html_processor as truffle_html_processor
+import truffle_cli.http_client as truffle_http_client
+import truffle_cli.llm_service as truffle_llm_service
+import truffle_cli.scraping_service as truffle_scraping_service
+from truffle_cli.cache.abstract import Cache
+from truffle_cli.checkpoint.abstract import Checkpoint
+from truffle_cli.html_processor.abstract import HtmlProcessor
+from truffle_cli.http_client.abstract import AsyncHttpClient, HttpClientStats
+from truffle_cli.http_client.input import RateLimitConfig
+from truffle_cli.http_client.rate_limited import AsyncRateLimiter
+from truffle_cli.llm_service.abstract import AsyncLlmService
+from truffle_cli.logger.abstract import Logger
+from truffle_cli.scraping_service.abstract import AsyncScrapingService
+from truffle_cli.system.abstract import System
+
+from .abstract import Worker
+from .common import (
+  admit_link,
+  cache_metadata,
+  canonical_links,
+  close_near_duplicates,
+  create_job,
+  create_near_duplicates,
+  dedup_metadata,
+  exhausted,
+  http_metadata,
+  incremental_metadata,
+  llm_usage_metadata,
+  near_duplicate_metadata,
+  page_range,
+  parse_link,
+  pending_links,
+  prefilter_metadata,
+  recall_link,
+  record_links,
+  replay_link,
+  resumed_links,
+  reuse_job,
+)
+from .dedup import LinkDeduplicator
+from .incremental import LinkIndex, LinkIndexEntry
+from .input import AsyncWorkerConfig, SyncWorkerSiteConfig
+from .near_duplicates import NearDuplicateIndex
+from .output import OutputJob, OutputMetadata
+from .prefilter import PreFilter
+
+
+@dataclass
+class _SiteProcessingContext:
+  name: str
+  config: SyncWorkerSiteConfig
+  scraping_service: AsyncScrapingService
+  scraping_cache: Optional[Cache]
+  html_processor: HtmlProcessor
+  llm_service: AsyncLlmService
+  llm_cache: Optional[Cache]
+  index: Optional[LinkIndex]
+  near_duplicates: Optional[NearDuplicateIndex]
+  prefilter: Optional[PreFilter]
+  dedup: LinkDeduplicator
+
+
+@dataclass
+class _PageProcessingContext:
+  site: _SiteProcessingContext
+  page: int
+
+
+@dataclass
+class _LinkProcessingContext:
+  page: _PageProcessingContext
+  link: str
+  indexed: Optional[LinkIndexEntry] = None
+
+
+@dataclass
+class _RunContext:
+  jobs: Queue[Optional[OutputJob]]
+  cancelled: Event
+  tasks: asyncio.Semaphore
+
+
+class AsyncWorker(Worker):
+  _system: System
+  _config: AsyncWorkerConfig
+  _checkpoint: Optional[Checkpoint]
+  _logger: Logger
+
+  def __init__(
+    self,
+    system: System,
+    config: AsyncWorkerConfig,
+    checkpoint: Optional[Checkpoint],
+  ):
+    self._system = system
+    self._config = config
+    self._checkpoint = checkpoint
+
+    self._logger = self._system.get_logger(__name__)
+
+  @override
+  def run(self) -> Generator[OutputJob, None, OutputMetadata]:
+    start = datetime.now(timezone.utc)
+
+    self._logger.info(f"Starting: {start}")
+
+    jobs: Queue[Optional[OutputJob]] = Queue()
+    cancelled = Event()
+    sites: List[_SiteProcessingContext] = []
+    stats: List[HttpClientStats] = []
+    errors: List[Exception] = []
+    dedup = LinkDeduplicator()
+    near_duplicates = create_near_duplicates(self._system, self._config.sites)
+
+    thread = Thread(
+      target=asyncio.run,
+      args=(
+        self._run(
+          jobs, cancelled, sites, stats, errors, dedup, near_duplicates
+        ),
+      ),
+      name="truffle-async",
+    )
+    thread.start()
+    try:
+      while True:
+        job = jobs.get()
+        if job is None:
+          break
+
+        yield job
+    finally:
+      cancelled.set()
+      thread.join()
+      close_near_duplicates(near_duplicates)
+
+    if errors:
+      raise errors[0]
+
+    self._logger.info(f"Ending: {start}")
+
+    end = datetime.now(timezone.utc)
+
+    return OutputMetadata(
+      start,
+      end,
+      scraping_cache=cache_metadata(
+        self._logger, "Scraping", [site.scraping_cache for site in sites]
+      ),
+      llm_cache=cache_metadata(
+        self._logger, "LLM", [site.llm_cache for site in sites]
+      ),
+      incremental=incremental_metadata(
+        self._logger, [site.index for site in sites]
+      ),
+      llm_usage=llm_usage_metadata(
+        self._logger, [site.llm_service for site in sites]
+      ),
+      http=http_metadata(
+        self._logger, stats[0] if stats else HttpClientStats()
+      ),
+      dedup=dedup_metadata(self._logger, dedup),
+      near_duplicates=near_duplicate_metadata(self._logger, near_duplicates),
+      prefilter=prefilter_metadata(
+        self._logger, [site.prefilter for site in sites]
+      ),
+    )
+
+  async def _run(
+    self,
+    jobs: Queue[Optional[OutputJob]],
+    cancelled: Event,
+    sites: List[_SiteProcessingContext],
+    stats: List[HttpClientStats],
+    errors: List[Exception],
+    dedup: LinkDeduplicator,
+    near_duplicates: Dict[str, NearDuplicateIndex],
+  ) -> None:
+    http_client = truffle_http_client.create_async(
+      self._system, self._config.http_client, self._config.max_tasks
+    )
+    run_ctx = _RunContext(
+      jobs, cancelled, asyncio.Semaphore(self._config.max_tasks)
+    )
+    limiters: Dict[str, AsyncRateLimiter] = {}
+    try:
+      for name, site in self._config.sites.items():
+        sites.append(
+          self._create_site(
+            name, site, http_client, limiters, dedup, near_duplicates
+          )
+        )
+
+      async with asyncio.TaskGroup() as group:
+        for site_ctx in sites:
+          group.create_task(self._process_site(site_ctx, run_ctx))
+    except Exception as error:
+      errors.append(error)
+    finally:
+      for site_ctx in sites:
+        if site_ctx.scraping_cache is not None:
+          site_ctx.scraping_cache.close()
+        if site_ctx.llm_cache is not None:
+          site_ctx.llm_cache.close()
+        if site_ctx.index is not None:
+          site_ctx.index.close()
+      await http_client.close()
+      stats.append(http_client.stats())
+      jobs.put(None)
+
+  def _create_site(
+    self,
+    name: str,
+    site: SyncWorkerSiteConfig,
+    http_client: AsyncHttpClient,
+    limiters: Dict[str, AsyncRateLimiter],
+    dedup: LinkDeduplicator,
+    near_duplicates: Dict[str, NearDuplicateIndex],
+  ) -> _SiteProcessingContext:
+    scraping_client = self._rate_limited(
+      http_client,
+      site.scraping_rate_limit,
+      site.scraping_service.base_url,
+      limiters,
+    )
+    scraping_service = truffle_scraping_service.create_async(
+      self._system, site.scraping_service, scraping_client
+    )
+    scraping_cache = None
+    if site.scraping_cache is not None:
+      scraping_cache = truffle_cache.create(
+        self._system, site.scraping_cache.cache
+      )
+      scraping_service = truffle_scraping_service.create_async_cached(
+        self._system,
+        site.scraping_cache,
+        site.scraping_service,
+        scraping_service,
+        scraping_cache,
+      )
+    html_processor = truffle_html_processor.create(
+      self._system, site.html_processor
+    )
+    llm_client = self._rate_limited(
+      http_client, site.llm_rate_limit, site.llm_service.base_url, limiters
+    )
+    llm_cache = None
+    if site.llm_cache is not None:
+      llm_cache = truffle_cache.create(self._system, site.llm_cache.cache)
+      llm_client = truffle_http_client.create_async_cached(
+        self._system, llm_client, llm_cache, site.llm_cache.ttl
+      )
+    llm_service = truffle_llm_service.create_async(
+      self._system, site.llm_service, llm_client
+    )
+    index = None
+    if site.incremental is not None:
+      index = LinkIndex(
+        self._system,
+        site.incremental,
+        truffle_cache.create(self._system, site.incremental.cache),
+      )
+    prefilter = None
+    if site.prefilter is not None:
+      prefilter = PreFilter(self._system, site.prefilter, site.llm_service.cv)
+
+    return _SiteProcessingContext(
+      name,
+      site,
+      scraping_service,
+      scraping_cache,
+      html_processor,
+      llm_service,
+      llm_cache,
+      index,
+      near_duplicates.get(name),
+      prefilter,
+      dedup,
+    )
+
+  def _rate_limited(
+    self,
+    client: AsyncHttpClient,
+    config: Optional[RateLimitConfig],
+    base_url: str,
+    limiters: Dict[str, AsyncRateLimiter],
+  ) -> AsyncHttpClient:
+    if config is None:
+      return client
+
+    limiter = limiters.get(base_url)
+    if limiter is None:
+      limiter = AsyncRateLimiter(config)
+      limiters[base_url] = limiter
+
+    return truffle_http_client.create_async_rate_limited(
+      self._system, config, client, limiter
+    )
+
+  async def _process_site(
+    self, ctx: _SiteProcessingContext, run_ctx: _RunContext
+  ) -> None:
+    self._logger.info(f"Processing site: '{ctx.name}'")
+
+    site_tasks = asyncio.Semaphore(self._config.max_site_tasks)
+    try:
+      async with (
+        asyncio.TaskGroup() as group,
+        aclosing(self._pages(ctx)) as pages,
+      ):
+        async for page_ctx, links in pages:
+          if run_ctx.cancelled.is_set():
+            return
+
+          for link in links:
+            await site_tasks.acquire()
+            await run_ctx.tasks.acquire()
+            if run_ctx.cancelled.is_set():
+              run_ctx.tasks.release()
+              site_tasks.release()
+              return
+
+            link_ctx = _LinkProcessingContext(page_ctx, link)
+            group.create_task(self._run_link(link_ctx, run_ctx, site_tasks))
+    except Exception as error:
+      self._logger.err(
+        f"Processing site '{ctx.name}' failed - '{error}'. Skipping..."
+      )
+
+  async def _pages(
+    self, ctx: _SiteProcessingContext
+  ) -> AsyncGenerator[Tuple[_PageProcessingContext, List[str]], None]:
+    pages = iter(page_range(ctx.config.pagination))
+    prefetched: Deque[
+      Tuple[_PageProcessingContext, asyncio.Task[Optional[List[str]]]]
+    ] = deque()
+    seen: Set[str] = set()
+    try:
+      self._prefetch(ctx, pages, prefetched)
+      while prefetched:
+        page_ctx, task = prefetched.popleft()
+        links = await task
+        if links is not None and exhausted(links, seen):
+          self._logger.info(
+            f"Stopping site '{ctx.name}' at page {page_ctx.page}"
+          )
+          return
+
+        self._prefetch(ctx, pages, prefetched)
+        if links is None:
+          continue
+
+        seen.update(links)
+        yield (
+          page_ctx,
+          pending_links(self._checkpoint, ctx.name, ctx.dedup.unique(links)),
+        )
+    finally:
+      for _, task in prefetched:
+        task.cancel()
+
+  def _prefetch(
+    self,
+    ctx: _SiteProcessingContext,
+    pages: Iterator[int],
+    prefetched: Deque[
+      Tuple[_PageProcessingContext, asyncio.Task[Optional[List[str]]]]
+    ],
+  ) -> None:
+    while len(prefetched) < ctx.config.pagination.prefetch:
+      page = next(pages, None)
+      if page is None:
+        return
+
+      page_ctx = _PageProcessingContext(ctx, page)
+      prefetched.append((page_ctx, asyncio.create_task(self._links(page_ctx))))
+
+  async def _links(self, ctx: _PageProcessingContext) -> Optional[List[str]]:
+    page_url = str(ctx.site.config.pagination.template).format(ctx.page)
+
+    resumed = resumed_links(self._checkpoint, ctx.site.name, ctx.page)
+    if resumed is not None:
+      self._logger.info(f"Resuming page: '{page_url}'")
+      return resumed
+
+    self._logger.info(f"Processing page: '{page_url}'")
+
+    try:
+      page_html = await ctx.site.scraping_service.list(page_url)
+    except Exception as error:
+      self._logger.err(
+        f"Scraping page '{page_url}' failed - '{error}'. Skipping..."
+      )
+      return None
+
+    links = await asyncio.to_thread(
+      canonical_links, self._logger, ctx, page_url, page_html
+    )
+    if links is None:
+      return None
+
+    record_links(self._checkpoint, ctx.site.name, ctx.page, links)
+
+    return links
+
+  async def _run_link(
+    self,
+    ctx: _LinkProcessingContext,
+    run_ctx: _RunContext,
+    site_tasks: asyncio.Semaphore,
+  ) -> None:
+    try:
+      job = await self._process_link(ctx)
+      if job is not None:
+        run_ctx.jobs.put(job)
+    except Exception as error:
+      self._logger.err(
+        f"Processing link '{ctx.link}' failed - '{error}'. Skipping..."
+      )
+    finally:
+      run_ctx.tasks.release()
+      site_tasks.release()
+
+  async def _process_link(
+    self, ctx: _LinkProcessingContext
+  ) -> Optional[OutputJob]:
+    self._logger.info(f"Processing link: {ctx.link}")
+
+    # NOTE: parsing and the sqlite backed indexes block
+    # so they run in threads to keep the event loop responsive
+    if await asyncio.to_thread(recall_link, ctx):
+      return await asyncio.to_thread(replay_link, ctx)
+
+    try:
+      raw = await ctx.page.site.scraping_service.details(ctx.link)
+    except Exception as error:
+      self._logger.err(
+        f"Scraping link '{ctx.link}' failed - '{error}'. Skipping..."
+      )
+      return None
+
+    scrape = await asyncio.to_thread(parse_link, self._logger, ctx, raw)
+    if scrape is None or not await asyncio.to_thread(admit_link, ctx, scrape):
+      return None
+
+    job = await asyncio.to_thread(reuse_job, ctx, scrape)
+    if job is not None:
+      return job
+
+    try:
+      enriched = await ctx.page.site.llm_service.enrich(scrape.clean)
+    except Exception as error:
+      self._logger.err(
+        f"Enriching link '{ctx.link}' failed - '{error}'. Skipping..."
+      )
+      return None
+
+    return await asyncio.to_thread(create_job, ctx, scrape, enriched)
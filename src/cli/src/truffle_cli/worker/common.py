@@ -0,0 +1,366 @@
+from typing import (
+  Dict,
+  List,
+  Optional,
+  Protocol,
+  Sequence,
+  Set,
+  Tuple,
+  Union,
+)
+
+import truffle_cli.cache as truffle_cache
+from truffle_cli.cache.abstract import Cache
+from truffle_cli.checkpoint.abstract import Checkpoint
+from truffle_cli.html_processor.abstract import HtmlProcessor
+from truffle_cli.http_client.abstract import HttpClientStats
+from truffle_cli.llm_service.abstract import (
+  AsyncLlmService,
+  LlmEnrichment,
+  LlmService,
+)
+from truffle_cli.llm_service.input import OPENAI_BATCH_LLM_SERVICE_TYPE
+from truffle_cli.logger.abstract import Logger
+from truffle_cli.system.abstract import System
+
+from .dedup import LinkDeduplicator, canonicalize
+from .incremental import LinkIndex, LinkIndexEntry
+from .input import PaginationSyncWorkerSiteConfig, SyncWorkerSiteConfig
+from .near_duplicates import NearDuplicateIndex, enrichment_context
+from .output import (
+  OutputJob,
+  OutputJobEnrichment,
+  OutputJobScrape,
+  OutputJobThinking,
+  OutputMetadataCache,
+  OutputMetadataDedup,
+  OutputMetadataHttp,
+  OutputMetadataIncremental,
+  OutputMetadataLlmUsage,
+  OutputMetadataNearDuplicates,
+  OutputMetadataPreFilter,
+)
+from .prefilter import PreFilter
+
+
+# NOTE: the parts of the processing contexts that do not depend on
+# the service flavor so link processing is shared by every worker
+class SiteState(Protocol):
+  @property
+  def name(self) -> str: ...
+
+  @property
+  def config(self) -> SyncWorkerSiteConfig: ...
+
+  @property
+  def html_processor(self) -> HtmlProcessor: ...
+
+  @property
+  def index(self) -> Optional[LinkIndex]: ...
+
+  @property
+  def near_duplicates(self) -> Optional[NearDuplicateIndex]: ...
+
+  @property
+  def prefilter(self) -> Optional[PreFilter]: ...
+
+
+class PageState(Protocol):
+  @property
+  def site(self) -> SiteState: ...
+
+
+class LinkState(Protocol):
+  link: str
+  indexed: Optional[LinkIndexEntry]
+
+  @property
+  def page(self) -> PageState: ...
+
+
+def canonical_links(
+  logger: Logger, ctx: PageState, page_url: str, page_html: str
+) -> Optional[List[str]]:
+  try:
+    links = ctx.site.html_processor.links(page_html)
+  except Exception as error:
+    logger.err(f"Parsing page '{page_url}' failed - '{error}'. Skipping...")
+    return None
+
+  return [canonicalize(link, str(ctx.site.config.base_url)) for link in links]
+
+
+def recall_link(ctx: LinkState) -> bool:
+  index = ctx.page.site.index
+  if index is None:
+    return False
+
+  ctx.indexed = index.recall(ctx.link)
+
+  return ctx.indexed is not None and not index.verifies()
+
+
+def replay_link(ctx: LinkState) -> Optional[OutputJob]:
+  index = ctx.page.site.index
+  if index is None or ctx.indexed is None:
+    return None
+
+  return index.replay(ctx.page.site.name, ctx.indexed)
+
+
+def parse_link(
+  logger: Logger, ctx: LinkState, raw: str
+) -> Optional[OutputJobScrape]:
+  try:
+    document = ctx.page.site.html_processor.process(raw)
+  except Exception as error:
+    logger.err(f"Parsing link '{ctx.link}' failed - '{error}'. Skipping...")
+    return None
+
+  return OutputJobScrape(raw, document.clean, document.title, document.details)
+
+
+def admit_link(ctx: LinkState, scrape: OutputJobScrape) -> bool:
+  prefilter = ctx.page.site.prefilter
+  if prefilter is None:
+    return True
+
+  return prefilter.admit(ctx.link, scrape)
+
+
+def reuse_job(ctx: LinkState, scrape: OutputJobScrape) -> Optional[OutputJob]:
+  site = ctx.page.site
+
+  if site.index is not None:
+    job = site.index.reuse(site.name, ctx.indexed, scrape)
+    if job is not None:
+      return job
+
+  if site.near_duplicates is not None:
+    job = site.near_duplicates.match(site.name, ctx.link, scrape)
+    if job is not None:
+      return remember_job(ctx, job)
+
+  return None
+
+
+def create_job(
+  ctx: LinkState, scrape: OutputJobScrape, enriched: LlmEnrichment
+) -> OutputJob:
+  enrichment = OutputJobEnrichment(
+    enriched.extract.reply, enriched.summary.reply, enriched.score.reply
+  )
+  thinking = OutputJobThinking(
+    enriched.extract.thinking,
+    enriched.summary.thinking,
+    enriched.score.thinking,
+  )
+
+  job = OutputJob(ctx.page.site.name, ctx.link, scrape, enrichment, thinking)
+  near_duplicates = ctx.page.site.near_duplicates
+  if near_duplicates is not None:
+    near_duplicates.remember(job)
+
+  return remember_job(ctx, job)
+
+
+def remember_job(ctx: LinkState, job: OutputJob) -> OutputJob:
+  index = ctx.page.site.index
+  if index is not None:
+    index.remember(ctx.indexed, job)
+
+  return job
+
+
+def reject_batch(sites: Dict[str, SyncWorkerSiteConfig], worker: str) -> None:
+  for site in sites.values():
+    if site.llm_service.type == OPENAI_BATCH_LLM_SERVICE_TYPE:
+      raise ValueError(
+        f"Batch llm service is not supported by the {worker} worker"
+      )
+
+
+# NOTE: sites with the same near duplicate config and enrichment context
+# share one index so reposts on one site reuse enrichment from another
+def create_near_duplicates(
+  system: System, sites: Dict[str, SyncWorkerSiteConfig]
+) -> Dict[str, NearDuplicateIndex]:
+  shared: Dict[Tuple[str, str], NearDuplicateIndex] = {}
+  indexes: Dict[str, NearDuplicateIndex] = {}
+  for name, site in sites.items():
+    if site.near_duplicates is None:
+      continue
+
+    context = enrichment_context(site.llm_service)
+    key = (repr(site.near_duplicates), context)
+    if key not in shared:
+      shared[key] = NearDuplicateIndex(
+        system,
+        site.near_duplicates,
+        truffle_cache.create(system, site.near_duplicates.cache),
+        context,
+      )
+    indexes[name] = shared[key]
+
+  return indexes
+
+
+def close_near_duplicates(indexes: Dict[str, NearDuplicateIndex]) -> None:
+  for index in set(indexes.values()):
+    index.close()
+
+
+def page_range(pagination: PaginationSyncWorkerSiteConfig) -> range:
+  return range(pagination.start, pagination.stop, pagination.step)[
+    : pagination.max_pages
+  ]
+
+
+def exhausted(links: List[str], seen: Set[str]) -> bool:
+  return all(link in seen for link in links)
+
+
+def resumed_links(
+  checkpoint: Optional[Checkpoint], site: str, page: int
+) -> Optional[List[str]]:
+  if checkpoint is None:
+    return None
+
+  return checkpoint.links(site, page)
+
+
+def record_links(
+  checkpoint: Optional[Checkpoint], site: str, page: int, links: List[str]
+) -> None:
+  if checkpoint is not None:
+    checkpoint.listed(site, page, links)
+
+
+def pending_links(
+  checkpoint: Optional[Checkpoint], site: str, links: List[str]
+) -> List[str]:
+  if checkpoint is None:
+    return links
+
+  return checkpoint.pending(site, links)
+
+
+def cache_metadata(
+  logger: Logger, name: str, caches: List[Optional[Cache]]
+) -> OutputMetadataCache:
+  metadata = OutputMetadataCache()
+  for cache in caches:
+    if cache is None:
+      continue
+
+    stats = cache.stats()
+    metadata.hits += stats.hits
+    metadata.misses += stats.misses
+    metadata.evictions += stats.evictions
+
+  logger.info(f"{name} cache: {metadata.hits} hits, {metadata.misses} misses")
+
+  return metadata
+
+
+def incremental_metadata(
+  logger: Logger, indexes: List[Optional[LinkIndex]]
+) -> OutputMetadataIncremental:
+  metadata = OutputMetadataIncremental()
+  for index in indexes:
+    if index is None:
+      continue
+
+    stats = index.metadata()
+    metadata.new += stats.new
+    metadata.changed += stats.changed
+    metadata.unchanged += stats.unchanged
+
+  logger.info(
+    f"Incremental: {metadata.new} new, {metadata.changed} changed, "
+    f"{metadata.unchanged} unchanged"
+  )
+
+  return metadata
+
+
+def near_duplicate_metadata(
+  logger: Logger, indexes: Dict[str, NearDuplicateIndex]
+) -> OutputMetadataNearDuplicates:
+  metadata = OutputMetadataNearDuplicates()
+  for index in set(indexes.values()):
+    stats = index.metadata()
+    metadata.reused += stats.reused
+    metadata.indexed += stats.indexed
+
+  logger.info(
+    f"Near duplicates: {metadata.reused} reused, {metadata.indexed} indexed"
+  )
+
+  return metadata
+
+
+def prefilter_metadata(
+  logger: Logger, prefilters: List[Optional[PreFilter]]
+) -> OutputMetadataPreFilter:
+  metadata = OutputMetadataPreFilter()
+  for prefilter in prefilters:
+    if prefilter is None:
+      continue
+
+    stats = prefilter.metadata()
+    metadata.passed += stats.passed
+    metadata.excluded += stats.excluded
+    metadata.unmatched += stats.unmatched
+    metadata.dissimilar += stats.dissimilar
+
+  logger.info(
+    f"Prefilter: {metadata.passed} passed, {metadata.excluded} excluded, "
+    f"{metadata.unmatched} unmatched, {metadata.dissimilar} dissimilar"
+  )
+
+  return metadata
+
+
+def llm_usage_metadata(
+  logger: Logger, services: Sequence[Union[LlmService, AsyncLlmService]]
+) -> OutputMetadataLlmUsage:
+  metadata = OutputMetadataLlmUsage()
+  for service in services:
+    usage = service.usage()
+    metadata.requests += usage.requests
+    metadata.prompt_tokens += usage.prompt_tokens
+    metadata.cached_tokens += usage.cached_tokens
+    metadata.completion_tokens += usage.completion_tokens
+
+  logger.info(
+    f"LLM usage: {metadata.requests} requests, "
+    f"{metadata.prompt_tokens} prompt tokens "
+    f"({metadata.cached_tokens} cached), "
+    f"{metadata.completion_tokens} completion tokens"
+  )
+
+  return metadata
+
+
+def http_metadata(logger: Logger, stats: HttpClientStats) -> OutputMetadataHttp:
+  metadata = OutputMetadataHttp(stats.retries, stats.exhausted, stats.latency)
+
+  logger.info(
+    f"HTTP: {metadata.retries} retries, {metadata.exhausted} exhausted, "
+    f"{metadata.latency:.2f}s added latency"
+  )
+
+  return metadata
+
+
+def dedup_metadata(
+  logger: Logger, dedup: LinkDeduplicator
+) -> OutputMetadataDedup:
+  metadata = dedup.metadata()
+
+  logger.info(
+    f"Dedup: {metadata.unique} unique, {metadata.duplicates} duplicate links"
+  )
+
+  return metadata
@@ -0,0 +1,94 @@
+from hashlib import blake2b
+from threading import Lock
+from typing import List, Set
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+from .output import OutputMetadataDedup
+
+TRACKING_PARAMS = {
+  "fbclid",
+  "gclid",
+  "gclsrc",
+  "dclid",
+  "msclkid",
+  "yclid",
+  "igshid",
+  "mc_cid",
+  "mc_eid",
+  "_ga",
+  "_gl",
+  "_hsenc",
+  "_hsmi",
+}
+
+TRACKING_PARAM_PREFIXES = ["utm_"]
+
+
+def canonicalize(link: str, base_url: str) -> str:
+  link = link.strip()
+  base_url = base_url.removesuffix("/")
+
+  # NOTE: root relative links stay under the base url path
+  # like sites hosted at https://example.com/careers expect
+  if link.startswith("/") and not link.startswith("//"):
+    link = base_url + "/" + link.removeprefix("/")
+  else:
+    link = urljoin(base_url + "/", link)
+
+  parts = urlsplit(link)
+
+  query = [
+    (key, value)
+    for key, value in parse_qsl(parts.query, keep_blank_values=True)
+    if not _tracking(key)
+  ]
+  path = parts.path.rstrip("/") or "/"
+
+  return urlunsplit(
+    (
+      parts.scheme.lower(),
+      parts.netloc.lower(),
+      path,
+      urlencode(sorted(query)),
+      "",
+    )
+  )
+
+
+def _tracking(key: str) -> bool:
+  key = key.lower()
+  return key in TRACKING_PARAMS or any(
+    key.startswith(prefix) for prefix in TRACKING_PARAM_PREFIXES
+  )
+
+
+class LinkDeduplicator:
+  _lock: Lock
+  _seen: Set[int]
+  _metadata: OutputMetadataDedup
+
+  def __init__(self):
+    self._lock = Lock()
+    self._seen = set()
+    self._metadata = OutputMetadataDedup()
+
+  def unique(self, links: List[str]) -> List[str]:
+    unique = []
+    with self._lock:
+      for link in links:
+        digest = int.from_bytes(blake2b(link.encode(), digest_size=8).digest())
+        if digest in self._seen:
+          self._metadata.duplicates += 1
+          continue
+
+        self._seen.add(digest)
+        self._metadata.unique += 1
+        unique.append(link)
+
+    return unique
+
+  def metadata(self) -> OutputMetadataDedup:
+    with self._lock:
+      return OutputMetadataDedup(
+        self._metadata.unique, self._metadata.duplicates
+      )
@@ -0,0 +1,117 @@
+import json
+from dataclasses import asdict, dataclass, replace
+from hashlib import sha256
+from threading import Lock
+from typing import Optional
+
+import dacite
+
+from truffle_cli.cache.abstract import Cache
+from truffle_cli.logger.abstract import Logger
+from truffle_cli.system.abstract import System
+
+from .input import (
+  INCREMENTAL_EMIT_MODE,
+  INCREMENTAL_VERIFY_MODE,
+  IncrementalConfig,
+)
+from .output import OutputJob, OutputJobScrape, OutputMetadataIncremental
+
+
+@dataclass
+class LinkIndexEntry:
+  hash: str
+  job: OutputJob
+
+
+class LinkIndex:
+  _system: System
+  _config: IncrementalConfig
+  _cache: Cache
+  _logger: Logger
+  _lock: Lock
+  _metadata: OutputMetadataIncremental
+
+  def __init__(self, system: System, config: IncrementalConfig, cache: Cache):
+    self._system = system
+    self._config = config
+    self._cache = cache
+
+    self._logger = self._system.get_logger(__name__)
+    self._lock = Lock()
+    self._metadata = OutputMetadataIncremental()
+
+  def recall(self, link: str) -> Optional[LinkIndexEntry]:
+    cached = self._cache.get(link, self._config.ttl)
+    if cached is None:
+      return None
+
+    try:
+      data = json.loads(cached)
+      return LinkIndexEntry(
+        hash=data["hash"],
+        job=dacite.from_dict(data_class=OutputJob, data=data["job"]),
+      )
+    except Exception as error:
+      self._logger.warn(
+        f"Reading index entry for '{link}' failed - '{error}'. Ignoring..."
+      )
+      return None
+
+  def verifies(self) -> bool:
+    return self._config.mode == INCREMENTAL_VERIFY_MODE
+
+  def replay(self, site: str, entry: LinkIndexEntry) -> Optional[OutputJob]:
+    self._count_unchanged()
+    self._logger.debug(f"Link unchanged since last run: '{entry.job.link}'")
+
+    if self._config.mode != INCREMENTAL_EMIT_MODE:
+      return None
+
+    return replace(entry.job, site=site)
+
+  def reuse(
+    self,
+    site: str,
+    entry: Optional[LinkIndexEntry],
+    scrape: OutputJobScrape,
+  ) -> Optional[OutputJob]:
+    if entry is None or entry.hash != _hash(scrape):
+      return None
+
+    self._count_unchanged()
+    self._logger.debug(f"Content unchanged since last run: '{entry.job.link}'")
+
+    job = replace(entry.job, site=site, scrape=scrape)
+    self._store(job)
+
+    return job
+
+  def remember(self, entry: Optional[LinkIndexEntry], job: OutputJob) -> None:
+    with self._lock:
+      if entry is None:
+        self._metadata.new += 1
+      else:
+        self._metadata.changed += 1
+
+    self._store(job)
+
+  def metadata(self) -> OutputMetadataIncremental:
+    with self._lock:
+      return replace(self._metadata)
+
+  def close(self) -> None:
+    self._cache.close()
+
+  def _store(self, job: OutputJob) -> None:
+    self._cache.set(
+      job.link, json.dumps({"hash": _hash(job.scrape), "job": asdict(job)})
+    )
+
+  def _count_unchanged(self) -> None:
+    with self._lock:
+      self._metadata.unchanged += 1
+
+
+def _hash(scrape: OutputJobScrape) -> str:
+  return sha256(scrape.clean.encode()).hexdigest()
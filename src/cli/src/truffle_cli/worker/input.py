@@ -1,31 +1,94 @@
 from dataclasses import dataclass
-from typing import Dict, Final, Literal, Union
+from typing import Dict, Final, List, Literal, Optional, Union
 
+from truffle_cli.cache.input import CacheConfig
 from truffle_cli.html_processor import HtmlProcessorConfig
+from truffle_cli.http_client.input import HttpClientConfig, RateLimitConfig
 from truffle_cli.llm_service import LlmServiceConfig
-from truffle_cli.scraping_service import ScrapingServiceConfig
+from truffle_cli.llm_service.input import LlmCacheConfig
+from truffle_cli.scraping_service import (
+  ScrapingCacheConfig,
+  ScrapingServiceConfig,
+)
 
-WorkerConfig = Union["SyncWorkerConfig"]
+WorkerConfig = Union[
+  "SyncWorkerConfig",
+  "ThreadedWorkerConfig",
+  "AsyncWorkerConfig",
+  "PipelinedWorkerConfig",
+]
 
 
 SYNC_WORKER_TYPE: Literal["sync"] = "sync"
 
 SYNC_WORKER_SITE_MAX_PAGES: Final[int] = 50
 
+THREADED_WORKER_TYPE: Literal["threaded"] = "threaded"
+
+ASYNC_WORKER_TYPE: Literal["async"] = "async"
+
+PIPELINED_WORKER_TYPE: Literal["pipelined"] = "pipelined"
+
+IncrementalMode = Literal["skip", "emit", "verify"]
+
+INCREMENTAL_SKIP_MODE: Literal["skip"] = "skip"
+
+INCREMENTAL_EMIT_MODE: Literal["emit"] = "emit"
+
+INCREMENTAL_VERIFY_MODE: Literal["verify"] = "verify"
+
 
 @dataclass
 class SyncWorkerConfig:
   sites: Dict[str, "SyncWorkerSiteConfig"]
+  http_client: HttpClientConfig
   type: Literal["sync"] = SYNC_WORKER_TYPE
 
 
+@dataclass
+class ThreadedWorkerConfig:
+  sites: Dict[str, "SyncWorkerSiteConfig"]
+  http_client: HttpClientConfig
+  max_workers: int
+  max_site_workers: int
+  type: Literal["threaded"] = THREADED_WORKER_TYPE
+
+
+@dataclass
+class AsyncWorkerConfig:
+  sites: Dict[str, "SyncWorkerSiteConfig"]
+  http_client: HttpClientConfig
+  max_tasks: int
+  max_site_tasks: int
+  type: Literal["async"] = ASYNC_WORKER_TYPE
+
+
+@dataclass
+class PipelinedWorkerConfig:
+  sites: Dict[str, "SyncWorkerSiteConfig"]
+  http_client: HttpClientConfig
+  list_workers: int
+  scrape_workers: int
+  parse_workers: int
+  enrich_workers: int
+  queue_size: int
+  type: Literal["pipelined"] = PIPELINED_WORKER_TYPE
+
+
 @dataclass
 class SyncWorkerSiteConfig:
   base_url: str
   pagination: "PaginationSyncWorkerSiteConfig"
   scraping_service: ScrapingServiceConfig
+  scraping_cache: Optional[ScrapingCacheConfig]
   html_processor: HtmlProcessorConfig
   llm_service: LlmServiceConfig
+  llm_cache: Optional[LlmCacheConfig]
+  incremental: Optional["IncrementalConfig"]
+  near_duplicates: Optional["NearDuplicateConfig"]
+  prefilter: Optional["PreFilterConfig"]
+  scraping_rate_limit: Optional[RateLimitConfig]
+  llm_rate_limit: Optional[RateLimitConfig]
 
 
 @dataclass
@@ -34,3 +97,26 @@ class PaginationSyncWorkerSiteConfig:
   start: int
   stop: int
   step: int
+  max_pages: int
+  prefetch: int
+
+
+@dataclass
+class IncrementalConfig:
+  cache: CacheConfig
+  mode: IncrementalMode
+  ttl: Optional[float]
+
+
+@dataclass
+class NearDuplicateConfig:
+  cache: CacheConfig
+  threshold: float
+  ttl: Optional[float]
+
+
+@dataclass
+class PreFilterConfig:
+  include: List[str]
+  exclude: List[str]
+  threshold: Optional[float]
@@ -0,0 +1,201 @@
+import json
+import re
+from collections import Counter
+from dataclasses import asdict, dataclass, replace
+from hashlib import blake2b, sha256
+from threading import Lock
+from typing import Final, List, Optional
+
+import dacite
+
+from truffle_cli.cache.abstract import Cache
+from truffle_cli.llm_service.input import LlmServiceConfig
+from truffle_cli.logger.abstract import Logger
+from truffle_cli.system.abstract import System
+
+from .input import NearDuplicateConfig
+from .output import (
+  OutputJob,
+  OutputJobEnrichment,
+  OutputJobScrape,
+  OutputJobThinking,
+  OutputMetadataNearDuplicates,
+)
+
+SIMHASH_BITS: Final[int] = 64
+
+SIMHASH_MIN_WORDS: Final[int] = 32
+
+SIMHASH_MAX_BANDS: Final[int] = 8
+
+
+@dataclass
+class NearDuplicateEntry:
+  link: str
+  enrichment: OutputJobEnrichment
+  thinking: OutputJobThinking
+
+
+class NearDuplicateIndex:
+  _system: System
+  _config: NearDuplicateConfig
+  _cache: Cache
+  _context: str
+  _logger: Logger
+  _lock: Lock
+  _metadata: OutputMetadataNearDuplicates
+  _distance: int
+  _bands: List[int]
+
+  def __init__(
+    self,
+    system: System,
+    config: NearDuplicateConfig,
+    cache: Cache,
+    context: str,
+  ):
+    self._system = system
+    self._config = config
+    self._cache = cache
+    self._context = context
+
+    self._logger = self._system.get_logger(__name__)
+    self._lock = Lock()
+    self._metadata = OutputMetadataNearDuplicates()
+
+    # NOTE: with one more band than the allowed distance any near duplicate
+    # shares at least one band with the fingerprint it is compared against
+    # but bands narrower than 8 bits match almost everything so low
+    # thresholds trade some recall for selective buckets
+    self._distance = int((1 - self._config.threshold) * SIMHASH_BITS)
+    bands = min(self._distance + 1, SIMHASH_MAX_BANDS)
+    self._bands = [SIMHASH_BITS * band // bands for band in range(bands + 1)]
+
+  def match(
+    self, site: str, link: str, scrape: OutputJobScrape
+  ) -> Optional[OutputJob]:
+    fingerprint = _simhash(scrape.clean)
+    if fingerprint is None:
+      return None
+
+    candidates = self._candidates(fingerprint)
+
+    for candidate in sorted(
+      candidates, key=lambda candidate: _distance(fingerprint, candidate)
+    ):
+      if _distance(fingerprint, candidate) > self._distance:
+        break
+
+      entry = self._entry(candidate)
+      if entry is None:
+        self._forget(candidate)
+        continue
+
+      with self._lock:
+        self._metadata.reused += 1
+      self._logger.debug(
+        f"Reusing enrichment of near duplicate '{entry.link}' for '{link}'"
+      )
+
+      return OutputJob(site, link, scrape, entry.enrichment, entry.thinking)
+
+    return None
+
+  def remember(self, job: OutputJob) -> None:
+    fingerprint = _simhash(job.scrape.clean)
+    if fingerprint is None:
+      return
+
+    entry = NearDuplicateEntry(job.link, job.enrichment, job.thinking)
+    self._cache.set(self._entry_key(fingerprint), json.dumps(asdict(entry)))
+
+    # NOTE: bucket membership is kept as one cache entry per fingerprint
+    # so remembering a fingerprint never rewrites a whole bucket
+    for key in self._band_keys(fingerprint):
+      self._cache.set(f"{key}{fingerprint:016x}", f"{fingerprint:016x}")
+
+    with self._lock:
+      self._metadata.indexed += 1
+
+  def metadata(self) -> OutputMetadataNearDuplicates:
+    with self._lock:
+      return replace(self._metadata)
+
+  def close(self) -> None:
+    self._cache.close()
+
+  def _entry_key(self, fingerprint: int) -> str:
+    return f"simhash:{self._context}:{fingerprint:016x}"
+
+  def _band_keys(self, fingerprint: int) -> List[str]:
+    keys = []
+    for band, (start, end) in enumerate(zip(self._bands, self._bands[1:])):
+      value = (fingerprint >> start) & ((1 << (end - start)) - 1)
+      keys.append(
+        f"simhash-band:{self._context}:{len(self._bands) - 1}:{band}:{value:x}:"
+      )
+
+    return keys
+
+  def _candidates(self, fingerprint: int) -> List[int]:
+    candidates = set()
+    for key in self._band_keys(fingerprint):
+      for member in self._cache.keys(key):
+        candidates.add(int(member[len(key) :], 16))
+
+    return list(candidates)
+
+  def _forget(self, fingerprint: int) -> None:
+    for key in self._band_keys(fingerprint):
+      self._cache.delete(f"{key}{fingerprint:016x}")
+
+  def _entry(self, fingerprint: int) -> Optional[NearDuplicateEntry]:
+    cached = self._cache.get(self._entry_key(fingerprint), self._config.ttl)
+    if cached is None:
+      return None
+
+    try:
+      return dacite.from_dict(
+        data_class=NearDuplicateEntry, data=json.loads(cached)
+      )
+    except Exception as error:
+      self._logger.warn(
+        f"Reading near duplicate '{fingerprint:016x}' failed - '{error}'. "
+        "Ignoring..."
+      )
+      return None
+
+
+def _simhash(content: str) -> Optional[int]:
+  words = Counter(re.findall(r"\w+", content.lower()))
+  if words.total() < SIMHASH_MIN_WORDS:
+    return None
+
+  weights = [0] * SIMHASH_BITS
+  for word, count in words.items():
+    hash = int.from_bytes(blake2b(word.encode(), digest_size=8).digest())
+    for bit in range(SIMHASH_BITS):
+      weights[bit] += count if hash >> bit & 1 else -count
+
+  return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def _distance(first: int, second: int) -> int:
+  return (first ^ second).bit_count()
+
+
+# NOTE: enrichment depends on the CV, the prompts and the model
+# so only sites that share all of them may reuse each other's entries
+def enrichment_context(config: LlmServiceConfig) -> str:
+  serialized = json.dumps(
+    {
+      "model": config.model,
+      "cv": config.cv,
+      "extraction_prompt": config.extraction_prompt,
+      "summary_prompt": config.summary_prompt,
+      "scoring_prompt": config.scoring_prompt,
+    },
+    sort_keys=True,
+  )
+
+  return sha256(serialized.encode()).hexdigest()
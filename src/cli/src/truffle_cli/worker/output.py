@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, List, Literal, Optional, Union
 
@@ -16,9 +16,82 @@ class Output:
 class OutputMetadata:
   start: datetime
   end: datetime
+  scraping_cache: "OutputMetadataCache" = field(
+    default_factory=lambda: OutputMetadataCache()
+  )
+  llm_cache: "OutputMetadataCache" = field(
+    default_factory=lambda: OutputMetadataCache()
+  )
+  incremental: "OutputMetadataIncremental" = field(
+    default_factory=lambda: OutputMetadataIncremental()
+  )
+  llm_usage: "OutputMetadataLlmUsage" = field(
+    default_factory=lambda: OutputMetadataLlmUsage()
+  )
+  http: "OutputMetadataHttp" = field(
+    default_factory=lambda: OutputMetadataHttp()
+  )
+  dedup: "OutputMetadataDedup" = field(
+    default_factory=lambda: OutputMetadataDedup()
+  )
+  near_duplicates: "OutputMetadataNearDuplicates" = field(
+    default_factory=lambda: OutputMetadataNearDuplicates()
+  )
+  prefilter: "OutputMetadataPreFilter" = field(
+    default_factory=lambda: OutputMetadataPreFilter()
+  )
   type: Literal["metadata"] = "metadata"
 
 
+@dataclass
+class OutputMetadataCache:
+  hits: int = 0
+  misses: int = 0
+  evictions: int = 0
+
+
+@dataclass
+class OutputMetadataIncremental:
+  new: int = 0
+  changed: int = 0
+  unchanged: int = 0
+
+
+@dataclass
+class OutputMetadataLlmUsage:
+  requests: int = 0
+  prompt_tokens: int = 0
+  cached_tokens: int = 0
+  completion_tokens: int = 0
+
+
+@dataclass
+class OutputMetadataHttp:
+  retries: int = 0
+  exhausted: int = 0
+  latency: float = 0
+
+
+@dataclass
+class OutputMetadataDedup:
+  unique: int = 0
+  duplicates: int = 0
+
+
+@dataclass
+class OutputMetadataNearDuplicates:
+  reused: int = 0
+  indexed: int = 0
+
+
+@dataclass
+class OutputMetadataPreFilter:
+  passed: int = 0
+  excluded: int = 0
+  unmatched: int = 0
+  dissimilar: int = 0
+
+
 @dataclass
 class OutputJob:
   site: str
@@ -35,6 +108,8 @@ class OutputJobScrape:
   clean: str
   title: str
   content: str
+  raw_hash: Optional[str] = None
+  clean_hash: Optional[str] = None
 
 
 @dataclass
@@ -0,0 +1,276 @@
+from datetime import datetime, timezone
+from functools import partial
+from queue import Queue
+from threading import Event, Lock, Thread
+from typing import (
+  Callable,
+  Dict,
+  Generator,
+  Iterable,
+  List,
+  Optional,
+  Tuple,
+  override,
+)
+
+import truffle_cli.http_client as truffle_http_client
+from truffle_cli.checkpoint.abstract import Checkpoint
+from truffle_cli.http_client.rate_limited import RateLimiter
+from truffle_cli.logger.abstract import Logger
+from truffle_cli.system.abstract import System
+
+from .common import (
+  close_near_duplicates,
+  create_near_duplicates,
+  parse_link,
+  recall_link,
+  reject_batch,
+  replay_link,
+)
+from .dedup import LinkDeduplicator
+from .input import PipelinedWorkerConfig, SyncWorkerConfig
+from .output import OutputJob, OutputJobScrape, OutputMetadata
+from .sync import LinkProcessingContext, SiteProcessingContext, SyncWorker
+
+
+class _Stage[TIn, TOut]:
+  _name: str
+  _workers: int
+  _process: Callable[[TIn], Iterable[TOut]]
+  _input: Queue[Optional[TIn]]
+  _output: Queue[Optional[TOut]]
+  _output_workers: int
+  _cancelled: Event
+  _logger: Logger
+  _lock: Lock
+  _remaining: int
+  _threads: List[Thread]
+
+  def __init__(
+    self,
+    name: str,
+    workers: int,
+    process: Callable[[TIn], Iterable[TOut]],
+    input: Queue[Optional[TIn]],
+    output: Queue[Optional[TOut]],
+    output_workers: int,
+    cancelled: Event,
+    logger: Logger,
+  ):
+    self._name = name
+    self._workers = workers
+    self._process = process
+    self._input = input
+    self._output = output
+    self._output_workers = output_workers
+    self._cancelled = cancelled
+    self._logger = logger
+
+    self._lock = Lock()
+    self._remaining = workers
+    self._threads = [
+      Thread(target=self._work, name=f"truffle-{name}-{index}")
+      for index in range(workers)
+    ]
+
+  def start(self) -> None:
+    for thread in self._threads:
+      thread.start()
+
+  def join(self) -> None:
+    for thread in self._threads:
+      thread.join()
+
+  def _work(self) -> None:
+    while True:
+      item = self._input.get()
+      if item is None:
+        break
+
+      if self._cancelled.is_set():
+        continue
+
+      try:
+        for result in self._process(item):
+          if self._cancelled.is_set():
+            break
+
+          self._output.put(result)
+      except Exception as error:
+        self._logger.err(
+          f"Stage '{self._name}' failed - '{error}'. Skipping..."
+        )
+
+    with self._lock:
+      self._remaining -= 1
+      if self._remaining == 0:
+        for _ in range(self._output_workers):
+          self._output.put(None)
+
+
+class PipelinedWorker(SyncWorker):
+  _pipelined_config: PipelinedWorkerConfig
+  _logger: Logger
+
+  def __init__(
+    self,
+    system: System,
+    config: PipelinedWorkerConfig,
+    checkpoint: Optional[Checkpoint],
+  ):
+    super().__init__(
+      system,
+      SyncWorkerConfig(sites=config.sites, http_client=config.http_client),
+      checkpoint,
+    )
+    self._pipelined_config = config
+
+    self._logger = self._system.get_logger(__name__)
+
+    reject_batch(config.sites, "pipelined")
+
+  @override
+  def run(self) -> Generator[OutputJob, None, OutputMetadata]:
+    start = datetime.now(timezone.utc)
+
+    self._logger.info(f"Starting: {start}")
+
+    config = self._pipelined_config
+    cancelled = Event()
+
+    site_ctxs: Queue[Optional[SiteProcessingContext]] = Queue()
+    links: Queue[Optional[LinkProcessingContext]] = Queue(config.queue_size)
+    raws: Queue[Optional[Tuple[LinkProcessingContext, str]]] = Queue(
+      config.queue_size
+    )
+    scrapes: Queue[Optional[Tuple[LinkProcessingContext, OutputJobScrape]]] = (
+      Queue(config.queue_size)
+    )
+    jobs: Queue[Optional[OutputJob]] = Queue(config.queue_size)
+
+    stages = [
+      _Stage(
+        "list",
+        config.list_workers,
+        self._list_stage,
+        site_ctxs,
+        links,
+        config.scrape_workers,
+        cancelled,
+        self._logger,
+      ),
+      _Stage(
+        "scrape",
+        config.scrape_workers,
+        partial(self._scrape_stage, jobs),
+        links,
+        raws,
+        config.parse_workers,
+        cancelled,
+        self._logger,
+      ),
+      _Stage(
+        "parse",
+        config.parse_workers,
+        self._parse_stage,
+        raws,
+        scrapes,
+        config.enrich_workers,
+        cancelled,
+        self._logger,
+      ),
+      _Stage(
+        "enrich",
+        config.enrich_workers,
+        self._enrich_stage,
+        scrapes,
+        jobs,
+        1,
+        cancelled,
+        self._logger,
+      ),
+    ]
+
+    http_client = truffle_http_client.create(self._system, config.http_client)
+    limiters: Dict[str, RateLimiter] = {}
+    dedup = LinkDeduplicator()
+    near_duplicates = create_near_duplicates(self._system, config.sites)
+    sites = [
+      self._create_site(
+        name, site, http_client, limiters, dedup, near_duplicates
+      )
+      for name, site in config.sites.items()
+    ]
+    for site_ctx in sites:
+      site_ctxs.put(site_ctx)
+    for _ in range(config.list_workers):
+      site_ctxs.put(None)
+
+    for stage in stages:
+      stage.start()
+    finished = False
+    try:
+      while True:
+        job = jobs.get()
+        if job is None:
+          finished = True
+          break
+
+        yield job
+    finally:
+      if not finished:
+        cancelled.set()
+        while jobs.get() is not None:
+          pass
+      for stage in stages:
+        stage.join()
+      for site_ctx in sites:
+        self._close_site(site_ctx)
+      close_near_duplicates(near_duplicates)
+      http_client.close()
+
+    self._logger.info(f"Ending: {start}")
+
+    return self._metadata(start, sites, http_client, dedup, near_duplicates)
+
+  def _list_stage(
+    self, ctx: SiteProcessingContext
+  ) -> Iterable[LinkProcessingContext]:
+    self._logger.info(f"Processing site: '{ctx.name}'")
+
+    for page_ctx, links in self._pages(ctx):
+      for link in links:
+        yield LinkProcessingContext(page_ctx, link)
+
+  def _scrape_stage(
+    self, jobs: Queue[Optional[OutputJob]], ctx: LinkProcessingContext
+  ) -> Iterable[Tuple[LinkProcessingContext, str]]:
+    self._logger.info(f"Processing link: {ctx.link}")
+
+    if recall_link(ctx):
+      job = replay_link(ctx)
+      if job is not None:
+        jobs.put(job)
+      return
+
+    raw = self._scrape(ctx)
+    if raw is not None:
+      yield (ctx, raw)
+
+  def _parse_stage(
+    self, item: Tuple[LinkProcessingContext, str]
+  ) -> Iterable[Tuple[LinkProcessingContext, OutputJobScrape]]:
+    ctx, raw = item
+
+    scrape = parse_link(self._logger, ctx, raw)
+    if scrape is not None:
+      yield (ctx, scrape)
+
+  def _enrich_stage(
+    self, item: Tuple[LinkProcessingContext, OutputJobScrape]
+  ) -> Iterable[OutputJob]:
+    ctx, scrape = item
+
+    job = self._enrich(ctx, scrape)
+    if job is not None:
+      yield job
@@ -0,0 +1,114 @@
+import math
+import re
+from collections import Counter
+from dataclasses import replace
+from threading import Lock
+from typing import Dict, List
+
+from truffle_cli.logger.abstract import Logger
+from truffle_cli.system.abstract import System
+
+from .input import PreFilterConfig
+from .output import OutputJobScrape, OutputMetadataPreFilter
+
+
+class PreFilter:
+  _system: System
+  _config: PreFilterConfig
+  _logger: Logger
+  _lock: Lock
+  _metadata: OutputMetadataPreFilter
+  _include: List[re.Pattern[str]]
+  _exclude: List[re.Pattern[str]]
+  _cv: Counter[str]
+  _documents: int
+  _frequencies: Counter[str]
+
+  def __init__(self, system: System, config: PreFilterConfig, cv: str):
+    self._system = system
+    self._config = config
+
+    self._logger = self._system.get_logger(__name__)
+    self._lock = Lock()
+    self._metadata = OutputMetadataPreFilter()
+
+    self._include = [
+      re.compile(pattern, re.IGNORECASE) for pattern in self._config.include
+    ]
+    self._exclude = [
+      re.compile(pattern, re.IGNORECASE) for pattern in self._config.exclude
+    ]
+
+    # NOTE: document frequencies start with the cv and grow with every
+    # posting scored in this run so common words weigh less over time
+    # a posting is weighed only against the postings scored before it
+    # so its similarity depends on processing order and with concurrent
+    # workers the same posting can score slightly differently between runs
+    self._cv = _terms(cv)
+    self._documents = 1
+    self._frequencies = Counter(self._cv.keys())
+
+  def admit(self, link: str, scrape: OutputJobScrape) -> bool:
+    content = f"{scrape.title}\n{scrape.clean}"
+
+    for pattern in self._exclude:
+      if pattern.search(content):
+        self._reject(link, f"matches exclude '{pattern.pattern}'")
+        with self._lock:
+          self._metadata.excluded += 1
+        return False
+
+    if self._include and not any(
+      pattern.search(content) for pattern in self._include
+    ):
+      self._reject(link, "matches no include")
+      with self._lock:
+        self._metadata.unmatched += 1
+      return False
+
+    if self._config.threshold is not None:
+      similarity = self._similarity(_terms(content))
+      if similarity < self._config.threshold:
+        self._reject(link, f"similarity to cv is {similarity:.3f}")
+        with self._lock:
+          self._metadata.dissimilar += 1
+        return False
+
+    with self._lock:
+      self._metadata.passed += 1
+
+    return True
+
+  def metadata(self) -> OutputMetadataPreFilter:
+    with self._lock:
+      return replace(self._metadata)
+
+  def _similarity(self, terms: Counter[str]) -> float:
+    with self._lock:
+      cv = self._weights(self._cv)
+      posting = self._weights(terms)
+
+      self._documents += 1
+      self._frequencies.update(terms.keys())
+
+    dot = sum(weight * posting.get(term, 0) for term, weight in cv.items())
+    norm = math.sqrt(sum(weight**2 for weight in cv.values())) * math.sqrt(
+      sum(weight**2 for weight in posting.values())
+    )
+    if norm == 0:
+      return 0
+
+    return dot / norm
+
+  def _weights(self, terms: Counter[str]) -> Dict[str, float]:
+    return {term: count * self._idf(term) for term, count in terms.items()}
+
+  def _idf(self, term: str) -> float:
+    return math.log((1 + self._documents) / (1 + self._frequencies[term])) + 1
+
+  def _reject(self, link: str, reason: str) -> None:
+    self._logger.info(f"Filtering link '{link}' - {reason}")
+
+
+def _terms(content: str) -> Counter[str]:
+  return Counter(re.findall(r"\w{2,}", content.lower()))
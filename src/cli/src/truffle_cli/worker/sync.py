@@ -1,58 +1,117 @@
-import json
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Generator, override
+from typing import (
+  Deque,
+  Dict,
+  Generator,
+  Iterator,
+  List,
+  Optional,
+  Set,
+  Tuple,
+  override,
+)
 
+import truffle_cli.cache as truffle_cache
 import truffle_cli.html_processor as truffle_html_processor
 import truffle_cli.http_client as truffle_http_client
 import truffle_cli.llm_service as truffle_llm_service
 import truffle_cli.scraping_service as truffle_scraping_service
+from truffle_cli.cache.abstract import Cache
+from truffle_cli.checkpoint.abstract import Checkpoint
 from truffle_cli.html_processor.abstract import HtmlProcessor
-from truffle_cli.llm_service.abstract import LlmService
+from truffle_cli.http_client.abstract import HttpClient
+from truffle_cli.http_client.input import RateLimitConfig
+from truffle_cli.http_client.rate_limited import RateLimiter
+from truffle_cli.llm_service.abstract import BatchLlmService, LlmService
 from truffle_cli.logger.abstract import Logger
 from truffle_cli.scraping_service.abstract import ScrapingService
 from truffle_cli.system.abstract import System
 
 from .abstract import Worker
-from .input import SyncWorkerConfig, SyncWorkerSiteConfig
+from .common import (
+  admit_link,
+  cache_metadata,
+  canonical_links,
+  close_near_duplicates,
+  create_job,
+  create_near_duplicates,
+  dedup_metadata,
+  exhausted,
+  http_metadata,
+  incremental_metadata,
+  llm_usage_metadata,
+  near_duplicate_metadata,
+  page_range,
+  parse_link,
+  pending_links,
+  prefilter_metadata,
+  recall_link,
+  record_links,
+  replay_link,
+  resumed_links,
+  reuse_job,
+)
+from .dedup import LinkDeduplicator
+from .incremental import LinkIndex, LinkIndexEntry
+from .input import (
+  SyncWorkerConfig,
+  SyncWorkerSiteConfig,
+)
+from .near_duplicates import NearDuplicateIndex
 from .output import (
   OutputJob,
-  OutputJobEnrichment,
   OutputJobScrape,
-  OutputJobThinking,
   OutputMetadata,
 )
+from .prefilter import PreFilter
 
 
 @dataclass
-class _SiteProcessingContext:
+class SiteProcessingContext:
   name: str
   config: SyncWorkerSiteConfig
   scraping_service: ScrapingService
+  scraping_cache: Optional[Cache]
   html_processor: HtmlProcessor
   llm_service: LlmService
+  llm_cache: Optional[Cache]
+  index: Optional[LinkIndex]
+  near_duplicates: Optional[NearDuplicateIndex]
+  prefilter: Optional[PreFilter]
+  dedup: LinkDeduplicator
 
 
 @dataclass
-class _PageProcessingContext:
-  site: _SiteProcessingContext
+class PageProcessingContext:
+  site: SiteProcessingContext
   page: int
 
 
 @dataclass
-class _LinkProcessingContext:
-  page: _PageProcessingContext
+class LinkProcessingContext:
+  page: PageProcessingContext
   link: str
+  indexed: Optional[LinkIndexEntry] = None
 
 
 class SyncWorker(Worker):
   _system: System
   _config: SyncWorkerConfig
+  _checkpoint: Optional[Checkpoint]
   _logger: Logger
 
-  def __init__(self, system: System, config: SyncWorkerConfig):
+  def __init__(
+    self,
+    system: System,
+    config: SyncWorkerConfig,
+    checkpoint: Optional[Checkpoint],
+  ):
     self._system = system
     self._config = config
+    self._checkpoint = checkpoint
 
     self._logger = self._system.get_logger(__name__)
 
@@ -62,49 +121,295 @@ class SyncWorker(Worker):
 
     self._logger.info(f"Starting: {start}")
 
-    for name, site in self._config.sites.items():
-      http_client = truffle_http_client.create(self._system)
-      scraping_service = truffle_scraping_service.create(
-        self._system, site.scraping_service, http_client
+    http_client = truffle_http_client.create(
+      self._system, self._config.http_client
+    )
+    limiters: Dict[str, RateLimiter] = {}
+    dedup = LinkDeduplicator()
+    near_duplicates = create_near_duplicates(self._system, self._config.sites)
+    sites: List[SiteProcessingContext] = []
+    try:
+      for name, site in self._config.sites.items():
+        site_ctx = self._create_site(
+          name, site, http_client, limiters, dedup, near_duplicates
+        )
+        sites.append(site_ctx)
+
+        yield from self._process_site(site_ctx)
+    finally:
+      for site_ctx in sites:
+        self._close_site(site_ctx)
+      close_near_duplicates(near_duplicates)
+      http_client.close()
+
+    self._logger.info(f"Ending: {start}")
+
+    return self._metadata(start, sites, http_client, dedup, near_duplicates)
+
+  def _create_site(
+    self,
+    name: str,
+    site: SyncWorkerSiteConfig,
+    http_client: HttpClient,
+    limiters: Dict[str, RateLimiter],
+    dedup: LinkDeduplicator,
+    near_duplicates: Dict[str, NearDuplicateIndex],
+  ) -> SiteProcessingContext:
+    scraping_client = self._rate_limited(
+      http_client,
+      site.scraping_rate_limit,
+      site.scraping_service.base_url,
+      limiters,
+    )
+    scraping_service = truffle_scraping_service.create(
+      self._system, site.scraping_service, scraping_client
+    )
+    scraping_cache = None
+    if site.scraping_cache is not None:
+      scraping_cache = truffle_cache.create(
+        self._system, site.scraping_cache.cache
       )
-      html_processor = truffle_html_processor.create(
-        self._system, site.html_processor
+      scraping_service = truffle_scraping_service.create_cached(
+        self._system,
+        site.scraping_cache,
+        site.scraping_service,
+        scraping_service,
+        scraping_cache,
       )
-      llm_service = truffle_llm_service.create(
-        self._system, site.llm_service, http_client
+    html_processor = truffle_html_processor.create(
+      self._system, site.html_processor
+    )
+    llm_client = self._rate_limited(
+      http_client, site.llm_rate_limit, site.llm_service.base_url, limiters
+    )
+    llm_cache = None
+    if site.llm_cache is not None:
+      llm_cache = truffle_cache.create(self._system, site.llm_cache.cache)
+      llm_client = truffle_http_client.create_cached(
+        self._system, llm_client, llm_cache, site.llm_cache.ttl
       )
-
-      site_ctx = _SiteProcessingContext(
-        name, site, scraping_service, html_processor, llm_service
+    llm_service = truffle_llm_service.create(
+      self._system, site.llm_service, llm_client
+    )
+    index = None
+    if site.incremental is not None:
+      index = LinkIndex(
+        self._system,
+        site.incremental,
+        truffle_cache.create(self._system, site.incremental.cache),
       )
+    prefilter = None
+    if site.prefilter is not None:
+      prefilter = PreFilter(self._system, site.prefilter, site.llm_service.cv)
+
+    return SiteProcessingContext(
+      name,
+      site,
+      scraping_service,
+      scraping_cache,
+      html_processor,
+      llm_service,
+      llm_cache,
+      index,
+      near_duplicates.get(name),
+      prefilter,
+      dedup,
+    )
 
-      yield from self._process_site(site_ctx)
-
-    self._logger.info(f"Ending: {start}")
+  def _rate_limited(
+    self,
+    client: HttpClient,
+    config: Optional[RateLimitConfig],
+    base_url: str,
+    limiters: Dict[str, RateLimiter],
+  ) -> HttpClient:
+    if config is None:
+      return client
+
+    limiter = limiters.get(base_url)
+    if limiter is None:
+      limiter = RateLimiter(config)
+      limiters[base_url] = limiter
+
+    return truffle_http_client.create_rate_limited(
+      self._system, config, client, limiter
+    )
 
+  def _close_site(self, ctx: SiteProcessingContext) -> None:
+    if ctx.scraping_cache is not None:
+      ctx.scraping_cache.close()
+    if ctx.llm_cache is not None:
+      ctx.llm_cache.close()
+    if ctx.index is not None:
+      ctx.index.close()
+
+  def _metadata(
+    self,
+    start: datetime,
+    sites: List[SiteProcessingContext],
+    http_client: HttpClient,
+    dedup: LinkDeduplicator,
+    near_duplicates: Dict[str, NearDuplicateIndex],
+  ) -> OutputMetadata:
     end = datetime.now(timezone.utc)
 
-    metadata = OutputMetadata(start, end)
-
-    return metadata
+    return OutputMetadata(
+      start,
+      end,
+      scraping_cache=cache_metadata(
+        self._logger, "Scraping", [site.scraping_cache for site in sites]
+      ),
+      llm_cache=cache_metadata(
+        self._logger, "LLM", [site.llm_cache for site in sites]
+      ),
+      incremental=incremental_metadata(
+        self._logger, [site.index for site in sites]
+      ),
+      llm_usage=llm_usage_metadata(
+        self._logger, [site.llm_service for site in sites]
+      ),
+      http=http_metadata(self._logger, http_client.stats()),
+      dedup=dedup_metadata(self._logger, dedup),
+      near_duplicates=near_duplicate_metadata(self._logger, near_duplicates),
+      prefilter=prefilter_metadata(
+        self._logger, [site.prefilter for site in sites]
+      ),
+    )
 
-  def _process_site(self, ctx: _SiteProcessingContext) -> Generator[OutputJob]:
+  def _process_site(self, ctx: SiteProcessingContext) -> Generator[OutputJob]:
     self._logger.info(f"Processing site: '{ctx.name}'")
 
-    for page in range(
-      ctx.config.pagination.start,
-      ctx.config.pagination.stop,
-      ctx.config.pagination.step,
-    ):
-      page_ctx = _PageProcessingContext(ctx, page)
+    if isinstance(ctx.llm_service, BatchLlmService):
+      yield from self._process_site_batch(ctx, ctx.llm_service)
+      return
+
+    for page_ctx, links in self._pages(ctx):
+      yield from self._process_page(page_ctx, links)
+
+  def _process_site_batch(
+    self, ctx: SiteProcessingContext, llm_service: BatchLlmService
+  ) -> Generator[OutputJob]:
+    pending: List[Tuple[LinkProcessingContext, OutputJobScrape]] = []
+    for page_ctx, links in self._pages(ctx):
+      for link in links:
+        link_ctx = LinkProcessingContext(page_ctx, link)
+
+        self._logger.info(f"Processing link: {link_ctx.link}")
+
+        if recall_link(link_ctx):
+          job = replay_link(link_ctx)
+          if job is not None:
+            yield job
+          continue
+
+        raw = self._scrape(link_ctx)
+        if raw is None:
+          continue
+
+        scrape = parse_link(self._logger, link_ctx, raw)
+        if scrape is None or not admit_link(link_ctx, scrape):
+          continue
+
+        job = reuse_job(link_ctx, scrape)
+        if job is not None:
+          yield job
+          continue
+
+        pending.append((link_ctx, scrape))
+
+    if not pending:
+      return
+
+    self._logger.info(f"Enriching {len(pending)} links of site '{ctx.name}'")
+
+    try:
+      enrichments = llm_service.enrich_batch(
+        [scrape.clean for _, scrape in pending]
+      )
+    except Exception as error:
+      self._logger.err(
+        f"Enriching site '{ctx.name}' failed - '{error}'. Skipping..."
+      )
+      return
+
+    for (link_ctx, scrape), enriched in zip(pending, enrichments):
+      if isinstance(enriched, Exception):
+        self._logger.err(
+          f"Enriching link '{link_ctx.link}' failed - '{enriched}'. Skipping..."
+        )
+        continue
 
-      yield from self._process_page(page_ctx)
+      yield create_job(link_ctx, scrape, enriched)
 
   def _process_page(
-    self, ctx: _PageProcessingContext
+    self, ctx: PageProcessingContext, links: List[str]
   ) -> Generator[OutputJob, None, None]:
+    for link in links:
+      link_ctx = LinkProcessingContext(ctx, link)
+
+      yield from self._process_link(link_ctx)
+
+  def _pages(
+    self, ctx: SiteProcessingContext
+  ) -> Generator[Tuple[PageProcessingContext, List[str]], None, None]:
+    pages = iter(page_range(ctx.config.pagination))
+    prefetched: Deque[
+      Tuple[PageProcessingContext, Future[Optional[List[str]]]]
+    ] = deque()
+    seen: Set[str] = set()
+    with ThreadPoolExecutor(
+      max_workers=ctx.config.pagination.prefetch,
+      thread_name_prefix=f"truffle-{ctx.name}-page",
+    ) as pool:
+      try:
+        self._prefetch(ctx, pages, prefetched, pool)
+        while prefetched:
+          page_ctx, future = prefetched.popleft()
+          links = future.result()
+          if links is not None and exhausted(links, seen):
+            self._logger.info(
+              f"Stopping site '{ctx.name}' at page {page_ctx.page}"
+            )
+            return
+
+          self._prefetch(ctx, pages, prefetched, pool)
+          if links is None:
+            continue
+
+          seen.update(links)
+          yield (
+            page_ctx,
+            pending_links(self._checkpoint, ctx.name, ctx.dedup.unique(links)),
+          )
+      finally:
+        for _, future in prefetched:
+          future.cancel()
+
+  def _prefetch(
+    self,
+    ctx: SiteProcessingContext,
+    pages: Iterator[int],
+    prefetched: Deque[
+      Tuple[PageProcessingContext, Future[Optional[List[str]]]]
+    ],
+    pool: ThreadPoolExecutor,
+  ) -> None:
+    while len(prefetched) < ctx.config.pagination.prefetch:
+      page = next(pages, None)
+      if page is None:
+        return
+
+      page_ctx = PageProcessingContext(ctx, page)
+      prefetched.append((page_ctx, pool.submit(self._links, page_ctx)))
+
+  def _links(self, ctx: PageProcessingContext) -> Optional[List[str]]:
     page_url = str(ctx.site.config.pagination.template).format(ctx.page)
 
+    resumed = resumed_links(self._checkpoint, ctx.site.name, ctx.page)
+    if resumed is not None:
+      self._logger.info(f"Resuming page: '{page_url}'")
+      return resumed
+
     self._logger.info(f"Processing page: '{page_url}'")
 
     try:
@@ -113,84 +418,66 @@ class SyncWorker(Worker):
       self._logger.err(
         f"Scraping page '{page_url}' failed - '{error}'. Skipping..."
       )
-      return
-
-    links = ctx.site.html_processor.links(page_html)
+      return None
 
-    for link in links:
-      if link.startswith("/"):
-        link = (
-          str(ctx.site.config.base_url).removesuffix("/")
-          + "/"
-          + link.removeprefix("/")
-        )
+    links = canonical_links(self._logger, ctx, page_url, page_html)
+    if links is None:
+      return None
 
-      link_ctx = _LinkProcessingContext(ctx, link)
+    record_links(self._checkpoint, ctx.site.name, ctx.page, links)
 
-      yield from self._process_link(link_ctx)
+    return links
 
   def _process_link(
-    self, ctx: _LinkProcessingContext
+    self, ctx: LinkProcessingContext
   ) -> Generator[OutputJob, None, None]:
     self._logger.info(f"Processing link: {ctx.link}")
 
-    try:
-      raw = ctx.page.site.scraping_service.details(ctx.link)
-    except Exception as error:
-      self._logger.err(
-        f"Scraping link '{ctx.link}' failed - '{error}'. Skipping..."
-      )
+    if recall_link(ctx):
+      job = replay_link(ctx)
+      if job is not None:
+        yield job
       return
 
-    clean = ctx.page.site.html_processor.clean(raw)
-    clean_content = clean
+    raw = self._scrape(ctx)
+    if raw is None:
+      return
 
-    title = ctx.page.site.html_processor.clean(
-      ctx.page.site.html_processor.title(raw)
-    )
-    details = ctx.page.site.html_processor.clean(
-      ctx.page.site.html_processor.details(raw)
-    )
+    scrape = parse_link(self._logger, ctx, raw)
+    if scrape is None:
+      return
 
-    try:
-      extract = ctx.page.site.llm_service.extract(clean_content)
-      extract_content = (
-        f"Extracted data:\n{json.dumps(extract.reply, indent=True)}"
-      )
-    except Exception as error:
-      self._logger.err(
-        f"Extracting link '{ctx.link}' failed - '{error}'. Skipping..."
-      )
+    output = self._enrich(ctx, scrape)
+    if output is None:
       return
 
+    yield output
+
+  def _scrape(self, ctx: LinkProcessingContext) -> Optional[str]:
     try:
-      summary = ctx.page.site.llm_service.summarize(
-        clean_content, extract_content
-      )
-      summary_content = summary.reply
+      return ctx.page.site.scraping_service.details(ctx.link)
     except Exception as error:
       self._logger.err(
-        f"Summarizing link '{ctx.link}' failed - '{error}'. Skipping..."
+        f"Scraping link '{ctx.link}' failed - '{error}'. Skipping..."
       )
-      return
+      return None
+
+  def _enrich(
+    self, ctx: LinkProcessingContext, scrape: OutputJobScrape
+  ) -> Optional[OutputJob]:
+    if not admit_link(ctx, scrape):
+      return None
+
+    job = reuse_job(ctx, scrape)
+    if job is not None:
+      return job
 
     try:
-      score = ctx.page.site.llm_service.score(
-        clean_content, extract_content, summary_content
-      )
+      enriched = ctx.page.site.llm_service.enrich(scrape.clean)
     except Exception as error:
       self._logger.err(
-        f"Scoring link '{ctx.link}' failed - '{error}'. Skipping..."
+        f"Enriching link '{ctx.link}' failed - '{error}'. Skipping..."
       )
-      return
+      return None
 
-    scrape = OutputJobScrape(raw, clean_content, title, details)
-    enrichment = OutputJobEnrichment(extract.reply, summary.reply, score.reply)
-    thinking = OutputJobThinking(
-      extract.thinking, summary.thinking, score.thinking
-    )
-    output = OutputJob(
-      ctx.page.site.name, ctx.link, scrape, enrichment, thinking
-    )
-
-    yield output
+    return create_job(ctx, scrape, enriched)
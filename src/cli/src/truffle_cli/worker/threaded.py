@@ -0,0 +1,172 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from queue import Queue
+from threading import BoundedSemaphore, Event, Lock
+from typing import Dict, Generator, List, Optional, override
+
+import truffle_cli.http_client as truffle_http_client
+from truffle_cli.checkpoint.abstract import Checkpoint
+from truffle_cli.http_client.rate_limited import RateLimiter
+from truffle_cli.logger.abstract import Logger
+from truffle_cli.system.abstract import System
+
+from .common import (
+  close_near_duplicates,
+  create_near_duplicates,
+  reject_batch,
+)
+from .dedup import LinkDeduplicator
+from .input import SyncWorkerConfig, ThreadedWorkerConfig
+from .output import OutputJob, OutputMetadata
+from .sync import LinkProcessingContext, SiteProcessingContext, SyncWorker
+
+
+class _PendingCounter:
+  _lock: Lock
+  _count: int
+  _jobs: Queue[Optional[OutputJob]]
+
+  def __init__(self, count: int, jobs: Queue[Optional[OutputJob]]):
+    self._lock = Lock()
+    self._count = count
+    self._jobs = jobs
+
+    if self._count == 0:
+      self._jobs.put(None)
+
+  def add(self) -> None:
+    with self._lock:
+      self._count += 1
+
+  def done(self) -> None:
+    with self._lock:
+      self._count -= 1
+      if self._count == 0:
+        self._jobs.put(None)
+
+
+class ThreadedWorker(SyncWorker):
+  _threaded_config: ThreadedWorkerConfig
+  _logger: Logger
+
+  def __init__(
+    self,
+    system: System,
+    config: ThreadedWorkerConfig,
+    checkpoint: Optional[Checkpoint],
+  ):
+    super().__init__(
+      system,
+      SyncWorkerConfig(sites=config.sites, http_client=config.http_client),
+      checkpoint,
+    )
+    self._threaded_config = config
+
+    self._logger = self._system.get_logger(__name__)
+
+    reject_batch(config.sites, "threaded")
+
+  @override
+  def run(self) -> Generator[OutputJob, None, OutputMetadata]:
+    start = datetime.now(timezone.utc)
+
+    self._logger.info(f"Starting: {start}")
+
+    sites = self._threaded_config.sites
+    jobs: Queue[Optional[OutputJob]] = Queue()
+    pending = _PendingCounter(len(sites), jobs)
+    cancelled = Event()
+
+    link_pool = ThreadPoolExecutor(
+      max_workers=self._threaded_config.max_workers,
+      thread_name_prefix="truffle-link",
+    )
+    site_pool = ThreadPoolExecutor(
+      max_workers=max(len(sites), 1),
+      thread_name_prefix="truffle-site",
+    )
+    http_client = truffle_http_client.create(
+      self._system, self._threaded_config.http_client
+    )
+    limiters: Dict[str, RateLimiter] = {}
+    dedup = LinkDeduplicator()
+    near_duplicates = create_near_duplicates(self._system, sites)
+    site_ctxs: List[SiteProcessingContext] = []
+    try:
+      for name, site in sites.items():
+        site_ctx = self._create_site(
+          name, site, http_client, limiters, dedup, near_duplicates
+        )
+        site_ctxs.append(site_ctx)
+        site_pool.submit(
+          self._walk_site, site_ctx, link_pool, jobs, pending, cancelled
+        )
+
+      while True:
+        job = jobs.get()
+        if job is None:
+          break
+
+        yield job
+    finally:
+      cancelled.set()
+      site_pool.shutdown(wait=True)
+      link_pool.shutdown(wait=True)
+      for site_ctx in site_ctxs:
+        self._close_site(site_ctx)
+      close_near_duplicates(near_duplicates)
+      http_client.close()
+
+    self._logger.info(f"Ending: {start}")
+
+    return self._metadata(start, site_ctxs, http_client, dedup, near_duplicates)
+
+  def _walk_site(
+    self,
+    ctx: SiteProcessingContext,
+    link_pool: ThreadPoolExecutor,
+    jobs: Queue[Optional[OutputJob]],
+    pending: _PendingCounter,
+    cancelled: Event,
+  ) -> None:
+    self._logger.info(f"Processing site: '{ctx.name}'")
+
+    site_slots = BoundedSemaphore(self._threaded_config.max_site_workers)
+    try:
+      for page_ctx, links in self._pages(ctx):
+        if cancelled.is_set():
+          return
+
+        for link in links:
+          site_slots.acquire()
+          if cancelled.is_set():
+            site_slots.release()
+            return
+
+          link_ctx = LinkProcessingContext(page_ctx, link)
+          pending.add()
+          link_pool.submit(self._run_link, link_ctx, jobs, pending, site_slots)
+    except Exception as error:
+      self._logger.err(
+        f"Processing site '{ctx.name}' failed - '{error}'. Skipping..."
+      )
+    finally:
+      pending.done()
+
+  def _run_link(
+    self,
+    ctx: LinkProcessingContext,
+    jobs: Queue[Optional[OutputJob]],
+    pending: _PendingCounter,
+    site_slots: BoundedSemaphore,
+  ) -> None:
+    try:
+      for job in self._process_link(ctx):
+        jobs.put(job)
+    except Exception as error:
+      self._logger.err(
+        f"Processing link '{ctx.link}' failed - '{error}'. Skipping..."
+      )
+    finally:
+      site_slots.release()
+      pending.done()
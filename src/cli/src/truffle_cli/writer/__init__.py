@@ -1,34 +1,105 @@
 from dataclasses import dataclass
 from typing import Optional
 
+from truffle_cli.checkpoint.abstract import Checkpoint
 from truffle_cli.format import Format
 from truffle_cli.system.abstract import System
 
 from .abstract import Writer
+from .checkpoint import CheckpointWriter, CheckpointWriterConfig
 from .file import FileWriter, FileWriterConfig
+from .html import HtmlPolicy, HtmlPolicyWriter, HtmlPolicyWriterConfig
+from .jsonl import JsonlWriter, JsonlWriterConfig
+from .parquet import PARQUET_EXTENSIONS, ParquetWriter, ParquetWriterConfig
+from .sqlite import SQLITE_EXTENSIONS, SqliteWriter, SqliteWriterConfig
 from .stdout import StdoutWriter, StdoutWriterConfig
+from .threaded import ThreadedWriter, ThreadedWriterConfig
 
 
 @dataclass
 class WriterConfig:
   path: Optional[str]
   format: Format
+  flush_interval: float
+  queue_size: int
+  batch_size: int
+  raw: HtmlPolicy
+  clean: HtmlPolicy
+  html_dir: str
 
 
-def create(system: System, config: WriterConfig) -> Writer:
+def resumable(system: System, path: Optional[str]) -> bool:
+  if path is None:
+    return False
+
+  suffix = system.path_suffix(path).removeprefix(".")
+
+  return suffix not in SQLITE_EXTENSIONS and suffix not in PARQUET_EXTENSIONS
+
+
+def create(
+  system: System, config: WriterConfig, checkpoint: Optional[Checkpoint]
+) -> Writer:
+  offset = None
+  if checkpoint is not None:
+    if config.path is None or not resumable(system, config.path):
+      raise ValueError(f"Checkpointing output '{config.path}' is unsupported")
+    offset = checkpoint.offset()
+
+  writer = _create(system, config, offset)
+  if checkpoint is not None and config.path is not None:
+    writer = CheckpointWriter(
+      system,
+      writer,
+      checkpoint,
+      CheckpointWriterConfig(config.path, config.flush_interval),
+    )
+  if config.raw != HtmlPolicy.INLINE or config.clean != HtmlPolicy.INLINE:
+    writer = HtmlPolicyWriter(
+      system,
+      writer,
+      HtmlPolicyWriterConfig(config.raw, config.clean, config.html_dir),
+    )
+
+  if config.queue_size <= 0:
+    return writer
+
+  return ThreadedWriter(system, writer, ThreadedWriterConfig(config.queue_size))
+
+
+def _create(
+  system: System, config: WriterConfig, offset: Optional[int]
+) -> Writer:
   if config.path is not None:
     path = config.path
 
     suffix = system.path_suffix(path).removeprefix(".")
+    if suffix in SQLITE_EXTENSIONS:
+      return SqliteWriter(
+        system, SqliteWriterConfig(config.path, config.batch_size)
+      )
+
+    if suffix in PARQUET_EXTENSIONS:
+      return ParquetWriter(
+        system, ParquetWriterConfig(config.path, config.batch_size)
+      )
+
     if suffix in Format.TOML.extensions:
       format = Format.TOML
     elif suffix in Format.YAML.extensions:
       format = Format.YAML
     elif suffix in Format.JSON.extensions:
       format = Format.JSON
+    elif suffix in Format.JSONL.extensions:
+      format = Format.JSONL
     else:
       format = config.format
 
-    return FileWriter(system, FileWriterConfig(config.path, format))
+    if format == Format.JSONL:
+      return JsonlWriter(
+        system, JsonlWriterConfig(config.path, config.flush_interval, offset)
+      )
+
+    return FileWriter(system, FileWriterConfig(config.path, format, offset))
   else:
     return StdoutWriter(system, StdoutWriterConfig(config.format))
@@ -1,5 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from dataclasses import asdict, is_dataclass
+from typing import Any, Dict, Final, List, Tuple
+
+# NOTE: fields that only exist with some configurations
+# and are left out of the output instead of written as null
+OMITTED_IF_NONE: Final[List[str]] = ["raw_hash", "clean_hash"]
 
 
 class Writer(ABC):
@@ -10,3 +15,26 @@ class Writer(ABC):
   @abstractmethod
   def write_metadata(self, metadata: Any) -> None:
     pass
+
+  @abstractmethod
+  def sync(self) -> None:
+    pass
+
+  @abstractmethod
+  def close(self) -> None:
+    pass
+
+
+def serialize(obj: Any) -> Dict[str, Any]:
+  if is_dataclass(obj):
+    return asdict(obj, dict_factory=_omit_none)  # type: ignore
+
+  return obj.__dict__
+
+
+def _omit_none(items: List[Tuple[str, Any]]) -> Dict[str, Any]:
+  return {
+    key: value
+    for key, value in items
+    if value is not None or key not in OMITTED_IF_NONE
+  }
@@ -0,0 +1,73 @@
+import time
+from dataclasses import dataclass
+from typing import Any, List, Tuple, override
+
+from truffle_cli.checkpoint.abstract import Checkpoint
+from truffle_cli.system.abstract import System
+from truffle_cli.worker.output import OutputJob
+
+from .abstract import Writer
+
+
+@dataclass
+class CheckpointWriterConfig:
+  path: str
+  flush_interval: float
+
+
+class CheckpointWriter(Writer):
+  _system: System
+  _writer: Writer
+  _checkpoint: Checkpoint
+  _config: CheckpointWriterConfig
+  _jobs: List[Tuple[str, str]]
+  _flushed: float
+
+  def __init__(
+    self,
+    system: System,
+    writer: Writer,
+    checkpoint: Checkpoint,
+    config: CheckpointWriterConfig,
+  ):
+    self._system = system
+    self._writer = writer
+    self._checkpoint = checkpoint
+    self._config = config
+
+    self._jobs = []
+    self._flushed = time.monotonic()
+
+  @override
+  def write_job(self, job: Any) -> None:
+    self._writer.write_job(job)
+
+    if isinstance(job, OutputJob):
+      self._jobs.append((job.site, job.link))
+
+    if time.monotonic() - self._flushed >= self._config.flush_interval:
+      self.sync()
+
+  @override
+  def write_metadata(self, metadata: Any) -> None:
+    self._writer.write_metadata(metadata)
+    self._writer.sync()
+
+    self._checkpoint.finish()
+
+  @override
+  def sync(self) -> None:
+    self._writer.sync()
+
+    if self._jobs:
+      self._checkpoint.written(
+        self._system.file_size(self._config.path), self._jobs
+      )
+      self._jobs = []
+    self._flushed = time.monotonic()
+
+  @override
+  def close(self) -> None:
+    self.sync()
+
+    self._writer.close()
@@ -1,7 +1,7 @@
 import json
 import textwrap
-from dataclasses import asdict, dataclass, is_dataclass
-from typing import Any, override
+from dataclasses import dataclass
+from typing import Any, Optional, override
 
 import tomlkit
 import yaml
@@ -9,13 +9,14 @@ import yaml
 from truffle_cli.format import Format
 from truffle_cli.system.abstract import System
 
-from .abstract import Writer
+from .abstract import Writer, serialize
 
 
 @dataclass
 class FileWriterConfig:
   path: str
   format: Format
+  offset: Optional[int]
 
 
 class FileWriter(Writer):
@@ -26,6 +27,10 @@ class FileWriter(Writer):
     self._system = system
     self._config = config
 
+    if self._config.offset is not None:
+      self._system.truncate_file(self._config.path, self._config.offset)
+      return
+
     self._system.clear_file(self._config.path)
     if self._config.format == Format.YAML:
       self._system.append_file(self._config.path, "output:\n")
@@ -40,8 +45,16 @@ class FileWriter(Writer):
   def write_metadata(self, metadata: Any) -> None:
     self._write_last(metadata)
 
+  @override
+  def sync(self) -> None:
+    self._system.sync_file(self._config.path)
+
+  @override
+  def close(self) -> None:
+    pass
+
   def _write(self, obj: Any) -> None:
-    obj = asdict(obj) if is_dataclass(obj) else obj.__dict__  # type: ignore
+    obj = serialize(obj)
 
     if self._config.format == Format.TOML:
       dump = tomlkit.dumps(obj)
@@ -53,12 +66,12 @@ class FileWriter(Writer):
       content = f"  - {content[4:]}\n"
       self._system.append_file(self._config.path, content)
     elif self._config.format == Format.JSON:
-      dump = json.dumps(obj)
+      dump = json.dumps(obj, default=str)
       content = f"{dump},"
       self._system.append_file(self._config.path, content)
 
   def _write_last(self, obj: Any) -> None:
-    obj = asdict(obj) if is_dataclass(obj) else obj.__dict__  # type: ignore
+    obj = serialize(obj)
 
     if self._config.format == Format.TOML:
       dump = tomlkit.dumps(obj)
@@ -70,6 +83,6 @@ class FileWriter(Writer):
       content = f"  - {content[4:]}"
       self._system.append_file(self._config.path, content)
     elif self._config.format == Format.JSON:
-      dump = json.dumps(obj)
+      dump = json.dumps(obj, default=str)
       content = f"{dump}]}}"
       self._system.append_file(self._config.path, content)
@@ -0,0 +1,92 @@
+import hashlib
+from dataclasses import dataclass, replace
+from enum import Enum
+from typing import Any, Optional, Tuple, override
+
+from truffle_cli.logger.abstract import Logger
+from truffle_cli.system.abstract import System
+from truffle_cli.worker.output import OutputJob
+
+from .abstract import Writer
+
+
+class HtmlPolicy(str, Enum):
+  DROP = "drop"
+  STORE = "store"
+  INLINE = "inline"
+
+
+@dataclass
+class HtmlPolicyWriterConfig:
+  raw: HtmlPolicy
+  clean: HtmlPolicy
+  dir: str
+
+
+class HtmlPolicyWriter(Writer):
+  _system: System
+  _logger: Logger
+  _writer: Writer
+  _config: HtmlPolicyWriterConfig
+
+  def __init__(
+    self, system: System, writer: Writer, config: HtmlPolicyWriterConfig
+  ):
+    self._system = system
+    self._writer = writer
+    self._config = config
+
+    self._logger = self._system.get_logger(__name__)
+
+  @override
+  def write_job(self, job: Any) -> None:
+    if isinstance(job, OutputJob):
+      raw, raw_hash = self._apply(self._config.raw, job.scrape.raw)
+      clean, clean_hash = self._apply(self._config.clean, job.scrape.clean)
+      job = replace(
+        job,
+        scrape=replace(
+          job.scrape,
+          raw=raw,
+          raw_hash=raw_hash,
+          clean=clean,
+          clean_hash=clean_hash,
+        ),
+      )
+
+    self._writer.write_job(job)
+
+  @override
+  def write_metadata(self, metadata: Any) -> None:
+    self._writer.write_metadata(metadata)
+
+  @override
+  def sync(self) -> None:
+    self._writer.sync()
+
+  @override
+  def close(self) -> None:
+    self._writer.close()
+
+  def _apply(self, policy: HtmlPolicy, html: str) -> Tuple[str, Optional[str]]:
+    if policy == HtmlPolicy.DROP:
+      return "", None
+    elif policy == HtmlPolicy.STORE:
+      return "", self._store(html)
+
+    return html, None
+
+  def _store(self, html: str) -> str:
+    hash = hashlib.sha256(html.encode()).hexdigest()
+
+    directory = self._system.path_join(self._config.dir, hash[:2])
+    path = self._system.path_join(directory, f"{hash}.html.gz")
+    if self._system.path_exists(path):
+      return hash
+
+    self._system.create_dir(directory)
+    self._system.write_compressed_file(path, html)
+
+    self._logger.trace(f"Stored html: '{path}'")
+
+    return hash
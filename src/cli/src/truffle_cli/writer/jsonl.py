@@ -0,0 +1,76 @@
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Optional, TextIO, override
+
+from truffle_cli.system.abstract import System
+
+from .abstract import Writer, serialize
+
+
+@dataclass
+class JsonlWriterConfig:
+  path: str
+  flush_interval: float
+  offset: Optional[int]
+
+
+class JsonlWriter(Writer):
+  _system: System
+  _config: JsonlWriterConfig
+  _file: Optional[TextIO]
+  _flushed: float
+
+  def __init__(self, system: System, config: JsonlWriterConfig):
+    self._system = system
+    self._config = config
+
+    if self._config.offset is not None:
+      self._system.truncate_file(self._config.path, self._config.offset)
+    else:
+      self._system.clear_file(self._config.path)
+    self._file = self._system.open_file(self._config.path)
+    self._flushed = time.monotonic()
+
+  @override
+  def write_job(self, job: Any) -> None:
+    self._write(job)
+
+    now = time.monotonic()
+    if now - self._flushed >= self._config.flush_interval:
+      self._flush(now)
+
+  @override
+  def write_metadata(self, metadata: Any) -> None:
+    self._write(metadata)
+
+    if self._file is not None:
+      self._file.close()
+      self._file = None
+
+  @override
+  def sync(self) -> None:
+    if self._file is not None:
+      self._flush(time.monotonic())
+
+    self._system.sync_file(self._config.path)
+
+  @override
+  def close(self) -> None:
+    if self._file is not None:
+      self._file.close()
+      self._file = None
+
+  def _write(self, obj: Any) -> None:
+    if self._file is None:
+      raise ValueError(f"Output file '{self._config.path}' is closed")
+
+    obj = serialize(obj)
+    self._file.write(f"{json.dumps(obj, default=str)}\n")
+
+  def _flush(self, now: float) -> None:
+    if self._file is None:
+      return
+
+    self._file.flush()
+    self._flushed = now
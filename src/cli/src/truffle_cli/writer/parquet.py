@@ -0,0 +1,138 @@
+import json
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Final, List, Optional, override
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from truffle_cli.logger.abstract import Logger
+from truffle_cli.system.abstract import System
+from truffle_cli.worker.output import OutputJob, OutputMetadata
+
+from .abstract import Writer
+
+PARQUET_EXTENSIONS: Final[List[str]] = ["parquet"]
+
+PARQUET_SCHEMA: Final[pa.Schema] = pa.schema(
+  [
+    pa.field("site", pa.dictionary(pa.int32(), pa.string()), nullable=False),
+    pa.field("link", pa.string(), nullable=False),
+    pa.field("scrape_raw", pa.string(), nullable=False),
+    pa.field("scrape_clean", pa.string(), nullable=False),
+    pa.field("scrape_title", pa.string(), nullable=False),
+    pa.field("scrape_content", pa.string(), nullable=False),
+    pa.field("scrape_raw_hash", pa.string()),
+    pa.field("scrape_clean_hash", pa.string()),
+    pa.field("enrichment_extract", pa.string(), nullable=False),
+    pa.field("enrichment_summary", pa.string(), nullable=False),
+    pa.field("enrichment_score", pa.float64(), nullable=False),
+    pa.field("thinking_extract", pa.string()),
+    pa.field("thinking_summary", pa.string()),
+    pa.field("thinking_score", pa.string()),
+  ]
+)
+
+
+@dataclass
+class ParquetWriterConfig:
+  path: str
+  row_group_size: int
+
+
+class ParquetWriter(Writer):
+  _config: ParquetWriterConfig
+  _system: System
+  _logger: Logger
+  _writer: Optional[pq.ParquetWriter]
+  _rows: Dict[str, List[Any]]
+
+  def __init__(self, system: System, config: ParquetWriterConfig):
+    self._config = config
+    self._system = system
+
+    self._logger = self._system.get_logger(__name__)
+
+    self._system.create_dir(self._system.path_parent(self._config.path))
+
+    self._writer = pq.ParquetWriter(
+      self._config.path,
+      PARQUET_SCHEMA,
+      compression="zstd",
+    )
+    self._rows = _rows()
+
+  @override
+  def write_job(self, job: Any) -> None:
+    if not isinstance(job, OutputJob):
+      raise ValueError(f"Unsupported parquet output '{type(job).__name__}'")
+
+    self._rows["site"].append(job.site)
+    self._rows["link"].append(job.link)
+    self._rows["scrape_raw"].append(job.scrape.raw)
+    self._rows["scrape_clean"].append(job.scrape.clean)
+    self._rows["scrape_title"].append(job.scrape.title)
+    self._rows["scrape_content"].append(job.scrape.content)
+    self._rows["scrape_raw_hash"].append(job.scrape.raw_hash)
+    self._rows["scrape_clean_hash"].append(job.scrape.clean_hash)
+    self._rows["enrichment_extract"].append(json.dumps(job.enrichment.extract))
+    self._rows["enrichment_summary"].append(job.enrichment.summary)
+    self._rows["enrichment_score"].append(float(job.enrichment.score))
+    self._rows["thinking_extract"].append(job.thinking.extract)
+    self._rows["thinking_summary"].append(job.thinking.summary)
+    self._rows["thinking_score"].append(job.thinking.score)
+
+    if len(self._rows["link"]) >= self._config.row_group_size:
+      self._flush()
+
+  @override
+  def write_metadata(self, metadata: Any) -> None:
+    if not isinstance(metadata, OutputMetadata):
+      raise ValueError(
+        f"Unsupported parquet output '{type(metadata).__name__}'"
+      )
+
+    writer = self._open()
+    self._flush()
+    writer.add_key_value_metadata(
+      {"truffle": json.dumps(asdict(metadata), default=str)}
+    )
+    writer.close()
+    self._writer = None
+
+  @override
+  def sync(self) -> None:
+    if self._writer is not None:
+      self._flush()
+
+    self._system.sync_file(self._config.path)
+
+  # NOTE: closing without metadata still writes the footer
+  # so the jobs written before an interrupted run stay readable
+  @override
+  def close(self) -> None:
+    if self._writer is None:
+      return
+
+    self._flush()
+    self._writer.close()
+    self._writer = None
+
+  def _open(self) -> pq.ParquetWriter:
+    if self._writer is None:
+      raise ValueError(f"Output file '{self._config.path}' is closed")
+
+    return self._writer
+
+  def _flush(self) -> None:
+    if not self._rows["link"]:
+      return
+
+    table = pa.Table.from_pydict(self._rows, schema=PARQUET_SCHEMA)
+    self._open().write_table(table)
+
+    self._logger.trace(f"Wrote row group of {table.num_rows} jobs")
+    self._rows = _rows()
+
+
+def _rows() -> Dict[str, List[Any]]:
+  return {name: [] for name in PARQUET_SCHEMA.names}
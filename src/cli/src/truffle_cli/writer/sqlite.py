@@ -0,0 +1,190 @@
+import json
+import sqlite3
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Final, List, Optional, Tuple, override
+
+from truffle_cli.logger.abstract import Logger
+from truffle_cli.system.abstract import System
+from truffle_cli.worker.output import OutputJob, OutputMetadata
+
+from .abstract import Writer
+
+SQLITE_EXTENSIONS: Final[List[str]] = ["db", "sqlite"]
+
+
+@dataclass
+class SqliteWriterConfig:
+  path: str
+  batch_size: int
+
+
+class SqliteWriter(Writer):
+  _config: SqliteWriterConfig
+  _system: System
+  _logger: Logger
+  _connection: Optional[sqlite3.Connection]
+  _run: int
+  _pending: int
+
+  def __init__(self, system: System, config: SqliteWriterConfig):
+    self._config = config
+    self._system = system
+
+    self._logger = self._system.get_logger(__name__)
+
+    self._system.create_dir(self._system.path_parent(self._config.path))
+
+    self._connection = sqlite3.connect(
+      self._config.path, timeout=30, check_same_thread=False
+    )
+    self._connection.execute("PRAGMA foreign_keys=ON")
+    self._connection.execute(
+      "CREATE TABLE IF NOT EXISTS runs ("
+      " id INTEGER PRIMARY KEY,"
+      " start TEXT NOT NULL,"
+      " end TEXT,"
+      " metadata TEXT"
+      ")"
+    )
+    self._connection.execute(
+      "CREATE TABLE IF NOT EXISTS jobs ("
+      " id INTEGER PRIMARY KEY,"
+      " run INTEGER NOT NULL REFERENCES runs (id),"
+      " site TEXT NOT NULL,"
+      " link TEXT NOT NULL,"
+      " title TEXT NOT NULL,"
+      " score REAL NOT NULL,"
+      " date TEXT,"
+      " location TEXT,"
+      " summary TEXT NOT NULL,"
+      " content TEXT NOT NULL,"
+      " extract TEXT NOT NULL,"
+      " thinking TEXT NOT NULL"
+      ")"
+    )
+    self._connection.execute(
+      "CREATE TABLE IF NOT EXISTS html ("
+      " job INTEGER PRIMARY KEY REFERENCES jobs (id),"
+      " raw TEXT NOT NULL,"
+      " clean TEXT NOT NULL,"
+      " raw_hash TEXT,"
+      " clean_hash TEXT"
+      ")"
+    )
+    for column in ["run", "site", "link", "score", "date", "location"]:
+      self._connection.execute(
+        f"CREATE INDEX IF NOT EXISTS jobs_{column} ON jobs ({column})"
+      )
+
+    cursor = self._connection.execute(
+      "INSERT INTO runs (start) VALUES (datetime('now'))"
+    )
+    self._run = cursor.lastrowid or 0
+    self._connection.commit()
+
+    self._pending = 0
+
+  @override
+  def write_job(self, job: Any) -> None:
+    if not isinstance(job, OutputJob):
+      raise ValueError(f"Unsupported sqlite output '{type(job).__name__}'")
+
+    connection = self._connect()
+    date, location = _extracted(job.enrichment.extract)
+    cursor = connection.execute(
+      "INSERT INTO jobs ("
+      " run, site, link, title, score, date, location,"
+      " summary, content, extract, thinking"
+      ") VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+      (
+        self._run,
+        job.site,
+        job.link,
+        job.scrape.title,
+        job.enrichment.score,
+        date,
+        location,
+        job.enrichment.summary,
+        job.scrape.content,
+        json.dumps(job.enrichment.extract),
+        json.dumps(asdict(job.thinking)),
+      ),
+    )
+    connection.execute(
+      "INSERT INTO html (job, raw, clean, raw_hash, clean_hash)"
+      " VALUES (?, ?, ?, ?, ?)",
+      (
+        cursor.lastrowid,
+        job.scrape.raw,
+        job.scrape.clean,
+        job.scrape.raw_hash,
+        job.scrape.clean_hash,
+      ),
+    )
+
+    self._pending += 1
+    if self._pending >= self._config.batch_size:
+      self._commit()
+
+  @override
+  def write_metadata(self, metadata: Any) -> None:
+    if not isinstance(metadata, OutputMetadata):
+      raise ValueError(f"Unsupported sqlite output '{type(metadata).__name__}'")
+
+    connection = self._connect()
+    connection.execute(
+      "UPDATE runs SET start = ?, end = ?, metadata = ? WHERE id = ?",
+      (
+        metadata.start.isoformat(),
+        metadata.end.isoformat(),
+        json.dumps(asdict(metadata), default=str),
+        self._run,
+      ),
+    )
+    self._commit()
+
+    connection.close()
+    self._connection = None
+
+  @override
+  def sync(self) -> None:
+    if self._connection is not None:
+      self._commit()
+
+  @override
+  def close(self) -> None:
+    if self._connection is None:
+      return
+
+    self._commit()
+    self._connection.close()
+    self._connection = None
+
+  def _connect(self) -> sqlite3.Connection:
+    if self._connection is None:
+      raise ValueError(f"Output database '{self._config.path}' is closed")
+
+    return self._connection
+
+  def _commit(self) -> None:
+    started = time.monotonic()
+    self._connect().commit()
+
+    self._logger.trace(
+      f"Committed {self._pending} jobs in {time.monotonic() - started:.3f}s"
+    )
+    self._pending = 0
+
+
+def _extracted(extract: Any) -> Tuple[Optional[str], Optional[str]]:
+  if not isinstance(extract, dict):
+    return None, None
+
+  date = extract.get("date")
+  location = extract.get("location")
+
+  return (
+    None if date is None else str(date),
+    None if location is None else str(location),
+  )
@@ -1,5 +1,5 @@
 import json
-from dataclasses import asdict, dataclass, is_dataclass
+from dataclasses import dataclass
 from typing import Any, override
 
 import tomlkit
@@ -8,7 +8,7 @@ import yaml
 from truffle_cli.format import Format
 from truffle_cli.system.abstract import System
 
-from .abstract import Writer
+from .abstract import Writer, serialize
 
 
 @dataclass
@@ -32,8 +32,16 @@ class StdoutWriter(Writer):
   def write_metadata(self, metadata: Any) -> None:
     self._write(metadata)
 
+  @override
+  def sync(self) -> None:
+    pass
+
+  @override
+  def close(self) -> None:
+    pass
+
   def _write(self, obj: Any) -> None:
-    obj = asdict(obj) if is_dataclass(obj) else obj.__dict__  # type: ignore
+    obj = serialize(obj)
 
     if self._config.format == Format.TOML:
       dump = tomlkit.dumps(obj)
@@ -43,7 +51,7 @@ class StdoutWriter(Writer):
       dump = yaml.safe_dump(obj)
       content = f"{dump}\n---\n"
       self._system.write_stdout(content)
-    elif self._config.format == Format.JSON:
-      dump = json.dumps(obj)
+    elif self._config.format in [Format.JSON, Format.JSONL]:
+      dump = json.dumps(obj, default=str)
       content = f"{dump}\n"
       self._system.write_stdout(content)
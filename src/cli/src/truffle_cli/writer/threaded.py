@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+from queue import Queue
+from threading import Thread
+from typing import Any, Optional, Tuple, override
+
+from truffle_cli.logger.abstract import Logger
+from truffle_cli.system.abstract import System
+
+from .abstract import Writer
+
+
+@dataclass
+class ThreadedWriterConfig:
+  queue_size: int
+
+
+class ThreadedWriter(Writer):
+  _system: System
+  _logger: Logger
+  _writer: Writer
+  _queue: Queue[Optional[Tuple[bool, Any]]]
+  _thread: Thread
+  _error: Optional[BaseException]
+
+  def __init__(
+    self, system: System, writer: Writer, config: ThreadedWriterConfig
+  ):
+    self._system = system
+    self._writer = writer
+
+    self._logger = self._system.get_logger(__name__)
+
+    self._queue = Queue(config.queue_size)
+    self._error = None
+    self._thread = Thread(target=self._work, name="truffle-writer")
+    self._thread.start()
+
+  @override
+  def write_job(self, job: Any) -> None:
+    self._raise()
+    self._queue.put((False, job))
+
+  @override
+  def write_metadata(self, metadata: Any) -> None:
+    self._raise()
+    self._queue.put((True, metadata))
+    self._queue.put(None)
+    self._thread.join()
+    self._raise()
+
+    self._writer.sync()
+
+  @override
+  def sync(self) -> None:
+    self._queue.join()
+    self._raise()
+
+    self._writer.sync()
+
+  @override
+  def close(self) -> None:
+    if self._thread.is_alive():
+      self._queue.put(None)
+      self._thread.join()
+
+    self._writer.close()
+    self._raise()
+
+  def _work(self) -> None:
+    while True:
+      item = self._queue.get()
+      try:
+        if item is None:
+          return
+
+        if self._error is not None:
+          continue
+
+        metadata, obj = item
+        try:
+          if metadata:
+            self._writer.write_metadata(obj)
+          else:
+            self._writer.write_job(obj)
+        except BaseException as error:
+          self._logger.err(f"Writing output failed - '{error}'")
+          self._error = error
+      finally:
+        self._queue.task_done()
+
+  def _raise(self) -> None:
+    if self._error is not None:
+      raise self._error
@@ -0,0 +1,108 @@
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from bs4 import BeautifulSoup, Comment
+from truffle_cli.html_processor.beautiful_soup import BeautifulSoupHtmlProcessor
+from truffle_cli.html_processor.common import (
+  ALLOWED_ATTRS,
+  ALLOWED_TAGS,
+  DISALLOWED_SELECTORS,
+  DISALLOWED_TAGS,
+  collapse,
+)
+from truffle_cli.html_processor.input import BeautifulSoupHtmlProcessorConfig
+
+from .test_html_processor import PAGES
+from .test_system import TestSystem
+
+# NOTE: usage: python -m truffle_cli_tests.bench_html_processor [paths...]
+# paths can be html files, directories of html files
+# or a sqlite scraping cache with captured pages
+
+
+def _pages(paths: List[str]) -> List[str]:
+  pages = []
+  for path in map(Path, paths):
+    if path.is_dir():
+      pages.extend(file.read_text() for file in sorted(path.rglob("*.html")))
+    elif path.suffix == ".sqlite":
+      with sqlite3.connect(path) as connection:
+        pages.extend(
+          value for (value,) in connection.execute("SELECT value FROM entries")
+        )
+    else:
+      pages.append(path.read_text())
+
+  return pages or PAGES
+
+
+# NOTE: the multi pass clean the single walk replaced
+def _baseline_clean(html: str) -> str:
+  soup = BeautifulSoup(html, "html.parser")
+
+  for element in soup(DISALLOWED_TAGS):
+    element.decompose()
+
+  for selector in DISALLOWED_SELECTORS:
+    for element in soup.select(selector):
+      element.decompose()
+
+  for tag in soup.find_all():
+    if tag.name not in ALLOWED_TAGS:  # type: ignore
+      tag.unwrap()  # type: ignore
+
+  for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
+    comment.extract()
+
+  for tag in soup.find_all():
+    if tag.get_text(strip=True) == "":
+      tag.decompose()
+
+  for tag in soup.find_all():
+    if hasattr(tag, "attrs"):
+      tag.attrs = {  # type: ignore
+        k: v
+        for k, v in tag.attrs.items()  # type: ignore
+        if k in ALLOWED_ATTRS  # type: ignore
+      }
+
+  return collapse(str(soup))
+
+
+def _time(name: str, pages: List[str], clean: Callable[[str], str]) -> None:
+  start = time.perf_counter()
+  for page in pages:
+    clean(page)
+  elapsed = time.perf_counter() - start
+
+  print(f"{name}: {elapsed:.2f}s, {elapsed / len(pages) * 1000:.1f}ms per page")
+
+
+def main(paths: List[str]) -> None:
+  pages = _pages(paths)
+  size = sum(len(page) for page in pages)
+  processor = BeautifulSoupHtmlProcessor(
+    TestSystem([], {}, {}),
+    BeautifulSoupHtmlProcessorConfig(
+      link_selector="a[href]",
+      title_selector="h1",
+      details_selector="main",
+    ),
+  )
+
+  print(f"{len(pages)} pages, {size // 1024} KiB")
+
+  mismatched = sum(
+    _baseline_clean(page) != processor.clean(page) for page in pages
+  )
+  print(f"{mismatched} pages cleaned differently")
+
+  _time("baseline clean", pages, _baseline_clean)
+  _time("clean", pages, processor.clean)
+
+
+if __name__ == "__main__":
+  main(sys.argv[1:])
@@ -0,0 +1,82 @@
+from pathlib import Path
+
+from truffle_cli.cache.input import SqliteCacheConfig
+from truffle_cli.cache.sqlite import SqliteCache
+
+from .test_system import TestSystem
+
+
+def test_sqlite_cache_expires_entries(test_system: TestSystem, tmp_path: Path):
+  cache = SqliteCache(
+    test_system, SqliteCacheConfig(str(tmp_path / "cache.sqlite"), 1024)
+  )
+
+  cache.set("key", "value")
+
+  assert cache.get("key") == "value"
+  assert cache.get("key", ttl=0) is None
+  assert cache.get("key") is None
+  assert cache.stats().hits == 1
+  assert cache.stats().misses == 2
+
+  cache.close()
+
+
+def test_sqlite_cache_evicts_least_recently_used(
+  test_system: TestSystem, tmp_path: Path
+):
+  cache = SqliteCache(
+    test_system, SqliteCacheConfig(str(tmp_path / "cache.sqlite"), 25)
+  )
+
+  cache.set("first", "x" * 10)
+  cache.set("second", "y" * 10)
+  cache.get("first")
+  cache.set("third", "z" * 10)
+
+  assert cache.get("first") == "x" * 10
+  assert cache.get("second") is None
+  assert cache.get("third") == "z" * 10
+  assert cache.stats().evictions == 1
+
+  cache.close()
+
+
+def test_sqlite_cache_persists_batched_access_times(
+  test_system: TestSystem, tmp_path: Path
+):
+  path = str(tmp_path / "cache.sqlite")
+  cache = SqliteCache(test_system, SqliteCacheConfig(path, 25))
+  cache.set("first", "x" * 10)
+  cache.set("second", "y" * 10)
+  cache.get("first")
+  cache.close()
+
+  cache = SqliteCache(test_system, SqliteCacheConfig(path, 25))
+  cache.set("third", "z" * 10)
+
+  assert cache.get("first") == "x" * 10
+  assert cache.get("second") is None
+  assert cache.stats().evictions == 1
+
+  cache.close()
+
+
+def test_sqlite_cache_lists_and_deletes_keys(
+  test_system: TestSystem, tmp_path: Path
+):
+  cache = SqliteCache(
+    test_system, SqliteCacheConfig(str(tmp_path / "cache.sqlite"), 1024)
+  )
+
+  cache.set("band:1:a", "a")
+  cache.set("band:1:b", "b")
+  cache.set("band:12:c", "c")
+  cache.delete("band:1:a")
+  cache.delete("band:1:missing")
+
+  assert cache.keys("band:1:") == ["band:1:b"]
+  assert sorted(cache.keys("band:")) == ["band:12:c", "band:1:b"]
+  assert cache.get("band:1:a") is None
+
+  cache.close()
@@ -0,0 +1,81 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+from truffle_cli.checkpoint.file import FileCheckpoint
+from truffle_cli.checkpoint.input import FileCheckpointConfig
+from truffle_cli.format import Format
+from truffle_cli.worker.output import OutputMetadata
+from truffle_cli.writer import create
+
+from .test_system import TestSystem
+from .test_writer import _job, _writer_config
+
+
+@pytest.mark.parametrize("path", ["/out.json", "/out.yaml", "/out.jsonl"])
+def test_checkpoint_resumes_output(test_system: TestSystem, path: str):
+  checkpoint = FileCheckpoint(
+    test_system, FileCheckpointConfig("/out.checkpoint", path, False)
+  )
+  checkpoint.listed("jobs", 1, ["https://jobs.example/1"])
+  checkpoint.listed(
+    "jobs", 2, ["https://jobs.example/2", "https://jobs.example/3"]
+  )
+  config = _writer_config(path, Format.JSON, 0, 0, 1)
+  writer = create(test_system, config, checkpoint)
+  writer.write_job(_job("https://jobs.example/1", 1))
+  writer.write_job(_job("https://jobs.example/2", 2))
+  test_system.files[path] += '{"link": "https://jobs.example/3"'
+
+  checkpoint = FileCheckpoint(
+    test_system, FileCheckpointConfig("/out.checkpoint", path, True)
+  )
+  assert checkpoint.links("jobs", 1) == ["https://jobs.example/1"]
+  assert checkpoint.pending("jobs", checkpoint.links("jobs", 2) or []) == [
+    "https://jobs.example/3"
+  ]
+  writer = create(test_system, config, checkpoint)
+  writer.write_job(_job("https://jobs.example/3", 3))
+  now = datetime.now(timezone.utc)
+  writer.write_metadata(OutputMetadata(now, now))
+
+  output = Format.from_suffix(path[path.rindex(".") :]).deserialize(
+    test_system.files[path]
+  )
+  if isinstance(output, dict):
+    output = output["output"]
+  assert [item.get("link") for item in output] == [
+    "https://jobs.example/1",
+    "https://jobs.example/2",
+    "https://jobs.example/3",
+    None,
+  ]
+  assert "/out.checkpoint" not in test_system.files
+
+
+def test_checkpoint_refuses_to_resume_finished_output(test_system: TestSystem):
+  test_system.files["/out.jsonl"] = '{"link": "https://jobs.example/1"}\n'
+
+  with pytest.raises(ValueError, match="not found but output"):
+    FileCheckpoint(
+      test_system, FileCheckpointConfig("/out.checkpoint", "/out.jsonl", True)
+    )
+
+  assert "/out.checkpoint" not in test_system.files
+
+
+def test_checkpoint_skips_corrupt_entries(test_system: TestSystem):
+  test_system.files["/out.checkpoint"] = (
+    json.dumps({"site": "jobs", "page": 1, "links": ["https://jobs.example/1"]})
+    + "\n"
+    + json.dumps({"offset": 10, "jobs": [["jobs", "https://jobs.example/1"]]})
+    + '\n{"offset": 2'
+  )
+
+  checkpoint = FileCheckpoint(
+    test_system, FileCheckpointConfig("/out.checkpoint", "/out.json", True)
+  )
+
+  assert checkpoint.offset() == 10
+  assert checkpoint.pending("jobs", ["https://jobs.example/1"]) == []
+  assert test_system.files["/out.checkpoint"].count("\n") == 2
@@ -0,0 +1,67 @@
+from typing import Any, Dict, List, Optional
+
+import pytest
+import truffle_cli.config as truffle_config
+from truffle_cli.worker.input import WorkerConfig
+
+from .test_system import TestSystem
+
+
+def _for_worker(
+  test_system: TestSystem,
+  worker: Dict[str, Any],
+  rate_limit: Optional[Dict[str, Any]] = None,
+) -> WorkerConfig:
+  llm_service: Dict[str, Any] = {
+    "cv": "My CV.",
+    "extraction_prompt": "Please extract data from content.",
+    "scoring_prompt": "Please score the content.",
+    "summary_prompt": "Please summarize the content.",
+  }
+  if rate_limit is not None:
+    llm_service["rate_limit"] = rate_limit
+
+  test_system.set_config_file({"worker": worker, "llm_service": llm_service})
+  loader = truffle_config.create(test_system)
+  config = loader.load()
+  assert config is not None
+
+  return loader.for_worker(config)
+
+
+@pytest.mark.parametrize(
+  "worker",
+  [
+    {"type": "threaded", "max_workers": 0},
+    {"type": "threaded", "max_site_workers": 0},
+    {"type": "async", "max_tasks": 0},
+    {"type": "async", "max_site_tasks": 0},
+    {"type": "pipelined", "list_workers": 0},
+    {"type": "pipelined", "scrape_workers": 0},
+    {"type": "pipelined", "parse_workers": 0},
+    {"type": "pipelined", "enrich_workers": 0},
+  ],
+)
+def test_worker_config_rejects_empty_pools(
+  test_system: TestSystem, worker: Dict[str, Any]
+):
+  with pytest.raises(ValueError, match="must be at least 1, got 0"):
+    _for_worker(test_system, worker)
+
+
+@pytest.mark.parametrize(
+  "rate_limit,statuses",
+  [
+    (None, [408, 500, 502, 504, 429, 503]),
+    ({"requests_per_second": 1}, [408, 500, 502, 504]),
+  ],
+)
+def test_retry_config_leaves_throttling_to_rate_limits(
+  test_system: TestSystem,
+  rate_limit: Optional[Dict[str, Any]],
+  statuses: List[int],
+):
+  config = _for_worker(test_system, {"type": "sync"}, rate_limit)
+
+  assert config.http_client.retry is not None
+  assert config.http_client.retry.statuses == statuses
@@ -0,0 +1,156 @@
+from typing import List
+
+import pytest
+from truffle_cli.html_processor.abstract import HtmlProcessor
+from truffle_cli.html_processor.beautiful_soup import BeautifulSoupHtmlProcessor
+from truffle_cli.html_processor.input import (
+  BeautifulSoupHtmlProcessorConfig,
+  LxmlHtmlProcessorConfig,
+)
+from truffle_cli.html_processor.lxml import LxmlHtmlProcessor
+
+from .test_system import TestSystem
+
+DETAILS_PAGE = """
+<!DOCTYPE html>
+<html>
+  <head>
+    <title>Senior Engineer</title>
+    <style>body { color: red; }</style>
+    <script>window.track = true;</script>
+  </head>
+  <body>
+    <header><nav><a href="/">Home</a></nav></header>
+    <!-- listing -->
+    <div class="cookie-banner">We use cookies</div>
+    <main>
+      <h1 class="job-title" data-id="1">Senior <em>Python</em> Engineer</h1>
+      <section id="details" class="job-details">
+        <p>Build &amp; run   scrapers.</p>
+        <div class="ad-slot"><span>Buy now</span></div>
+        <ul>
+          <li><strong>Remote</strong></li>
+          <li><a href="/apply" title="Apply">Apply</a></li>
+          <li></li>
+        </ul>
+        <table><tr><td>Salary</td><td>100k</td></tr></table>
+        <div><span> </span></div>
+      </section>
+      <a class="job" href="/jobs/1">One</a>
+      <a class="job" href="https://example.com/jobs/2">Two</a>
+      <a class="job">Missing</a>
+    </main>
+    <aside>Related</aside>
+    <footer>Footer</footer>
+  </body>
+</html>
+"""
+
+
+LISTING_PAGE = """
+<!doctype html>
+<html lang="en">
+  <body>
+    <div id="google-tag"><a class="job" href="/jobs/hidden">Hidden</a></div>
+    <ul class="results">
+      <li><a class="job" href="/jobs/10?ref=list">Backend &amp; Data</a></li>
+      <li><a class="job" href="/jobs/11">Frontend</a></li>
+      <li><a class="job" href="">Empty</a></li>
+      <li><a class="other" href="/about">About</a></li>
+    </ul>
+    <div class="modal-dialog"><p>Subscribe</p></div>
+  </body>
+</html>
+"""
+
+FRAGMENT_PAGE = """
+<div class="wrapper">
+  <h1 class="job-title" title="Role">Data&nbsp;Engineer &lt;remote&gt;</h1>
+  <div id="details">
+    <!-- description -->
+    <p>Work with <i>SQL</i>,
+       <b>Spark</b>   and
+       <span class="tracking-pixel">x</span><span>Kafka</span>.</p>
+    <p><img alt="logo" src="logo.png"></p>
+    <div><div><span>\t</span></div></div>
+    <ol><li>One</li><li>Two &amp;amp; three</li></ol>
+  </div>
+</div>
+"""
+
+XHTML_PAGE = """<?xml version="1.0" encoding="utf-8"?>
+<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Strict//EN"
+  "http://www.w3.org/TR/xhtml1/DTD/xhtml1-strict.dtd">
+<html xmlns="http://www.w3.org/1999/xhtml">
+  <head><title>Engineer</title></head>
+  <body>
+    <h1 class="job-title">Platform Engineer</h1>
+    <div id="details"><p>Run the platform.</p></div>
+    <a class="job" href="/jobs/3">Three</a>
+  </body>
+</html>
+"""
+
+PAGES: List[str] = [
+  DETAILS_PAGE,
+  LISTING_PAGE,
+  FRAGMENT_PAGE,
+  XHTML_PAGE,
+  "<!-- nothing but a comment -->",
+  "<!DOCTYPE html>",
+  "<?php echo 'nothing'; ?>",
+  "",
+  "None",
+]
+
+
+def _processors(
+  test_system: TestSystem, title_selector: str = "h1.job-title"
+) -> List[HtmlProcessor]:
+  return [
+    BeautifulSoupHtmlProcessor(
+      test_system,
+      BeautifulSoupHtmlProcessorConfig(
+        link_selector="a.job",
+        title_selector=title_selector,
+        details_selector="#details",
+      ),
+    ),
+    LxmlHtmlProcessor(
+      test_system,
+      LxmlHtmlProcessorConfig(
+        link_selector="a.job",
+        title_selector=title_selector,
+        details_selector="#details",
+      ),
+    ),
+  ]
+
+
+@pytest.mark.parametrize("page", PAGES)
+def test_process_matches_separate_calls(test_system: TestSystem, page: str):
+  for processor in _processors(test_system):
+    document = processor.process(page)
+
+    assert document.links == processor.links(page)
+    assert document.clean == processor.clean(page)
+    assert document.title == processor.clean(processor.title(page))
+    assert document.details == processor.clean(processor.details(page))
+
+
+@pytest.mark.parametrize("page", PAGES)
+def test_lxml_matches_beautiful_soup(test_system: TestSystem, page: str):
+  beautiful_soup, lxml = _processors(test_system)
+
+  assert lxml.process(page) == beautiful_soup.process(page)
+  assert lxml.links(page) == beautiful_soup.links(page)
+  assert lxml.clean(page) == beautiful_soup.clean(page)
+
+
+def test_lxml_matches_beautiful_soup_on_missing_elements(
+  test_system: TestSystem,
+):
+  beautiful_soup, lxml = _processors(test_system, title_selector=".missing")
+
+  assert lxml.process(DETAILS_PAGE) == beautiful_soup.process(DETAILS_PAGE)
+  assert lxml.title(DETAILS_PAGE) == beautiful_soup.title(DETAILS_PAGE)
@@ -1,7 +1,37 @@
+import asyncio
+import time
 from dataclasses import dataclass
-from typing import Any, Dict, List, override
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from threading import Thread
+from typing import Any, Dict, List, Optional, override
 
-from truffle_cli.http_client.abstract import HttpClient
+import pytest
+from truffle_cli.cache.input import SqliteCacheConfig
+from truffle_cli.cache.sqlite import SqliteCache
+from truffle_cli.http_client.abstract import (
+  AsyncHttpClient,
+  HttpClient,
+  HttpClientStats,
+  HttpStatusError,
+  HttpTransportError,
+)
+from truffle_cli.http_client.cached import CachedHttpClient
+from truffle_cli.http_client.input import (
+  RateLimitConfig,
+  RequestsHttpClientConfig,
+  RetryConfig,
+)
+from truffle_cli.http_client.rate_limited import (
+  AsyncRateLimitedHttpClient,
+  AsyncRateLimiter,
+  RateLimitedHttpClient,
+  RateLimiter,
+)
+from truffle_cli.http_client.requests import RequestsHttpClient
+from truffle_cli.http_client.retrying import RetryingHttpClient
+
+from .test_system import TestSystem
 
 
 @dataclass
@@ -17,12 +47,331 @@ class TestHttpClient(HttpClient):
   __test__ = False
 
   requests: List[TestRequest]
+  errors: List[Exception]
 
-  def __init__(self):
+  def __init__(self, errors: Optional[List[Exception]] = None):
     self.requests = []
+    self.errors = errors or []
 
   @override
-  def post(self, url: str, headers: Dict[str, str], payload: Any) -> Any:
+  def post(
+    self,
+    url: str,
+    headers: Dict[str, str],
+    payload: Any,
+    idempotent: bool = True,
+  ) -> Any:
     self.requests.append(TestRequest(url, headers, payload))
+    if self.errors:
+      raise self.errors.pop(0)
+
+    return self.respond(url, payload)
+
+  @override
+  def get(self, url: str, headers: Dict[str, str]) -> Any:
+    self.requests.append(TestRequest(url, headers, None))
+
+    return {}
+
+  @override
+  def download(self, url: str, headers: Dict[str, str]) -> str:
+    self.requests.append(TestRequest(url, headers, None))
+
+    return ""
+
+  @override
+  def upload(
+    self,
+    url: str,
+    headers: Dict[str, str],
+    fields: Dict[str, str],
+    name: str,
+    content: str,
+  ) -> Any:
+    self.requests.append(TestRequest(url, headers, content))
+    if self.errors:
+      raise self.errors.pop(0)
+
+    return {}
+
+  @override
+  def stats(self) -> HttpClientStats:
+    return HttpClientStats()
 
+  @override
+  def close(self) -> None:
+    pass
+
+  def respond(self, url: str, payload: Any) -> Any:
     return {}
+
+
+class TestAsyncHttpClient(AsyncHttpClient):
+  __test__ = False
+
+  client: TestHttpClient
+
+  def __init__(self, client: TestHttpClient):
+    self.client = client
+
+  @override
+  async def post(self, url: str, headers: Dict[str, str], payload: Any) -> Any:
+    return self.client.post(url, headers, payload)
+
+  @override
+  def stats(self) -> HttpClientStats:
+    return self.client.stats()
+
+  @override
+  async def close(self) -> None:
+    self.client.close()
+
+
+def _rate_limited(
+  test_system: TestSystem,
+  client: HttpClient,
+  requests_per_second: Optional[float] = None,
+  max_retries: int = 5,
+) -> HttpClient:
+  config = RateLimitConfig(requests_per_second, None, 4, max_retries)
+
+  return RateLimitedHttpClient(
+    test_system, client, RateLimiter(config), config.max_retries
+  )
+
+
+def test_rate_limited_retries_throttled(test_system: TestSystem):
+  client = TestHttpClient(
+    [
+      HttpStatusError("https://example.com", 429, "", "0.1"),
+      HttpStatusError("https://example.com", 503, "", None),
+    ]
+  )
+  rate_limited = _rate_limited(test_system, client)
+
+  start = time.monotonic()
+  assert rate_limited.post("https://example.com", {}, {}) == {}
+
+  assert len(client.requests) == 3
+  assert time.monotonic() - start >= 1.0
+
+
+def test_rate_limited_raises_other_errors(test_system: TestSystem):
+  client = TestHttpClient(
+    [HttpStatusError("https://example.com", 500, "", None)]
+  )
+  rate_limited = _rate_limited(test_system, client)
+
+  with pytest.raises(HttpStatusError):
+    rate_limited.post("https://example.com", {}, {})
+
+  assert len(client.requests) == 1
+
+
+def test_rate_limited_gives_up(test_system: TestSystem):
+  client = TestHttpClient(
+    [HttpStatusError("https://example.com", 429, "", "0") for _ in range(3)]
+  )
+  rate_limited = _rate_limited(test_system, client, max_retries=1)
+
+  with pytest.raises(HttpStatusError):
+    rate_limited.post("https://example.com", {}, {})
+
+  assert len(client.requests) == 2
+
+
+def test_rate_limited_paces_requests(test_system: TestSystem):
+  client = TestHttpClient()
+  rate_limited = _rate_limited(test_system, client, requests_per_second=20)
+
+  start = time.monotonic()
+  for _ in range(25):
+    rate_limited.post("https://example.com", {}, {})
+
+  assert time.monotonic() - start >= 0.2
+
+
+def _async_rate_limited(
+  test_system: TestSystem,
+  client: TestHttpClient,
+  requests_per_second: Optional[float] = None,
+) -> AsyncHttpClient:
+  config = RateLimitConfig(requests_per_second, None, 4, 5)
+
+  return AsyncRateLimitedHttpClient(
+    test_system,
+    TestAsyncHttpClient(client),
+    AsyncRateLimiter(config),
+    config.max_retries,
+  )
+
+
+def test_async_rate_limited_retries_throttled(test_system: TestSystem):
+  client = TestHttpClient(
+    [HttpStatusError("https://example.com", 429, "", "0.1")]
+  )
+  rate_limited = _async_rate_limited(test_system, client)
+
+  start = time.monotonic()
+  assert asyncio.run(rate_limited.post("https://example.com", {}, {})) == {}
+
+  assert len(client.requests) == 2
+  assert time.monotonic() - start >= 0.1
+
+
+async def _post_concurrently(client: AsyncHttpClient, count: int) -> None:
+  async with asyncio.TaskGroup() as group:
+    for _ in range(count):
+      group.create_task(client.post("https://example.com", {}, {}))
+
+
+def test_async_rate_limited_paces_concurrent_requests(
+  test_system: TestSystem,
+):
+  client = TestHttpClient()
+  rate_limited = _async_rate_limited(
+    test_system, client, requests_per_second=20
+  )
+
+  start = time.monotonic()
+  asyncio.run(_post_concurrently(rate_limited, 25))
+
+  assert len(client.requests) == 25
+  assert time.monotonic() - start >= 0.2
+
+
+def test_cached_skips_repeated_posts(test_system: TestSystem, tmp_path: Path):
+  client = TestHttpClient()
+  cache = SqliteCache(
+    test_system, SqliteCacheConfig(str(tmp_path / "cache.sqlite"), 1 << 20)
+  )
+  cached = CachedHttpClient(test_system, client, cache, None)
+
+  assert cached.post("https://example.com", {}, {"content": "one"}) == {}
+  assert cached.post("https://example.com", {}, {"content": "one"}) == {}
+  assert cached.post("https://example.com", {}, {"content": "two"}) == {}
+
+  assert [request.payload for request in client.requests] == [
+    {"content": "one"},
+    {"content": "two"},
+  ]
+  assert cache.stats().hits == 1
+
+  expired = CachedHttpClient(test_system, client, cache, 0)
+  expired.post("https://example.com", {}, {"content": "one"})
+
+  assert len(client.requests) == 3
+
+  cache.close()
+
+
+def test_cached_skips_non_idempotent_posts(
+  test_system: TestSystem, tmp_path: Path
+):
+  client = TestHttpClient()
+  cache = SqliteCache(
+    test_system, SqliteCacheConfig(str(tmp_path / "cache.sqlite"), 1 << 20)
+  )
+  cached = CachedHttpClient(test_system, client, cache, None)
+
+  cached.post("https://example.com", {}, {"content": "one"}, idempotent=False)
+  cached.post("https://example.com", {}, {"content": "one"}, idempotent=False)
+
+  assert len(client.requests) == 2
+  assert cache.stats().hits == 0
+
+  cache.close()
+
+
+def _retrying(
+  test_system: TestSystem, client: HttpClient, max_attempts: int = 3
+) -> HttpClient:
+  return RetryingHttpClient(
+    test_system, client, RetryConfig(max_attempts, 0.01, 0.1, [500, 502])
+  )
+
+
+def test_retrying_retries_transient_errors(test_system: TestSystem):
+  client = TestHttpClient(
+    [
+      HttpStatusError("https://example.com", 502, "", None),
+      HttpTransportError("https://example.com", TimeoutError()),
+    ]
+  )
+  retrying = _retrying(test_system, client)
+
+  assert retrying.post("https://example.com", {}, {}) == {}
+
+  assert len(client.requests) == 3
+  assert retrying.stats().retries == 2
+  assert retrying.stats().exhausted == 0
+  assert retrying.stats().latency > 0
+
+
+def test_retrying_raises_other_errors(test_system: TestSystem):
+  client = TestHttpClient(
+    [HttpStatusError("https://example.com", 400, "", None)]
+  )
+  retrying = _retrying(test_system, client)
+
+  with pytest.raises(HttpStatusError):
+    retrying.post("https://example.com", {}, {})
+
+  assert len(client.requests) == 1
+  assert retrying.stats().retries == 0
+
+
+def test_retrying_gives_up(test_system: TestSystem):
+  client = TestHttpClient(
+    [HttpStatusError("https://example.com", 500, "", None) for _ in range(3)]
+  )
+  retrying = _retrying(test_system, client, max_attempts=2)
+
+  with pytest.raises(HttpStatusError):
+    retrying.post("https://example.com", {}, {})
+
+  assert len(client.requests) == 2
+  assert retrying.stats().retries == 1
+  assert retrying.stats().exhausted == 1
+
+
+def test_retrying_skips_non_idempotent_requests(test_system: TestSystem):
+  client = TestHttpClient(
+    [HttpStatusError("https://example.com", 502, "", None) for _ in range(2)]
+  )
+  retrying = _retrying(test_system, client)
+
+  with pytest.raises(HttpStatusError):
+    retrying.post("https://example.com", {}, {}, idempotent=False)
+  with pytest.raises(HttpStatusError):
+    retrying.upload("https://example.com", {}, {}, "file", "")
+
+  assert len(client.requests) == 2
+  assert retrying.stats().retries == 0
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+  def do_POST(self):
+    time.sleep(0.5)
+    self.send_response(200)
+    self.end_headers()
+    self.wfile.write(b"{}")
+
+  def log_message(self, format: str, *args: Any) -> None:
+    pass
+
+
+def test_requests_times_out(test_system: TestSystem):
+  server = HTTPServer(("127.0.0.1", 0), _SlowHandler)
+  thread = Thread(target=server.serve_forever, daemon=True)
+  thread.start()
+  client = RequestsHttpClient(
+    test_system, RequestsHttpClientConfig(1, 1, False, True, timeout=0.1)
+  )
+  try:
+    with pytest.raises(HttpTransportError):
+      client.post(f"http://127.0.0.1:{server.server_port}", {}, {})
+  finally:
+    client.close()
+    server.shutdown()
+    server.server_close()
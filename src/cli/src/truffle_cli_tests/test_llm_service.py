@@ -0,0 +1,369 @@
+import json
+from typing import Any, Dict, List, Optional, Set, override
+
+import pytest
+from truffle_cli.http_client.abstract import HttpClient, HttpClientStats
+from truffle_cli.llm_service.abstract import LlmEnrichment
+from truffle_cli.llm_service.input import (
+  OpenaiBatchLlmServiceConfig,
+  OpenaiLlmServiceConfig,
+)
+from truffle_cli.llm_service.openai import OpenaiLlmService
+from truffle_cli.llm_service.openai_batch import OpenaiBatchLlmService
+
+from .test_http_client import TestHttpClient
+from .test_system import TestSystem
+
+
+class TestBatchHttpClient(HttpClient):
+  __test__ = False
+
+  pages: Dict[str, str]
+  failing: Set[str]
+  replies: Dict[str, str]
+  scraped: List[str]
+  files: Dict[str, str]
+  batches: Dict[str, Any]
+
+  def __init__(
+    self,
+    pages: Optional[Dict[str, str]] = None,
+    failing: Optional[Set[str]] = None,
+    replies: Optional[Dict[str, str]] = None,
+  ):
+    self.pages = pages or {}
+    self.failing = failing or set()
+    self.replies = replies or {}
+    self.scraped = []
+    self.files = {}
+    self.batches = {}
+
+  @override
+  def post(
+    self,
+    url: str,
+    headers: Dict[str, str],
+    payload: Any,
+    idempotent: bool = True,
+  ) -> Any:
+    if not url.endswith("/batches"):
+      self.scraped.append(payload["url"])
+      return {"browserHtml": self.pages.get(payload["url"], "")}
+
+    batch_id = f"batch-{len(self.batches)}"
+    self.batches[batch_id] = {
+      "id": batch_id,
+      "status": "validating",
+      "input_file_id": payload["input_file_id"],
+    }
+
+    return dict(self.batches[batch_id])
+
+  @override
+  def get(self, url: str, headers: Dict[str, str]) -> Any:
+    batch = self.batches[url.rsplit("/", 1)[1]]
+    if batch["status"] == "validating":
+      batch["status"] = "in_progress"
+    elif batch["status"] == "in_progress":
+      self._complete(batch)
+
+    return dict(batch)
+
+  @override
+  def download(self, url: str, headers: Dict[str, str]) -> str:
+    return self.files[url.removesuffix("/content").rsplit("/", 1)[1]]
+
+  @override
+  def upload(
+    self,
+    url: str,
+    headers: Dict[str, str],
+    fields: Dict[str, str],
+    name: str,
+    content: str,
+  ) -> Any:
+    return {"id": self._file(content)}
+
+  @override
+  def stats(self) -> HttpClientStats:
+    return HttpClientStats()
+
+  @override
+  def close(self) -> None:
+    pass
+
+  def requests(self) -> List[Any]:
+    return [
+      json.loads(line)
+      for batch in self.batches.values()
+      for line in self.files[batch["input_file_id"]].splitlines()
+    ]
+
+  def _complete(self, batch: Any) -> None:
+    output = []
+    errors = []
+    for line in self.files[batch["input_file_id"]].splitlines():
+      request = json.loads(line)
+      if request["custom_id"] in self.failing:
+        errors.append(
+          {
+            "custom_id": request["custom_id"],
+            "response": None,
+            "error": {"code": "server_error", "message": "Failed"},
+          }
+        )
+        continue
+
+      output.append(
+        {
+          "custom_id": request["custom_id"],
+          "response": {
+            "status_code": 200,
+            "body": {
+              "choices": [
+                {
+                  "message": {
+                    "content": self.replies.get(
+                      request["custom_id"], _respond(request)
+                    )
+                  }
+                }
+              ],
+              "usage": {
+                "prompt_tokens": 10,
+                "completion_tokens": 2,
+                "prompt_tokens_details": {"cached_tokens": 8},
+              },
+            },
+          },
+          "error": None,
+        }
+      )
+
+    batch["status"] = "completed"
+    batch["output_file_id"] = self._file(_jsonl(output))
+    if errors:
+      batch["error_file_id"] = self._file(_jsonl(errors))
+
+  def _file(self, content: str) -> str:
+    file_id = f"file-{len(self.files)}"
+    self.files[file_id] = content
+
+    return file_id
+
+
+class TestChatHttpClient(TestHttpClient):
+  __test__ = False
+
+  enrichment: Optional[str]
+
+  def __init__(self, enrichment: Optional[str] = None):
+    super().__init__()
+    self.enrichment = enrichment
+
+  @override
+  def respond(self, url: str, payload: Any) -> Any:
+    content = _respond({"body": payload})
+    if "response_format" in payload and self.enrichment is not None:
+      content = self.enrichment
+
+    return {
+      "choices": [{"message": {"content": content}}],
+      "usage": {"prompt_tokens": 10, "completion_tokens": 2},
+    }
+
+  def payloads(self) -> List[Any]:
+    return [request.payload for request in self.requests]
+
+
+def _respond(request: Any) -> str:
+  body = request["body"]
+  if "response_format" in body:
+    return json.dumps(
+      {"extract": {"salary": 1}, "summary": "Fine.", "score": 42}
+    )
+
+  task = body["messages"][3]["content"]
+  if "Extract" in task:
+    return '{"salary": 1}'
+  if "Summarize" in task:
+    return "Fine."
+  return "42"
+
+
+def _jsonl(lines: List[Any]) -> str:
+  return "".join(json.dumps(line) + "\n" for line in lines)
+
+
+def _config(combined: bool) -> OpenaiBatchLlmServiceConfig:
+  return OpenaiBatchLlmServiceConfig(
+    base_url="https://llm.example/v1",
+    api_key="sk-xxxxxxxxxxxxx",
+    model="model",
+    cv="My CV.",
+    extraction_prompt="Please extract data from content.",
+    summary_prompt="Please summarize the content.",
+    scoring_prompt="Please score the content.",
+    combined=combined,
+    poll_interval=0,
+  )
+
+
+def _chat_config(combined: bool) -> OpenaiLlmServiceConfig:
+  return OpenaiLlmServiceConfig(
+    base_url="https://llm.example/v1",
+    api_key="sk-xxxxxxxxxxxxx",
+    model="model",
+    cv="My CV.",
+    extraction_prompt="Please extract data from content.",
+    summary_prompt="Please summarize the content.",
+    scoring_prompt="Please score the content.",
+    combined=combined,
+  )
+
+
+def test_enrich_combined(test_system: TestSystem):
+  client = TestChatHttpClient()
+  service = OpenaiLlmService(test_system, _chat_config(True), client)
+
+  enrichment = service.enrich("First post.")
+
+  assert len(client.payloads()) == 1
+  assert client.payloads()[0]["response_format"] == {"type": "json_object"}
+  assert enrichment.extract.reply == {"salary": 1}
+  assert enrichment.summary.reply == "Fine."
+  assert enrichment.score.reply == 42
+  assert service.usage().requests == 1
+
+
+@pytest.mark.parametrize(
+  "reply",
+  [
+    "Not JSON at all.",
+    '["extract", "summary", "score"]',
+    '{"extract": {"salary": 1}, "summary": 1, "score": 42}',
+    '{"extract": {"salary": 1}, "summary": "Fine.", "score": "high"}',
+    '{"summary": "Fine.", "score": 42}',
+  ],
+)
+def test_enrich_combined_falls_back_to_separate_calls(
+  test_system: TestSystem, reply: str
+):
+  client = TestChatHttpClient(reply)
+  service = OpenaiLlmService(test_system, _chat_config(True), client)
+
+  enrichment = service.enrich("First post.")
+
+  assert ["response_format" in payload for payload in client.payloads()] == [
+    True,
+    False,
+    False,
+    False,
+  ]
+  assert enrichment.extract.reply == {"salary": 1}
+  assert enrichment.summary.reply == "Fine."
+  assert enrichment.score.reply == 42
+  assert service.usage().requests == 4
+
+
+@pytest.mark.parametrize("combined", [False, True])
+def test_payload_prefix_is_shared_across_postings(
+  test_system: TestSystem, combined: bool
+):
+  client = TestChatHttpClient()
+  service = OpenaiLlmService(test_system, _chat_config(combined), client)
+
+  service.enrich("First post.")
+  service.enrich("Second post.")
+
+  tasks: Dict[str, Set[str]] = {}
+  for payload in client.payloads():
+    prefix = json.dumps(
+      {key: value for key, value in payload.items() if key != "messages"}
+      | {"messages": payload["messages"][:4]}
+    )
+    tasks.setdefault(payload["messages"][3]["content"], set()).add(prefix)
+    assert "post." not in prefix
+    assert "post." in payload["messages"][4]["content"]
+
+  assert len(tasks) == (1 if combined else 3)
+  assert all(len(prefixes) == 1 for prefixes in tasks.values())
+  assert (
+    len({json.dumps(payload["messages"][:3]) for payload in client.payloads()})
+    == 1
+  )
+
+
+@pytest.mark.parametrize("combined", [False, True])
+def test_batch_enrich(test_system: TestSystem, combined: bool):
+  client = TestBatchHttpClient()
+  service = OpenaiBatchLlmService(test_system, _config(combined), client)
+
+  enrichments = service.enrich_batch(["First post.", "Second post."])
+
+  assert len(client.batches) == (1 if combined else 3)
+  requests = client.requests()
+  assert len(requests) == (2 if combined else 6)
+  assert len({json.dumps(r["body"]["messages"][:3]) for r in requests}) == 1
+  for enrichment in enrichments:
+    assert isinstance(enrichment, LlmEnrichment)
+    assert enrichment.extract.reply == {"salary": 1}
+    assert enrichment.summary.reply == "Fine."
+    assert enrichment.score.reply == 42
+  assert service.usage().requests == len(requests)
+  assert service.usage().cached_tokens == 8 * len(requests)
+
+
+def test_batch_enrich_failed_request(test_system: TestSystem):
+  client = TestBatchHttpClient(failing={"1-extract"})
+  service = OpenaiBatchLlmService(test_system, _config(False), client)
+
+  enrichments = service.enrich_batch(["First post.", "Second post."])
+
+  assert isinstance(enrichments[0], LlmEnrichment)
+  assert isinstance(enrichments[1], Exception)
+  assert [request["custom_id"] for request in client.requests()] == [
+    "0-extract",
+    "1-extract",
+    "0-summarize",
+    "0-score",
+  ]
+
+
+def test_batch_enrich_passes_earlier_replies_on(test_system: TestSystem):
+  client = TestBatchHttpClient()
+  service = OpenaiBatchLlmService(test_system, _config(False), client)
+
+  service.enrich_batch(["First post."])
+
+  contents = {
+    request["custom_id"]: [
+      message["content"] for message in request["body"]["messages"][4:]
+    ]
+    for request in client.requests()
+  }
+  assert len(contents["0-extract"]) == 1
+  assert len(contents["0-summarize"]) == 2
+  assert '"salary": 1' in contents["0-summarize"][1]
+  assert contents["0-score"][:2] == contents["0-summarize"]
+  assert contents["0-score"][2].endswith("Fine.")
+
+
+def test_batch_enrich_combined_falls_back_to_separate_calls(
+  test_system: TestSystem,
+):
+  client = TestBatchHttpClient(replies={"1-enrich": "Not JSON at all."})
+  service = OpenaiBatchLlmService(test_system, _config(True), client)
+
+  enrichments = service.enrich_batch(["First post.", "Second post."])
+
+  assert all(
+    isinstance(enrichment, LlmEnrichment) for enrichment in enrichments
+  )
+  assert [request["custom_id"] for request in client.requests()] == [
+    "0-enrich",
+    "1-enrich",
+    "1-extract",
+    "1-summarize",
+    "1-score",
+  ]
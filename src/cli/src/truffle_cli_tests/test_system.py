@@ -1,7 +1,8 @@
 import json
 from datetime import datetime, timezone
+from io import StringIO
 from pathlib import Path
-from typing import Dict, List, Literal, Optional, override
+from typing import Dict, List, Literal, Optional, TextIO, override
 
 import tomlkit
 import yaml
@@ -14,11 +15,36 @@ from truffle_cli.system.abstract import System
 from .test_logger import TestLog, TestLogger
 
 
+class TestFile(StringIO):
+  __test__ = False
+
+  files: Dict[str, str]
+  path: str
+
+  def __init__(self, files: Dict[str, str], path: str):
+    super().__init__()
+    self.files = files
+    self.path = path
+
+  @override
+  def flush(self) -> None:
+    self.files[self.path] = self.files.get(self.path, "") + self.getvalue()
+    self.seek(0)
+    self.truncate()
+
+  @override
+  def close(self) -> None:
+    if not self.closed:
+      self.flush()
+    super().close()
+
+
 class TestSystem(System):
   __test__ = False
 
   CURRENT_DIR: Literal["/"] = "/"
   CONFIG_DIR: Literal["/config"] = "/config"
+  CACHE_DIR: Literal["/cache"] = "/cache"
 
   args: List[str]
   env: Dict[str, str]
@@ -107,6 +133,8 @@ class TestSystem(System):
       str_value = yaml.safe_dump(value)
     elif type == Format.JSON:
       str_value = json.dumps(value)
+    elif type == Format.JSONL:
+      str_value = f"{json.dumps(value)}\n"
 
     self.files[path] = str_value
 
@@ -121,6 +149,8 @@ class TestSystem(System):
       str_value = yaml.safe_dump(value)
     elif type == Format.JSON:
       str_value = json.dumps(value)
+    elif type == Format.JSONL:
+      str_value = f"{json.dumps(value)}\n"
 
     self.stdin = str_value
 
@@ -170,6 +200,14 @@ class TestSystem(System):
   def path_join(self, lhs: str, rhs: str) -> str:
     return str(Path(lhs) / rhs)
 
+  @override
+  def path_parent(self, path: str) -> str:
+    return str(Path(path).parent)
+
+  @override
+  def create_dir(self, path: str) -> None:
+    pass
+
   @override
   def read_file(self, path: str) -> str:
     text = self.files.get(path)
@@ -182,12 +220,40 @@ class TestSystem(System):
     text = self.files.get(path)
     if text is None:
       raise FileNotFoundError(f"File {path} not found")
-    text += content
+    self.files[path] = text + content
 
   @override
   def clear_file(self, path: str) -> None:
     self.files[path] = ""
 
+  @override
+  def open_file(self, path: str) -> TextIO:
+    return TestFile(self.files, path)
+
+  @override
+  def replace_file(self, path: str, content: str) -> None:
+    self.files[path] = content
+
+  @override
+  def write_compressed_file(self, path: str, content: str) -> None:
+    self.files[path] = content
+
+  @override
+  def sync_file(self, path: str) -> None:
+    pass
+
+  @override
+  def file_size(self, path: str) -> int:
+    return len(self.read_file(path))
+
+  @override
+  def truncate_file(self, path: str, size: int) -> None:
+    self.files[path] = self.read_file(path)[:size]
+
+  @override
+  def remove_file(self, path: str) -> None:
+    self.files.pop(path, None)
+
   @override
   def write_stdout(self, content: str) -> None:
     self.stdout += content
@@ -196,6 +262,10 @@ class TestSystem(System):
   def get_config_dir(self) -> str:
     return TestSystem.CONFIG_DIR
 
+  @override
+  def get_cache_dir(self) -> str:
+    return TestSystem.CACHE_DIR
+
   @override
   def setup_logging(
     self, log_level: LogLevel, environment: Environment
@@ -0,0 +1,926 @@
+import asyncio
+import json
+import sqlite3
+import time
+from dataclasses import replace
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, List, Tuple, override
+
+import pytest
+from truffle_cli.cache.input import SqliteCacheConfig
+from truffle_cli.cache.sqlite import SqliteCache
+from truffle_cli.html_processor.abstract import HtmlDocument
+from truffle_cli.html_processor.beautiful_soup import BeautifulSoupHtmlProcessor
+from truffle_cli.html_processor.input import BeautifulSoupHtmlProcessorConfig
+from truffle_cli.http_client.abstract import (
+  AsyncHttpClient,
+  HttpClientStats,
+)
+from truffle_cli.http_client.input import RequestsHttpClientConfig
+from truffle_cli.llm_service.input import (
+  LlmCacheConfig,
+  OpenaiBatchLlmServiceConfig,
+  OpenaiLlmServiceConfig,
+)
+from truffle_cli.scraping_service.input import ZyteScrapingServiceConfig
+from truffle_cli.worker.abstract import Worker
+from truffle_cli.worker.asynchronous import AsyncWorker
+from truffle_cli.worker.common import (
+  close_near_duplicates,
+  create_near_duplicates,
+)
+from truffle_cli.worker.dedup import canonicalize
+from truffle_cli.worker.input import (
+  ASYNC_WORKER_TYPE,
+  INCREMENTAL_EMIT_MODE,
+  INCREMENTAL_SKIP_MODE,
+  INCREMENTAL_VERIFY_MODE,
+  PIPELINED_WORKER_TYPE,
+  SYNC_WORKER_TYPE,
+  THREADED_WORKER_TYPE,
+  AsyncWorkerConfig,
+  IncrementalConfig,
+  IncrementalMode,
+  NearDuplicateConfig,
+  PaginationSyncWorkerSiteConfig,
+  PipelinedWorkerConfig,
+  PreFilterConfig,
+  SyncWorkerConfig,
+  SyncWorkerSiteConfig,
+  ThreadedWorkerConfig,
+)
+from truffle_cli.worker.near_duplicates import (
+  SIMHASH_MAX_BANDS,
+  NearDuplicateIndex,
+  _distance,
+  _simhash,
+)
+from truffle_cli.worker.output import (
+  OutputJob,
+  OutputJobEnrichment,
+  OutputJobScrape,
+  OutputJobThinking,
+  OutputMetadata,
+)
+from truffle_cli.worker.pipelined import PipelinedWorker
+from truffle_cli.worker.prefilter import PreFilter
+from truffle_cli.worker.sync import SyncWorker
+from truffle_cli.worker.threaded import ThreadedWorker
+
+from .test_http_client import TestHttpClient
+from .test_llm_service import TestBatchHttpClient
+from .test_system import TestSystem
+
+DETAILS_PAGE = """
+<html><body>
+  <h1>Engineer {}</h1>
+  <section id="details"><p>Build scrapers for posting {}.</p></section>
+</body></html>
+"""
+
+POSTINGS = [
+  "Senior Python engineer building job scrapers and data pipelines for a "
+  "fast growing remote first startup. You will own crawling, parsing and "
+  "enrichment with language models, work with Postgres and Kubernetes, and "
+  "mentor two juniors. Competitive salary, equity and flexible hours.",
+  "Frontend developer wanted for React and TypeScript dashboards at a "
+  "regional bank. You will design accessible components, collaborate with "
+  "analysts on reporting screens and maintain the design system. Hybrid "
+  "work from the Zagreb office three days a week.",
+]
+
+
+class TestSiteHttpClient(TestHttpClient):
+  __test__ = False
+
+  pages: Dict[str, str]
+  delay: float
+  running: int
+  peak: int
+  _lock: Lock
+
+  def __init__(self, pages: Dict[str, str], delay: float = 0):
+    super().__init__()
+    self.pages = pages
+    self.delay = delay
+    self.running = 0
+    self.peak = 0
+    self._lock = Lock()
+
+  @override
+  def post(
+    self,
+    url: str,
+    headers: Dict[str, str],
+    payload: Any,
+    idempotent: bool = True,
+  ) -> Any:
+    self.enter(payload)
+    try:
+      response = self.record(url, headers, payload)
+      time.sleep(self.delay)
+      return response
+    finally:
+      self.exit(payload)
+
+  @override
+  def respond(self, url: str, payload: Any) -> Any:
+    if "messages" in payload:
+      return _complete(payload)
+
+    return {"browserHtml": self.pages.get(payload["url"], "")}
+
+  def record(self, url: str, headers: Dict[str, str], payload: Any) -> Any:
+    return super().post(url, headers, payload)
+
+  # NOTE: listing pages are fetched outside of link processing
+  # so only details pages and llm calls count towards link concurrency
+  def enter(self, payload: Any) -> None:
+    with self._lock:
+      if "/page/" not in payload.get("url", ""):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+
+  def exit(self, payload: Any) -> None:
+    with self._lock:
+      if "/page/" not in payload.get("url", ""):
+        self.running -= 1
+
+  def urls(self) -> List[str]:
+    return [
+      request.payload.get("url", request.url) for request in self.requests
+    ]
+
+  def scraped(self) -> List[str]:
+    return [url for url in self.urls() if "/jobs/" in url]
+
+
+class TestAsyncSiteHttpClient(AsyncHttpClient):
+  __test__ = False
+
+  client: TestSiteHttpClient
+
+  def __init__(self, client: TestSiteHttpClient):
+    self.client = client
+
+  @override
+  async def post(self, url: str, headers: Dict[str, str], payload: Any) -> Any:
+    self.client.enter(payload)
+    try:
+      response = self.client.record(url, headers, payload)
+      await asyncio.sleep(self.client.delay)
+      return response
+    finally:
+      self.client.exit(payload)
+
+  @override
+  def stats(self) -> HttpClientStats:
+    return self.client.stats()
+
+  @override
+  async def close(self) -> None:
+    self.client.close()
+
+
+def _complete(payload: Any) -> Any:
+  if "response_format" in payload:
+    content = json.dumps(
+      {"extract": {"salary": 1}, "summary": "Fine.", "score": 42}
+    )
+  else:
+    task = payload["messages"][3]["content"]
+    if "Extract" in task:
+      content = '{"salary": 1}'
+    elif "Summarize" in task:
+      content = "Fine."
+    else:
+      content = "42"
+
+  return {
+    "choices": [{"message": {"content": content}}],
+    "usage": {"prompt_tokens": 10, "completion_tokens": 1},
+  }
+
+
+def _pages(pages: int, links: int) -> Dict[str, str]:
+  result = {}
+  for page in range(1, pages + 1):
+    anchors = "".join(
+      f'<a class="job" href="/jobs/{page}-{link}">Job</a>'
+      for link in range(links)
+    )
+    result[f"https://jobs.example/page/{page}"] = (
+      f"<html><body>{anchors}</body></html>"
+    )
+    for link in range(links):
+      result[f"https://jobs.example/jobs/{page}-{link}"] = DETAILS_PAGE.format(
+        f"{page}-{link}", f"{page}-{link}"
+      )
+
+  return result
+
+
+def _links(pages: int, links: int) -> List[str]:
+  return [
+    f"https://jobs.example/jobs/{page}-{link}"
+    for page in range(1, pages + 1)
+    for link in range(links)
+  ]
+
+
+def _site(pages: int, max_pages: int = 50) -> SyncWorkerSiteConfig:
+  return SyncWorkerSiteConfig(
+    base_url="https://jobs.example",
+    pagination=PaginationSyncWorkerSiteConfig(
+      "https://jobs.example/page/{}", 1, pages + 1, 1, max_pages, 2
+    ),
+    scraping_service=ZyteScrapingServiceConfig(
+      "https://api.zyte.com/v1/extract", "sk-xxxxxxxxxxxxx", True, {}, {}
+    ),
+    scraping_cache=None,
+    html_processor=BeautifulSoupHtmlProcessorConfig("a.job", "h1", "#details"),
+    llm_service=OpenaiLlmServiceConfig(
+      base_url="https://llm.example/v1",
+      api_key="sk-xxxxxxxxxxxxx",
+      model="model",
+      cv="My CV.",
+      extraction_prompt="Please extract data from content.",
+      summary_prompt="Please summarize the content.",
+      scoring_prompt="Please score the content.",
+    ),
+    llm_cache=None,
+    incremental=None,
+    near_duplicates=None,
+    prefilter=None,
+    scraping_rate_limit=None,
+    llm_rate_limit=None,
+  )
+
+
+def _batch_llm_service() -> OpenaiBatchLlmServiceConfig:
+  return OpenaiBatchLlmServiceConfig(
+    base_url="https://llm.example/v1",
+    api_key="sk-xxxxxxxxxxxxx",
+    model="model",
+    cv="My CV.",
+    extraction_prompt="Please extract data from content.",
+    summary_prompt="Please summarize the content.",
+    scoring_prompt="Please score the content.",
+    poll_interval=0,
+  )
+
+
+def _worker(
+  test_system: TestSystem,
+  monkeypatch: pytest.MonkeyPatch,
+  client: TestSiteHttpClient,
+  kind: str,
+  sites: Dict[str, SyncWorkerSiteConfig],
+) -> Worker:
+  monkeypatch.setattr("truffle_cli.http_client.create", lambda *_: client)
+  monkeypatch.setattr(
+    "truffle_cli.http_client.create_async",
+    lambda *_: TestAsyncSiteHttpClient(client),
+  )
+
+  http_client = RequestsHttpClientConfig(10, 10, False, True)
+  if kind == PIPELINED_WORKER_TYPE:
+    return PipelinedWorker(
+      test_system,
+      PipelinedWorkerConfig(sites, http_client, 2, 2, 1, 2, 4),
+      None,
+    )
+  if kind == ASYNC_WORKER_TYPE:
+    return AsyncWorker(
+      test_system, AsyncWorkerConfig(sites, http_client, 4, 2), None
+    )
+  if kind == THREADED_WORKER_TYPE:
+    return ThreadedWorker(
+      test_system, ThreadedWorkerConfig(sites, http_client, 4, 2), None
+    )
+
+  return SyncWorker(test_system, SyncWorkerConfig(sites, http_client), None)
+
+
+def _listed(client: TestSiteHttpClient) -> List[str]:
+  return [url for url in client.urls() if "/page/" in url]
+
+
+def _drain(worker: Worker) -> Tuple[List[OutputJob], OutputMetadata]:
+  run = worker.run()
+  jobs = []
+  while True:
+    try:
+      jobs.append(next(run))
+    except StopIteration as stop:
+      return jobs, stop.value
+
+
+WORKER_TYPES = [
+  SYNC_WORKER_TYPE,
+  THREADED_WORKER_TYPE,
+  PIPELINED_WORKER_TYPE,
+  ASYNC_WORKER_TYPE,
+]
+
+
+@pytest.mark.parametrize("kind", WORKER_TYPES)
+def test_worker_processes_every_link(
+  test_system: TestSystem, monkeypatch: pytest.MonkeyPatch, kind: str
+):
+  client = TestSiteHttpClient(_pages(3, 4), 0.001)
+  worker = _worker(test_system, monkeypatch, client, kind, {"jobs": _site(3)})
+
+  jobs, metadata = _drain(worker)
+
+  assert sorted(job.link for job in jobs) == sorted(_links(3, 4))
+  assert all(job.site == "jobs" for job in jobs)
+  assert all(job.enrichment.score == 42 for job in jobs)
+  assert all(
+    f"Engineer {job.link.rsplit('/', 1)[1]}" in job.scrape.title for job in jobs
+  )
+  assert metadata.llm_usage.requests == 3 * len(jobs)
+
+
+def test_sync_worker_keeps_listing_order(
+  test_system: TestSystem, monkeypatch: pytest.MonkeyPatch
+):
+  client = TestSiteHttpClient(_pages(3, 4))
+  worker = _worker(
+    test_system, monkeypatch, client, SYNC_WORKER_TYPE, {"jobs": _site(3)}
+  )
+
+  jobs, _ = _drain(worker)
+
+  assert [job.link for job in jobs] == _links(3, 4)
+  assert client.scraped() == _links(3, 4)
+
+
+def test_threaded_worker_bounds_site_concurrency(
+  test_system: TestSystem, monkeypatch: pytest.MonkeyPatch
+):
+  client = TestSiteHttpClient(_pages(2, 6), 0.005)
+  worker = _worker(
+    test_system, monkeypatch, client, THREADED_WORKER_TYPE, {"jobs": _site(2)}
+  )
+
+  jobs, _ = _drain(worker)
+
+  assert len(jobs) == 12
+  assert 1 < client.peak <= 2
+
+
+@pytest.mark.parametrize("kind", WORKER_TYPES)
+def test_worker_processes_every_site(
+  test_system: TestSystem, monkeypatch: pytest.MonkeyPatch, kind: str
+):
+  pages = _pages(2, 3)
+  sites = {"jobs": _site(2), "other": _site(2)}
+  sites["other"].base_url = "https://other.example"
+  sites["other"].pagination.template = "https://other.example/page/{}"
+  for url, page in list(pages.items()):
+    pages[url.replace("jobs.example", "other.example")] = page
+  client = TestSiteHttpClient(pages, 0.001)
+  worker = _worker(test_system, monkeypatch, client, kind, sites)
+
+  jobs, _ = _drain(worker)
+
+  assert sorted((job.site, job.link) for job in jobs) == sorted(
+    [("jobs", link) for link in _links(2, 3)]
+    + [
+      ("other", link.replace("jobs.example", "other.example"))
+      for link in _links(2, 3)
+    ]
+  )
+
+
+def test_sync_worker_batch(
+  test_system: TestSystem, monkeypatch: pytest.MonkeyPatch
+):
+  site = _site(2)
+  site.llm_service = _batch_llm_service()
+  client = TestBatchHttpClient(_pages(2, 2))
+  monkeypatch.setattr("truffle_cli.http_client.create", lambda *_: client)
+
+  jobs, metadata = _drain(
+    SyncWorker(
+      test_system,
+      SyncWorkerConfig(
+        {"jobs": site}, RequestsHttpClientConfig(10, 10, False, True)
+      ),
+      None,
+    )
+  )
+
+  assert len(client.batches) == 3
+  assert sorted(job.link for job in jobs) == _links(2, 2)
+  assert all(job.enrichment.score == 42 for job in jobs)
+  assert metadata.llm_usage.requests == 3 * len(jobs)
+
+
+@pytest.mark.parametrize("kind", WORKER_TYPES)
+def test_worker_stops_pagination(
+  test_system: TestSystem, monkeypatch: pytest.MonkeyPatch, kind: str
+):
+  pages = _pages(2, 2)
+  pages["https://jobs.example/page/3"] = pages["https://jobs.example/page/1"]
+  client = TestSiteHttpClient(pages)
+
+  jobs, _ = _drain(
+    _worker(test_system, monkeypatch, client, kind, {"jobs": _site(1000)})
+  )
+
+  assert len(_listed(client)) <= 4
+  assert sorted(job.link for job in jobs) == _links(2, 2)
+
+
+@pytest.mark.parametrize("kind", WORKER_TYPES)
+def test_worker_caps_pages(
+  test_system: TestSystem, monkeypatch: pytest.MonkeyPatch, kind: str
+):
+  client = TestSiteHttpClient(_pages(2, 2))
+
+  jobs, _ = _drain(
+    _worker(test_system, monkeypatch, client, kind, {"jobs": _site(1000, 1)})
+  )
+
+  assert _listed(client) == ["https://jobs.example/page/1"]
+  assert sorted(job.link for job in jobs) == _links(1, 2)
+
+
+@pytest.mark.parametrize(
+  "link, base_url, canonical",
+  [
+    ("/job/1", "https://x.example/hr", "https://x.example/hr/job/1"),
+    ("/job/1", "https://x.example/hr/", "https://x.example/hr/job/1"),
+    ("job/1", "https://x.example/hr", "https://x.example/hr/job/1"),
+    ("//y.example/job/1", "https://x.example/hr", "https://y.example/job/1"),
+    (
+      " HTTPS://X.example/job/1/ ",
+      "https://y.example",
+      "https://x.example/job/1",
+    ),
+    (
+      "/job/1?utm_source=feed&b=2&gclid=x&a=1#apply",
+      "https://x.example",
+      "https://x.example/job/1?a=1&b=2",
+    ),
+    ("/", "https://x.example", "https://x.example/"),
+  ],
+)
+def test_canonicalize(link: str, base_url: str, canonical: str):
+  assert canonicalize(link, base_url) == canonical
+
+
+@pytest.mark.parametrize("kind", WORKER_TYPES)
+def test_worker_deduplicates_canonical_links(
+  test_system: TestSystem, monkeypatch: pytest.MonkeyPatch, kind: str
+):
+  pages = _pages(2, 2)
+  pages["https://jobs.example/page/2"] = (
+    "<html><body>"
+    '<a class="job" href="/jobs/1-0/?utm_source=promoted">Job</a>'
+    '<a class="job" href="/jobs/2-0#apply">Job</a>'
+    '<a class="job" href="https://jobs.example/jobs/2-1">Job</a>'
+    "</body></html>"
+  )
+  client = TestSiteHttpClient(pages)
+
+  jobs, metadata = _drain(
+    _worker(test_system, monkeypatch, client, kind, {"jobs": _site(2)})
+  )
+
+  assert sorted(job.link for job in jobs) == _links(2, 2)
+  assert sorted(client.scraped()) == _links(2, 2)
+  assert (metadata.dedup.unique, metadata.dedup.duplicates) == (4, 1)
+
+
+def test_simhash_skips_short_content():
+  assert _simhash("Senior Python engineer.") is None
+
+
+def test_simhash_distance_tracks_similarity():
+  posted = _simhash(POSTINGS[0])
+  reposted = _simhash(POSTINGS[0].replace("two juniors", "three juniors"))
+  unrelated = _simhash(POSTINGS[1])
+  assert posted is not None and reposted is not None and unrelated is not None
+
+  assert _distance(posted, posted) == 0
+  assert _distance(posted, reposted) <= 6
+  assert _distance(posted, unrelated) > 16
+
+
+def test_distance_counts_differing_bits():
+  assert _distance(0b1011, 0b0110) == 3
+  assert _distance(0, (1 << 64) - 1) == 64
+
+
+def test_near_duplicate_index_caps_bands(
+  test_system: TestSystem, tmp_path: Path
+):
+  path = str(tmp_path / "near-duplicates.sqlite")
+  config = NearDuplicateConfig(SqliteCacheConfig(path, 1 << 20), 0.5, None)
+  index = NearDuplicateIndex(
+    test_system, config, SqliteCache(test_system, config.cache), "context"
+  )
+  job = OutputJob(
+    "jobs",
+    "https://jobs.example/jobs/1",
+    OutputJobScrape("", POSTINGS[0], "", ""),
+    OutputJobEnrichment({}, "Fine.", 42),
+    OutputJobThinking(None, None, None),
+  )
+
+  index.remember(job)
+  index.remember(job)
+  reposted = OutputJobScrape(
+    "", POSTINGS[0].replace("two juniors", "three juniors"), "", ""
+  )
+  match = index.match("jobs", "https://jobs.example/jobs/2", reposted)
+  index.close()
+
+  with sqlite3.connect(path) as connection:
+    (bands,) = connection.execute(
+      "SELECT COUNT(*) FROM entries WHERE key LIKE 'simhash-band:%'"
+    ).fetchone()
+  assert bands == SIMHASH_MAX_BANDS
+  assert match is not None and match.enrichment == job.enrichment
+
+
+def _postings(prefix: str, change: str) -> Dict[str, str]:
+  anchors = "".join(
+    f'<a class="job" href="/{prefix}/{index}">Job</a>'
+    for index in range(len(POSTINGS))
+  )
+  pages = {
+    f"https://jobs.example/{prefix}-page/1": (
+      f"<html><body>{anchors}</body></html>"
+    )
+  }
+  for index, posting in enumerate(POSTINGS):
+    pages[f"https://jobs.example/{prefix}/{index}"] = DETAILS_PAGE.format(
+      index, posting.replace("two juniors", change)
+    )
+
+  return pages
+
+
+def _near_duplicate_site(tmp_path: Path, prefix: str) -> SyncWorkerSiteConfig:
+  site = _site(1)
+  site.pagination.template = f"https://jobs.example/{prefix}-page/{{}}"
+  site.near_duplicates = NearDuplicateConfig(
+    SqliteCacheConfig(str(tmp_path / "near-duplicates.sqlite"), 1 << 20),
+    0.9,
+    None,
+  )
+
+  return site
+
+
+def _enriched(client: TestSiteHttpClient) -> int:
+  return len(
+    [url for url in client.urls() if not url.startswith("https://jobs")]
+  )
+
+
+@pytest.mark.parametrize("kind", WORKER_TYPES)
+def test_worker_reuses_near_duplicate_enrichment(
+  test_system: TestSystem,
+  monkeypatch: pytest.MonkeyPatch,
+  tmp_path: Path,
+  kind: str,
+):
+  client = TestSiteHttpClient(_postings("jobs", "two juniors"))
+  _drain(
+    _worker(
+      test_system,
+      monkeypatch,
+      client,
+      kind,
+      {"jobs": _near_duplicate_site(tmp_path, "jobs")},
+    )
+  )
+  assert _enriched(client) == 3 * len(POSTINGS)
+
+  client = TestSiteHttpClient(_postings("re", "three juniors"))
+  jobs, metadata = _drain(
+    _worker(
+      test_system,
+      monkeypatch,
+      client,
+      kind,
+      {"jobs": _near_duplicate_site(tmp_path, "re")},
+    )
+  )
+
+  assert _enriched(client) == 0
+  assert sorted(job.link for job in jobs) == [
+    f"https://jobs.example/re/{index}" for index in range(len(POSTINGS))
+  ]
+  assert all(job.enrichment.score == 42 for job in jobs)
+  assert metadata.near_duplicates.reused == len(POSTINGS)
+
+
+def test_sync_worker_shares_near_duplicates_across_sites(
+  test_system: TestSystem, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+):
+  client = TestSiteHttpClient(
+    _postings("jobs", "two juniors") | _postings("re", "three juniors")
+  )
+
+  jobs, metadata = _drain(
+    _worker(
+      test_system,
+      monkeypatch,
+      client,
+      SYNC_WORKER_TYPE,
+      {
+        "jobs": _near_duplicate_site(tmp_path, "jobs"),
+        "mirror": _near_duplicate_site(tmp_path, "re"),
+      },
+    )
+  )
+
+  assert len(jobs) == 2 * len(POSTINGS)
+  assert _enriched(client) == 3 * len(POSTINGS)
+  assert (
+    metadata.near_duplicates.reused,
+    metadata.near_duplicates.indexed,
+  ) == (len(POSTINGS), len(POSTINGS))
+
+
+def test_sync_worker_keeps_near_duplicates_per_cv(
+  test_system: TestSystem, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+):
+  client = TestSiteHttpClient(
+    _postings("jobs", "two juniors") | _postings("re", "three juniors")
+  )
+  mirror = _near_duplicate_site(tmp_path, "re")
+  mirror.llm_service = replace(mirror.llm_service, cv="Another CV.")
+
+  _, metadata = _drain(
+    _worker(
+      test_system,
+      monkeypatch,
+      client,
+      SYNC_WORKER_TYPE,
+      {"jobs": _near_duplicate_site(tmp_path, "jobs"), "mirror": mirror},
+    )
+  )
+
+  assert _enriched(client) == 6 * len(POSTINGS)
+  assert (
+    metadata.near_duplicates.reused,
+    metadata.near_duplicates.indexed,
+  ) == (0, 2 * len(POSTINGS))
+
+
+def test_near_duplicates_skip_sites_without_config(
+  test_system: TestSystem, tmp_path: Path
+):
+  sites = {
+    "jobs": _near_duplicate_site(tmp_path, "jobs"),
+    "mirror": _near_duplicate_site(tmp_path, "re"),
+    "plain": _site(1),
+  }
+
+  indexes = create_near_duplicates(test_system, sites)
+  close_near_duplicates(indexes)
+
+  assert sorted(indexes) == ["jobs", "mirror"]
+  assert indexes["jobs"] is indexes["mirror"]
+
+
+def _prefilter(
+  test_system: TestSystem, config: PreFilterConfig
+) -> Tuple[PreFilter, List[bool]]:
+  prefilter = PreFilter(
+    test_system,
+    config,
+    "Python engineer experienced with scrapers, data pipelines, Postgres "
+    "and Kubernetes.",
+  )
+  admitted = [
+    prefilter.admit(
+      f"https://jobs.example/jobs/{index}",
+      OutputJobScrape("", posting, "", ""),
+    )
+    for index, posting in enumerate(POSTINGS)
+  ]
+
+  return prefilter, admitted
+
+
+def test_prefilter_excludes_before_including(test_system: TestSystem):
+  prefilter, admitted = _prefilter(
+    test_system, PreFilterConfig([r"engineer", r"developer"], [r"react"], None)
+  )
+
+  assert admitted == [True, False]
+  metadata = prefilter.metadata()
+  assert (metadata.passed, metadata.excluded, metadata.unmatched) == (1, 1, 0)
+
+
+def test_prefilter_rejects_postings_matching_no_include(
+  test_system: TestSystem,
+):
+  prefilter, admitted = _prefilter(
+    test_system, PreFilterConfig([r"\bkubernetes\b"], [], None)
+  )
+
+  assert admitted == [True, False]
+  assert prefilter.metadata().unmatched == 1
+
+
+def test_prefilter_rejects_postings_dissimilar_to_cv(test_system: TestSystem):
+  prefilter, admitted = _prefilter(test_system, PreFilterConfig([], [], 0.2))
+
+  assert admitted == [True, False]
+  assert prefilter.metadata().dissimilar == 1
+
+
+def test_prefilter_scores_a_posting_before_counting_it(
+  test_system: TestSystem,
+):
+  prefilter = PreFilter(
+    test_system, PreFilterConfig([], [], 0.35), "Python scrapers"
+  )
+  scrape = OutputJobScrape("", "Python Kubernetes", "", "")
+
+  # NOTE: weighed against the cv alone the first posting scores 0.36
+  # and once counted the same posting scores 0.34
+  assert prefilter.admit("https://jobs.example/jobs/1", scrape)
+  assert not prefilter.admit("https://jobs.example/jobs/2", scrape)
+
+
+@pytest.mark.parametrize("kind", WORKER_TYPES)
+def test_worker_prefilters_before_enrichment(
+  test_system: TestSystem, monkeypatch: pytest.MonkeyPatch, kind: str
+):
+  site = _site(2)
+  site.prefilter = PreFilterConfig([r"engineer"], [r"\bengineer 1-1\b"], None)
+  client = TestSiteHttpClient(_pages(2, 2))
+
+  jobs, metadata = _drain(
+    _worker(test_system, monkeypatch, client, kind, {"jobs": site})
+  )
+
+  assert sorted(job.link for job in jobs) == [
+    link for link in _links(2, 2) if not link.endswith("/1-1")
+  ]
+  assert _enriched(client) == 3 * len(jobs)
+  assert (metadata.prefilter.passed, metadata.prefilter.excluded) == (3, 1)
+
+
+@pytest.mark.parametrize("kind", WORKER_TYPES)
+def test_worker_stops_when_cancelled(
+  test_system: TestSystem, monkeypatch: pytest.MonkeyPatch, kind: str
+):
+  client = TestSiteHttpClient(_pages(4, 5), 0.005)
+  worker = _worker(test_system, monkeypatch, client, kind, {"jobs": _site(4)})
+
+  run = worker.run()
+  job = next(run)
+  run.close()
+  requested = len(client.requests)
+  time.sleep(0.05)
+
+  assert job.link in _links(4, 5)
+  assert len(client.requests) == requested
+  assert len(client.scraped()) < len(_links(4, 5))
+  assert client.running == 0
+
+
+_process = BeautifulSoupHtmlProcessor.process
+
+
+def _failing_process(
+  self: BeautifulSoupHtmlProcessor, html: str
+) -> HtmlDocument:
+  if "posting 1-0" in html:
+    raise ValueError("Malformed")
+
+  return _process(self, html)
+
+
+@pytest.mark.parametrize("kind", WORKER_TYPES)
+def test_worker_skips_links_that_fail_to_parse(
+  test_system: TestSystem, monkeypatch: pytest.MonkeyPatch, kind: str
+):
+  monkeypatch.setattr(BeautifulSoupHtmlProcessor, "process", _failing_process)
+  client = TestSiteHttpClient(_pages(2, 2))
+  worker = _worker(test_system, monkeypatch, client, kind, {"jobs": _site(2)})
+
+  jobs, _ = _drain(worker)
+
+  assert sorted(job.link for job in jobs) == _links(2, 2)[1:]
+
+
+def test_async_worker_raises_when_site_creation_fails(
+  test_system: TestSystem, monkeypatch: pytest.MonkeyPatch
+):
+  site = _site(1)
+  site.llm_service = _batch_llm_service()
+  client = TestSiteHttpClient(_pages(1, 1))
+  worker = _worker(
+    test_system, monkeypatch, client, ASYNC_WORKER_TYPE, {"jobs": site}
+  )
+
+  with pytest.raises(ValueError, match="not supported by the async worker"):
+    _drain(worker)
+
+  assert client.requests == []
+
+
+@pytest.mark.parametrize("kind", [THREADED_WORKER_TYPE, PIPELINED_WORKER_TYPE])
+def test_worker_rejects_batch_llm_service(
+  test_system: TestSystem, monkeypatch: pytest.MonkeyPatch, kind: str
+):
+  site = _site(1)
+  site.llm_service = _batch_llm_service()
+  client = TestSiteHttpClient(_pages(1, 1))
+
+  with pytest.raises(ValueError, match=f"not supported by the {kind} worker"):
+    _worker(test_system, monkeypatch, client, kind, {"jobs": site})
+
+
+@pytest.mark.parametrize("kind", WORKER_TYPES)
+def test_worker_enriches_from_llm_cache(
+  test_system: TestSystem,
+  monkeypatch: pytest.MonkeyPatch,
+  tmp_path: Path,
+  kind: str,
+):
+  site = _site(2)
+  site.llm_cache = LlmCacheConfig(
+    SqliteCacheConfig(str(tmp_path / "llm.sqlite"), 1 << 20), None
+  )
+
+  client = TestSiteHttpClient(_pages(2, 3))
+  _drain(_worker(test_system, monkeypatch, client, kind, {"jobs": site}))
+  client = TestSiteHttpClient(_pages(2, 3))
+  jobs, metadata = _drain(
+    _worker(test_system, monkeypatch, client, kind, {"jobs": site})
+  )
+
+  assert sorted(job.link for job in jobs) == _links(2, 3)
+  assert all(job.enrichment.score == 42 for job in jobs)
+  assert client.urls() == [
+    url for url in client.urls() if url.startswith("https://jobs.example")
+  ]
+  assert metadata.llm_cache.hits == 3 * len(jobs)
+  assert metadata.llm_usage.requests == 3 * len(jobs)
+
+
+@pytest.mark.parametrize("kind", WORKER_TYPES)
+@pytest.mark.parametrize(
+  "mode",
+  [INCREMENTAL_SKIP_MODE, INCREMENTAL_EMIT_MODE, INCREMENTAL_VERIFY_MODE],
+)
+def test_worker_incremental_modes(
+  test_system: TestSystem,
+  monkeypatch: pytest.MonkeyPatch,
+  tmp_path: Path,
+  kind: str,
+  mode: IncrementalMode,
+):
+  site = _site(2)
+  site.incremental = IncrementalConfig(
+    SqliteCacheConfig(str(tmp_path / "index.sqlite"), 1 << 20), mode, None
+  )
+  changed = "https://jobs.example/jobs/1-0"
+
+  client = TestSiteHttpClient(_pages(2, 3))
+  _drain(_worker(test_system, monkeypatch, client, kind, {"jobs": site}))
+  pages = _pages(2, 3)
+  pages[changed] = pages[changed].replace("Build", "Maintain")
+  client = TestSiteHttpClient(pages)
+  jobs, metadata = _drain(
+    _worker(test_system, monkeypatch, client, kind, {"jobs": site})
+  )
+
+  enriched = len(client.urls()) - len(
+    [url for url in client.urls() if url.startswith("https://jobs.example")]
+  )
+  if mode == INCREMENTAL_SKIP_MODE:
+    assert jobs == []
+    assert client.scraped() == []
+    assert enriched == 0
+    assert metadata.incremental.unchanged == 6
+  elif mode == INCREMENTAL_EMIT_MODE:
+    assert sorted(job.link for job in jobs) == _links(2, 3)
+    assert client.scraped() == []
+    assert enriched == 0
+    assert metadata.incremental.unchanged == 6
+  else:
+    assert sorted(job.link for job in jobs) == _links(2, 3)
+    assert sorted(client.scraped()) == _links(2, 3)
+    assert enriched == 3
+    assert "Maintain" in next(
+      job.scrape.clean for job in jobs if job.link == changed
+    )
+    assert (
+      metadata.incremental.changed,
+      metadata.incremental.unchanged,
+    ) == (1, 5)
@@ -0,0 +1,277 @@
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, List, override
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from truffle_cli.format import Format
+from truffle_cli.worker.output import (
+  OutputJob,
+  OutputJobEnrichment,
+  OutputJobScrape,
+  OutputJobThinking,
+  OutputMetadata,
+)
+from truffle_cli.writer import WriterConfig, create
+from truffle_cli.writer.abstract import Writer
+from truffle_cli.writer.html import (
+  HtmlPolicy,
+  HtmlPolicyWriter,
+  HtmlPolicyWriterConfig,
+)
+from truffle_cli.writer.jsonl import JsonlWriter, JsonlWriterConfig
+from truffle_cli.writer.threaded import ThreadedWriter, ThreadedWriterConfig
+
+from .test_system import TestSystem
+
+
+@dataclass
+class Record:
+  link: str
+
+
+def _writer_config(
+  path: str,
+  format: Format,
+  flush_interval: float,
+  queue_size: int,
+  batch_size: int,
+) -> WriterConfig:
+  return WriterConfig(
+    path,
+    format,
+    flush_interval,
+    queue_size,
+    batch_size,
+    HtmlPolicy.INLINE,
+    HtmlPolicy.INLINE,
+    "html",
+  )
+
+
+def test_jsonl_writer_writes_one_record_per_line(test_system: TestSystem):
+  writer = JsonlWriter(test_system, JsonlWriterConfig("/out.jsonl", 0, None))
+
+  writer.write_job(Record("https://jobs.example/1"))
+  assert Format.JSONL.deserialize(test_system.files["/out.jsonl"]) == [
+    {"link": "https://jobs.example/1"}
+  ]
+
+  writer.write_job(Record("https://jobs.example/2"))
+  writer.write_metadata(Record("metadata"))
+
+  assert Format.JSONL.deserialize(test_system.files["/out.jsonl"]) == [
+    {"link": "https://jobs.example/1"},
+    {"link": "https://jobs.example/2"},
+    {"link": "metadata"},
+  ]
+
+
+def test_jsonl_writer_buffers_until_flush_interval(test_system: TestSystem):
+  writer = create(
+    test_system, _writer_config("/out.ndjson", Format.JSON, 3600, 0, 1), None
+  )
+
+  writer.write_job(Record("https://jobs.example/1"))
+  assert test_system.files["/out.ndjson"] == ""
+
+  writer.write_metadata(Record("metadata"))
+  assert test_system.files["/out.ndjson"].count("\n") == 2
+
+
+class TestWriter(Writer):
+  __test__ = False
+
+  written: List[Any]
+  threads: List[str]
+  synced: bool
+  closed: bool
+  failing: bool
+
+  def __init__(self, failing: bool = False):
+    self.written = []
+    self.threads = []
+    self.synced = False
+    self.closed = False
+    self.failing = failing
+
+  @override
+  def write_job(self, job: Any) -> None:
+    if self.failing:
+      raise ValueError("Disk full")
+
+    self.written.append(job)
+    self.threads.append(threading.current_thread().name)
+
+  @override
+  def write_metadata(self, metadata: Any) -> None:
+    self.write_job(metadata)
+
+  @override
+  def sync(self) -> None:
+    self.synced = True
+
+  @override
+  def close(self) -> None:
+    self.closed = True
+
+
+def test_threaded_writer_drains_and_syncs(test_system: TestSystem):
+  inner = TestWriter()
+  writer = ThreadedWriter(test_system, inner, ThreadedWriterConfig(1))
+
+  for index in range(10):
+    writer.write_job(Record(f"https://jobs.example/{index}"))
+  writer.write_metadata(Record("metadata"))
+
+  assert [record.link for record in inner.written] == [
+    *[f"https://jobs.example/{index}" for index in range(10)],
+    "metadata",
+  ]
+  assert set(inner.threads) == {"truffle-writer"}
+  assert inner.synced
+
+
+def test_threaded_writer_raises_write_errors(test_system: TestSystem):
+  writer = ThreadedWriter(
+    test_system, TestWriter(failing=True), ThreadedWriterConfig(1)
+  )
+
+  writer.write_job(Record("https://jobs.example/1"))
+  with pytest.raises(ValueError):
+    writer.write_metadata(Record("metadata"))
+
+
+def test_threaded_writer_drains_on_close(test_system: TestSystem):
+  inner = TestWriter()
+  writer = ThreadedWriter(test_system, inner, ThreadedWriterConfig(1))
+
+  for index in range(10):
+    writer.write_job(Record(f"https://jobs.example/{index}"))
+  writer.close()
+
+  assert len(inner.written) == 10
+  assert inner.closed
+
+
+def _job(link: str, score: float) -> OutputJob:
+  return OutputJob(
+    "jobs",
+    link,
+    OutputJobScrape("<html></html>", "<p></p>", "Engineer", "Build."),
+    OutputJobEnrichment(
+      {"date": "2026-01-02", "location": "Zagreb"}, "Fine.", score
+    ),
+    OutputJobThinking(None, None, None),
+  )
+
+
+def test_sqlite_writer_stores_indexed_jobs(
+  test_system: TestSystem, tmp_path: Path
+):
+  path = str(tmp_path / "out.db")
+  writer = create(test_system, _writer_config(path, Format.JSON, 1, 0, 2), None)
+
+  for index in range(3):
+    writer.write_job(_job(f"https://jobs.example/{index}", index * 10))
+  now = datetime.now(timezone.utc)
+  writer.write_metadata(OutputMetadata(now, now))
+
+  connection = sqlite3.connect(path)
+  assert connection.execute(
+    "SELECT link, date, location FROM jobs WHERE score > 5 ORDER BY score"
+  ).fetchall() == [
+    ("https://jobs.example/1", "2026-01-02", "Zagreb"),
+    ("https://jobs.example/2", "2026-01-02", "Zagreb"),
+  ]
+  assert connection.execute("SELECT COUNT(*) FROM html").fetchone() == (3,)
+  assert connection.execute("SELECT start, end FROM runs").fetchall() == [
+    (now.isoformat(), now.isoformat())
+  ]
+  connection.close()
+
+
+def test_sqlite_writer_commits_on_close(
+  test_system: TestSystem, tmp_path: Path
+):
+  path = str(tmp_path / "out.db")
+  writer = create(
+    test_system, _writer_config(path, Format.JSON, 1, 0, 100), None
+  )
+
+  writer.write_job(_job("https://jobs.example/1", 10))
+  writer.close()
+
+  connection = sqlite3.connect(path)
+  assert connection.execute("SELECT COUNT(*) FROM jobs").fetchone() == (1,)
+  connection.close()
+
+
+def test_parquet_writer_writes_row_groups(
+  test_system: TestSystem, tmp_path: Path
+):
+  path = str(tmp_path / "out.parquet")
+  writer = create(test_system, _writer_config(path, Format.JSON, 1, 0, 2), None)
+
+  for index in range(3):
+    writer.write_job(_job(f"https://jobs.example/{index}", index * 10))
+  now = datetime.now(timezone.utc)
+  writer.write_metadata(OutputMetadata(now, now))
+
+  file = pq.ParquetFile(path)
+  assert file.metadata.num_row_groups == 2
+  assert b"truffle" in (file.metadata.metadata or {})
+  table = pq.read_table(path, columns=["site", "enrichment_score"])
+  assert pa.types.is_dictionary(table.schema.field("site").type)
+  assert table.column("enrichment_score").to_pylist() == [0, 10, 20]
+
+
+def test_parquet_writer_stays_readable_on_close(
+  test_system: TestSystem, tmp_path: Path
+):
+  path = str(tmp_path / "out.parquet")
+  writer = create(
+    test_system, _writer_config(path, Format.JSON, 1, 0, 100), None
+  )
+
+  writer.write_job(_job("https://jobs.example/1", 10))
+  writer.close()
+
+  assert pq.read_table(path).num_rows == 1
+
+
+def test_html_policy_writer_stores_and_drops_html(test_system: TestSystem):
+  inner = TestWriter()
+  writer = HtmlPolicyWriter(
+    test_system,
+    inner,
+    HtmlPolicyWriterConfig(HtmlPolicy.STORE, HtmlPolicy.DROP, "/html"),
+  )
+
+  writer.write_job(_job("https://jobs.example/1", 1))
+  writer.write_job(_job("https://jobs.example/2", 2))
+
+  scrapes = [job.scrape for job in inner.written]
+  assert [(s.raw, s.clean, s.clean_hash) for s in scrapes] == [
+    ("", "", None)
+  ] * 2
+  hash = scrapes[0].raw_hash
+  assert hash is not None and hash == scrapes[1].raw_hash
+  stored = [path for path in test_system.files if path.startswith("/html/")]
+  assert stored == [f"/html/{hash[:2]}/{hash}.html.gz"]
+  assert test_system.files[stored[0]] == "<html></html>"
+
+
+def test_jsonl_writer_omits_unstored_html_hashes(test_system: TestSystem):
+  writer = JsonlWriter(test_system, JsonlWriterConfig("/out.jsonl", 0, None))
+
+  writer.write_job(_job("https://jobs.example/1", 1))
+
+  [job] = Format.JSONL.deserialize(test_system.files["/out.jsonl"])
+  assert "raw_hash" not in job["scrape"]
+  assert "clean_hash" not in job["scrape"]
+  assert job["thinking"]["extract"] is None